@@ -1,7 +1,24 @@
 __all__ = [
     "config",
     "avellaneda_stoikov",
+    "glft",
     "intensity",
+    "aggregator",
+    "online",
+    "volatility",
+    "live",
+    "fills",
     "backtest",
+    "streaming",
+    "kline",
+    "lob",
+    "markout",
     "reporting",
+    "cache",
+    "sweep",
+    "montecarlo",
+    "walkforward",
+    "portfolio",
+    "bench",
+    "instrument",
 ]
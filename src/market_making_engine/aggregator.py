@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+EVENT_COLUMNS = ("ts", "kind", "bid", "ask", "price")
+
+
+def _seconds(ts: pd.Series) -> np.ndarray:
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(ts):
+        return ts.to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+    return ts.to_numpy(dtype=float)
+
+
+class IntensityBinAggregator:
+    """Streaming builder of the ``delta,count,exposure`` table that ``fit_intensity`` consumes.
+
+    A hypothetical quote resting ``delta`` away from the prevailing mid is counted as filled by
+    every trade that prints at least ``delta`` through the mid on its side (trades above the mid
+    hit our ask, trades below hit our bid). Exposure is the time a mid was available, per side.
+    State is a fixed-size set of per-bin accumulators, so memory does not grow with the capture.
+
+    Events arrive in time-ordered chunks with columns ``ts`` (seconds or datetime), ``kind``
+    (``quote`` or ``trade``), ``bid``/``ask`` for quotes and ``price`` for trades.
+    """
+
+    def __init__(self, deltas: np.ndarray):
+        d = np.asarray(deltas, dtype=float)
+        if d.ndim != 1 or len(d) == 0 or np.any(np.diff(d) <= 0) or d[0] < 0:
+            raise ValueError("deltas must be a non-empty, strictly increasing, non-negative 1-D array")
+        self.deltas = d
+        # hist[j] = number of trades whose distance reaches exactly the first j bins
+        self._hist_bid = np.zeros(len(d) + 1, dtype=np.int64)
+        self._hist_ask = np.zeros(len(d) + 1, dtype=np.int64)
+        self.exposure_time = 0.0
+        self.events = 0
+        self._last_ts: float | None = None
+        self._last_mid = np.nan
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if chunk.empty:
+            return
+        ts = _seconds(chunk["ts"])
+        kind = chunk["kind"].to_numpy()
+        is_quote = kind == "quote"
+        is_trade = kind == "trade"
+
+        # Prevailing mid after each event, carried across chunk boundaries.
+        mid = np.full(len(ts), np.nan)
+        if is_quote.any():
+            mid[is_quote] = 0.5 * (chunk["bid"].to_numpy(dtype=float)[is_quote] + chunk["ask"].to_numpy(dtype=float)[is_quote])
+        seen = np.where(~np.isnan(mid), np.arange(len(ts)), -1)
+        np.maximum.accumulate(seen, out=seen)
+        mid_after = np.where(seen >= 0, mid[np.maximum(seen, 0)], self._last_mid)
+        mid_before = np.concatenate([[self._last_mid], mid_after[:-1]])
+
+        prev_ts = np.concatenate([[ts[0] if self._last_ts is None else self._last_ts], ts[:-1]])
+        dt = ts - prev_ts
+        if np.any(dt < 0):
+            raise ValueError("events must be time-ordered")
+        self.exposure_time += float(np.sum(dt[~np.isnan(mid_before)]))
+
+        if is_trade.any():
+            price = chunk["price"].to_numpy(dtype=float)[is_trade]
+            ref = mid_before[is_trade]
+            ok = ~np.isnan(ref)
+            dist = price[ok] - ref[ok]
+            n_bins = len(self.deltas) + 1
+            above = np.searchsorted(self.deltas, dist[dist > 0], side="right")
+            below = np.searchsorted(self.deltas, -dist[dist < 0], side="right")
+            self._hist_ask += np.bincount(above, minlength=n_bins)
+            self._hist_bid += np.bincount(below, minlength=n_bins)
+
+        self._last_ts = float(ts[-1])
+        self._last_mid = float(mid_after[-1])
+        self.events += len(ts)
+
+    def counts(self, side: str = "both") -> np.ndarray:
+        bid = np.cumsum(self._hist_bid[::-1])[::-1][1:]
+        ask = np.cumsum(self._hist_ask[::-1])[::-1][1:]
+        if side == "bid":
+            return bid
+        if side == "ask":
+            return ask
+        if side == "both":
+            return bid + ask
+        raise ValueError(f"Unknown side: {side}")
+
+    def to_frame(self, side: str = "both") -> pd.DataFrame:
+        """Binned table for ``fit_intensity``; ``side="both"`` pools bid and ask (2x exposure)."""
+        import pandas as pd
+
+        counts = self.counts(side)
+        exposure = self.exposure_time * (2.0 if side == "both" else 1.0)
+        return pd.DataFrame({"delta": self.deltas, "count": counts, "exposure": np.full(len(self.deltas), exposure)})
+
+
+def iter_event_chunks(path: str | Path, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """Yield event chunks from a CSV or Parquet file without loading it whole."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("Reading Parquet event files requires pyarrow") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def aggregate_events(chunks: Iterable[pd.DataFrame], deltas: np.ndarray, side: str = "both") -> pd.DataFrame:
+    agg = IntensityBinAggregator(deltas)
+    for chunk in chunks:
+        agg.update(chunk)
+    return agg.to_frame(side)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import math
+import time
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass(slots=True)
 class Quote:
@@ -34,3 +37,99 @@ def optimal_quote(
         ask=reservation + half_spread,
         half_spread=half_spread,
     )
+
+
+class QuoteEngine:
+    """Stateful A-S quoter for hot paths.
+
+    The ``(1/gamma) ln(1 + gamma/k)`` spread term is cached until gamma or k change, and the
+    tau-dependent factors are cached for the last tau seen (constant between horizon steps in a
+    live loop). ``quote`` returns a plain ``(bid, ask)`` tuple instead of allocating a ``Quote``.
+    Prices agree with :func:`optimal_quote` up to floating-point rounding of the cached products.
+    """
+
+    __slots__ = ("gamma", "sigma", "k", "_spread_term", "_tau", "_risk", "_half_spread")
+
+    def __init__(self, gamma: float, sigma: float, k: float):
+        self.gamma = gamma
+        self.sigma = sigma
+        self.k = k
+        self._spread_term = (1.0 / gamma) * math.log(1.0 + gamma / max(k, 1e-12))
+        self._tau = math.nan
+
+    def set_params(self, gamma: float | None = None, sigma: float | None = None, k: float | None = None) -> None:
+        """Update parameters, invalidating only the cached terms that depend on them."""
+        gamma = self.gamma if gamma is None else gamma
+        sigma = self.sigma if sigma is None else sigma
+        k = self.k if k is None else k
+        if gamma != self.gamma or k != self.k:
+            self._spread_term = (1.0 / gamma) * math.log(1.0 + gamma / max(k, 1e-12))
+            self._tau = math.nan
+        if sigma != self.sigma:
+            self._tau = math.nan
+        self.gamma, self.sigma, self.k = gamma, sigma, k
+
+    def _set_tau(self, tau: float) -> None:
+        self._risk = self.gamma * self.sigma * self.sigma * tau
+        self._half_spread = self._spread_term + 0.5 * self._risk
+        self._tau = tau
+
+    def quote(self, mid_price: float, inventory: float, time_to_horizon: float) -> tuple[float, float]:
+        if time_to_horizon != self._tau:
+            self._set_tau(time_to_horizon)
+        reservation = mid_price - inventory * self._risk
+        return reservation - self._half_spread, reservation + self._half_spread
+
+    def quote_full(self, mid_price: float, inventory: float, time_to_horizon: float) -> Quote:
+        if time_to_horizon != self._tau:
+            self._set_tau(time_to_horizon)
+        reservation = mid_price - inventory * self._risk
+        return Quote(
+            reservation_price=reservation,
+            bid=reservation - self._half_spread,
+            ask=reservation + self._half_spread,
+            half_spread=self._half_spread,
+        )
+
+    def quote_batch(self, mid_price: np.ndarray, inventory: np.ndarray, time_to_horizon: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorised quotes for arrays of mids/inventories (tau scalar or per-element)."""
+        mid = np.asarray(mid_price, dtype=float)
+        q = np.asarray(inventory, dtype=float)
+        risk = self.gamma * self.sigma * self.sigma * np.asarray(time_to_horizon, dtype=float)
+        half_spread = self._spread_term + 0.5 * risk
+        reservation = mid - q * risk
+        return reservation - half_spread, reservation + half_spread
+
+
+def measure_quote_latency(engine: QuoteEngine, samples: int = 100_000, batch_size: int = 1024, seed: int = 0) -> dict:
+    """Per-quote latency percentiles (nanoseconds) for the scalar and batch paths of ``engine``."""
+    rng = np.random.default_rng(seed)
+    mids = (100.0 + rng.normal(0.0, 0.1, size=samples)).tolist()
+    qs = rng.integers(-20, 21, size=samples).astype(float).tolist()
+    taus = (np.arange(samples) // 100).astype(float).tolist()  # tau changes every 100 quotes
+
+    clock = time.perf_counter_ns
+    scalar = np.empty(samples)
+    quote = engine.quote
+    for i in range(samples):
+        t0 = clock()
+        quote(mids[i], qs[i], taus[i])
+        scalar[i] = clock() - t0
+
+    m = np.asarray(mids[:batch_size])
+    q = np.asarray(qs[:batch_size])
+    reps = max(1, samples // batch_size)
+    batch = np.empty(reps)
+    for i in range(reps):
+        t0 = clock()
+        engine.quote_batch(m, q, float(i))
+        batch[i] = (clock() - t0) / len(m)
+
+    return {
+        "scalar_p50_ns": float(np.percentile(scalar, 50)),
+        "scalar_p99_ns": float(np.percentile(scalar, 99)),
+        "scalar_mean_ns": float(np.mean(scalar)),
+        "batch_p50_ns_per_quote": float(np.percentile(batch, 50)),
+        "batch_p99_ns_per_quote": float(np.percentile(batch, 99)),
+        "batch_size": int(len(m)),
+    }
@@ -1,20 +1,55 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 import numpy as np
-import pandas as pd
 
-from .avellaneda_stoikov import optimal_quote
+from .cache import LRUCache
 from .config import BacktestConfig, StrategyConfig
+from .fills import BUY, SELL, FillLog
+from .glft import QuoteTable, quote_table
+from .instrument import count, stage
 from .intensity import IntensityFit, lambda_exponential, lambda_power
+from .markout import MarkoutAccumulator, markout_matrix, markout_sums
+from .online import OnlineIntensityEstimator
+from .volatility import MidVolatility
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass(slots=True)
 class BacktestResult:
-    timeseries: pd.DataFrame
-    fills: pd.DataFrame
+    """Per-step state as NumPy ``columns``; the DataFrame views are built on first access."""
+
+    columns: dict[str, np.ndarray]  # t, mid, inventory, cash, mtm_pnl, realized_spread, inventory_pnl[, sigma]
+    fill_log: FillLog
     summary: dict
+    markout_sums: MarkoutAccumulator | None = None  # per-side sums behind ``markouts``
+    _frames: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def timeseries(self) -> pd.DataFrame:
+        if "timeseries" not in self._frames:
+            import pandas as pd
+
+            self._frames["timeseries"] = pd.DataFrame(self.columns)
+        return self._frames["timeseries"]
+
+    @property
+    def markouts(self) -> pd.DataFrame | None:
+        """Per-horizon, per-side markout aggregates."""
+        if self.markout_sums is None:
+            return None
+        if "markouts" not in self._frames:
+            self._frames["markouts"] = self.markout_sums.table()
+        return self._frames["markouts"]
+
+    @property
+    def fills(self) -> pd.DataFrame:
+        return self.fill_log.to_frame()
 
 
 def _arrival_rate(delta: float, fit: IntensityFit) -> float:
@@ -25,17 +60,39 @@ def _arrival_rate(delta: float, fit: IntensityFit) -> float:
     raise ValueError(f"Unknown intensity model: {fit.model}")
 
 
-def run_backtest(mid: pd.Series, fit: IntensityFit, strat: StrategyConfig, cfg: BacktestConfig) -> BacktestResult:
-    rng = np.random.default_rng(cfg.seed)
-    m = mid.to_numpy(dtype=float)
+def _arrival_rates(delta: np.ndarray, fit: IntensityFit) -> np.ndarray:
+    if fit.model == "exponential":
+        return lambda_exponential(delta, fit.A, fit.k)
+    if fit.model == "power":
+        return lambda_power(delta, fit.A, fit.k)
+    raise ValueError(f"Unknown intensity model: {fit.model}")
+
+
+def _simulate_loop(
+    m: np.ndarray,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    online: OnlineIntensityEstimator | None = None,
+    sigma: np.ndarray | None = None,
+    vol: MidVolatility | None = None,
+) -> tuple:
     n = len(m)
+    if sigma is None:
+        sigma = np.full(n, strat.sigma)
+    lattice = _inventory_levels(strat)
+    if n and lattice is not None and online is None and vol is None and np.all(sigma == sigma[0]):
+        return _simulate_tables(m, fit, strat, cfg, *lattice, float(sigma[0]))
+    rng = np.random.default_rng(cfg.seed)
+    g = strat.gamma
+    spread_term = _spread_term(g, fit)
 
     inventory = np.zeros(n)
     cash = np.zeros(n)
     realized_spread = np.zeros(n)
     inventory_pnl = np.zeros(n)
 
-    fills = []
+    fills = new_fill_log(cfg)
 
     q = 0.0
     c = 0.0
@@ -44,17 +101,18 @@ def run_backtest(mid: pd.Series, fit: IntensityFit, strat: StrategyConfig, cfg:
         tau_steps = max(strat.horizon_steps - t, 0)
         tau = tau_steps * strat.dt
 
-        quote = optimal_quote(
-            mid_price=m[t],
-            inventory=q,
-            gamma=strat.gamma,
-            sigma=strat.sigma,
-            time_to_horizon=tau,
-            k=max(fit.k, 1e-8),
-        )
+        if vol is not None:
+            sigma[t] = vol.update(m[t])
+        s = sigma[t]
 
-        delta_bid = max(m[t] - quote.bid, 0.0)
-        delta_ask = max(quote.ask - m[t], 0.0)
+        # A-S quotes, in the same operation order as optimal_quote; the quote distances are taken
+        # from the risk/spread terms directly so they do not depend on the mid's rounding
+        q_risk = q * g * s * s * tau
+        half_spread = spread_term + 0.5 * g * s * s * tau
+        bid = m[t] - q_risk - half_spread
+        ask = m[t] - q_risk + half_spread
+        delta_bid = max(q_risk + half_spread, 0.0)
+        delta_ask = max(half_spread - q_risk, 0.0)
 
         lam_bid = _arrival_rate(delta_bid, fit)
         lam_ask = _arrival_rate(delta_ask, fit)
@@ -65,19 +123,26 @@ def run_backtest(mid: pd.Series, fit: IntensityFit, strat: StrategyConfig, cfg:
         bid_fill = (rng.uniform() < p_bid) and (q + strat.order_size <= strat.max_inventory)
         ask_fill = (rng.uniform() < p_ask) and (q - strat.order_size >= -strat.max_inventory)
 
+        if online is not None:
+            online.advance(strat.dt)
+            if q + strat.order_size <= strat.max_inventory:
+                online.observe(delta_bid, strat.dt, float(bid_fill))
+            if q - strat.order_size >= -strat.max_inventory:
+                online.observe(delta_ask, strat.dt, float(ask_fill))
+
         if bid_fill:
             q += strat.order_size
-            c -= quote.bid * strat.order_size
-            edge = (m[t] - quote.bid) * strat.order_size
+            c -= bid * strat.order_size
+            edge = (m[t] - bid) * strat.order_size
             realized_spread[t] += edge
-            fills.append({"t": t, "side": "buy", "price": quote.bid, "mid": m[t], "delta": delta_bid})
+            fills.append(t, BUY, bid, m[t], delta_bid)
 
         if ask_fill:
             q -= strat.order_size
-            c += quote.ask * strat.order_size
-            edge = (quote.ask - m[t]) * strat.order_size
+            c += ask * strat.order_size
+            edge = (ask - m[t]) * strat.order_size
             realized_spread[t] += edge
-            fills.append({"t": t, "side": "sell", "price": quote.ask, "mid": m[t], "delta": delta_ask})
+            fills.append(t, SELL, ask, m[t], delta_ask)
 
         if t > 0:
             inventory_pnl[t] = (inventory[t - 1]) * (m[t] - m[t - 1])
@@ -85,34 +150,514 @@ def run_backtest(mid: pd.Series, fit: IntensityFit, strat: StrategyConfig, cfg:
         inventory[t] = q
         cash[t] = c
 
-    mtm = cash + inventory * m
+        if online is not None and cfg.refit_every > 0 and (t + 1) % cfg.refit_every == 0:
+            fit = online.refit() or fit
+            spread_term = _spread_term(g, fit)
+
+    return inventory, cash, realized_spread, inventory_pnl, fills
+
+
+def _spread_term(gamma: float, fit: IntensityFit) -> float:
+    return (1.0 / gamma) * math.log(1.0 + gamma / max(max(fit.k, 1e-8), 1e-12))
+
+
+FILL_TABLE_ROWS = 4096  # tau steps per memoised table block
+FILL_TABLES = LRUCache(1 << 26)
+
+
+class FillTables:
+    """Per-step fill probabilities indexed by (tau step, inventory level) for a fixed config.
+
+    For a constant sigma and a fixed fit, the A-S quote distances, and hence the bid/ask fill
+    probabilities, depend only on the remaining horizon ``tau = tau_steps * dt`` and the inventory
+    level. Tables are built in blocks of ``FILL_TABLE_ROWS`` tau steps with the same arithmetic
+    as the per-step loop, and memoised in the process-wide LRU ``FILL_TABLES``. The key leaves out
+    the horizon and the mid series, so parameter sweeps and repeated runs that share
+    gamma/sigma/k/dt reuse each other's blocks.
+    """
+
+    __slots__ = ("fit", "levels", "gamma", "sigma", "dt", "q_risk", "spread_term", "quotes", "key", "cache")
+
+    def __init__(
+        self,
+        fit: IntensityFit,
+        strat: StrategyConfig,
+        levels: np.ndarray,
+        sigma: float,
+        cache: LRUCache | None = None,
+        quotes: QuoteTable | None = None,
+    ):
+        if fit.model not in ("exponential", "power"):
+            raise ValueError(f"Unknown intensity model: {fit.model}")
+        self.fit = fit
+        self.levels = levels
+        self.gamma = g = strat.gamma
+        self.sigma = s = sigma
+        self.dt = strat.dt
+        self.q_risk = levels * g * s * s
+        self.spread_term = _spread_term(g, fit)
+        self.quotes = quotes
+        self.key = (fit.model, fit.A, fit.k, g, s, strat.dt, strat.order_size, strat.max_inventory)
+        if quotes is not None:
+            # quote tables end at the horizon, so the blocks are only valid for that horizon
+            self.key += ("glft", len(quotes.bid))
+        self.cache = FILL_TABLES if cache is None else cache
+
+    def _build(self, block: int) -> tuple[np.ndarray, ...]:
+        g, s = self.gamma, self.sigma
+        rows = np.arange(block * FILL_TABLE_ROWS, (block + 1) * FILL_TABLE_ROWS)
+        if self.quotes is not None:
+            rows = np.minimum(rows, len(self.quotes.bid) - 1)
+            d_bid = self.quotes.bid[rows]
+            d_ask = self.quotes.ask[rows]
+        else:
+            tau = rows[:, None] * self.dt
+            q_risk = self.q_risk[None, :] * tau
+            half_spread = self.spread_term + 0.5 * g * s * s * tau
+            d_bid = q_risk + half_spread
+            d_ask = half_spread - q_risk
+        p_bid = 1.0 - np.exp(-_arrival_rates(np.where(0.0 > d_bid, 0.0, d_bid), self.fit) * self.dt)
+        p_ask = 1.0 - np.exp(-_arrival_rates(np.where(0.0 > d_ask, 0.0, d_ask), self.fit) * self.dt)
+        if self.quotes is not None:
+            return p_bid, p_ask, d_bid, d_ask
+        return p_bid, p_ask
+
+    def block(self, block: int) -> tuple[np.ndarray, ...]:
+        """``(p_bid, p_ask)``, each ``(FILL_TABLE_ROWS, levels)``, for tau steps starting at ``block * FILL_TABLE_ROWS``.
+
+        With GLFT ``quotes`` the bid/ask offsets of the same cells follow.
+        """
+        return self.cache.get_or_build((self.key, block), lambda: self._build(block))
+
+
+class TableStepper:
+    """Resumable state of the table-driven loop engine: step index, inventory level and RNG.
+
+    :meth:`run` advances over the next mids and returns that stretch's fills and per-step level
+    changes. Uniforms are drawn in the same (step, side) order as the per-step loop, so any split
+    of the series into consecutive calls gives the same fills as one call.
+    """
+
+    __slots__ = ("tables", "rng", "t", "j", "horizon", "dt", "can_buy", "can_sell", "q_risk", "spread_term", "half")
+
+    def __init__(self, fit: IntensityFit, strat: StrategyConfig, cfg: BacktestConfig, levels: np.ndarray, zero: int, sigma: float):
+        quotes = quote_table(fit, strat, cfg.quote_cache_dir or None) if strat.quoting == "glft" else None
+        if quotes is not None and not np.array_equal(quotes.levels, levels):
+            raise ValueError("GLFT quote table and backtest disagree on the inventory grid")
+        self.tables = FillTables(fit, strat, levels, sigma, quotes=quotes)
+        self.rng = np.random.default_rng(cfg.seed)
+        self.t = 0
+        self.j = zero
+        self.horizon = strat.horizon_steps
+        self.dt = strat.dt
+        v = strat.order_size
+        self.can_buy = (levels + v <= strat.max_inventory).tolist()
+        self.can_sell = (levels - v >= -strat.max_inventory).tolist()
+        self.q_risk = self.tables.q_risk.tolist()
+        self.spread_term = self.tables.spread_term
+        self.half = 0.5 * strat.gamma * sigma * sigma
+
+    def run(self, m: np.ndarray, chunk: int = 1 << 16) -> tuple[np.ndarray, ...]:
+        """``(t, side, price, delta, steps)``: fills of this stretch (absolute ``t``) and level changes."""
+        n = len(m)
+        H, dt, R = self.horizon, self.dt, FILL_TABLE_ROWS
+        L = len(self.q_risk)
+        can_buy, can_sell, q_risk = self.can_buy, self.can_sell, self.q_risk
+        spread_term, half = self.spread_term, self.half
+        fill_t, fill_side, fill_price, fill_delta = [], [], [], []
+        steps = np.zeros(n, dtype=np.int64)
+        j, t_base = self.j, self.t
+        current = -1
+        glft = self.tables.quotes is not None
+        for t0 in range(0, n, chunk):
+            u = self.rng.uniform(size=2 * min(chunk, n - t0)).tolist()
+            for i in range(0, len(u), 2):
+                s = t0 + (i >> 1)
+                t = t_base + s
+                k = H - t if t < H else 0
+                if k // R != current:
+                    current = k // R
+                    p_bid, p_ask, *offsets = (memoryview(a.reshape(-1)) for a in self.tables.block(current))
+                x = (k - current * R) * L + j
+                buy = u[i] < p_bid[x] and can_buy[j]
+                sell = u[i + 1] < p_ask[x] and can_sell[j]
+                if (buy or sell) and glft:
+                    if buy:
+                        d = offsets[0][x]
+                        fill_t.append(t)
+                        fill_side.append(BUY)
+                        fill_price.append(m[s] - d)
+                        fill_delta.append(max(d, 0.0))
+                    if sell:
+                        d = offsets[1][x]
+                        fill_t.append(t)
+                        fill_side.append(SELL)
+                        fill_price.append(m[s] + d)
+                        fill_delta.append(max(d, 0.0))
+                    j += buy - sell
+                    steps[s] = buy - sell
+                elif buy or sell:
+                    tau = k * dt
+                    half_spread = spread_term + half * tau
+                    qr = q_risk[j] * tau
+                    if buy:
+                        fill_t.append(t)
+                        fill_side.append(BUY)
+                        fill_price.append(m[s] - qr - half_spread)
+                        fill_delta.append(max(qr + half_spread, 0.0))
+                    if sell:
+                        fill_t.append(t)
+                        fill_side.append(SELL)
+                        fill_price.append(m[s] - qr + half_spread)
+                        fill_delta.append(max(half_spread - qr, 0.0))
+                    j += buy - sell
+                    steps[s] = buy - sell
+        self.j = j
+        self.t = t_base + n
+        return (
+            np.asarray(fill_t, dtype=np.int64),
+            np.asarray(fill_side, dtype=np.int8),
+            np.asarray(fill_price, dtype=float),
+            np.asarray(fill_delta, dtype=float),
+            steps,
+        )
+
+
+def table_state(
+    m: np.ndarray,
+    levels: np.ndarray,
+    order_size: float,
+    t_fill: np.ndarray,
+    side: np.ndarray,
+    price: np.ndarray,
+    steps: np.ndarray,
+    j0: int,
+    cash0: float = 0.0,
+    prev: tuple[float, float] | None = None,
+) -> tuple[np.ndarray, ...]:
+    """Per-step ``inventory, cash, realized_spread, inventory_pnl`` from one stretch of fills.
+
+    ``t_fill`` is relative to the stretch. ``j0``/``cash0`` are the level and cash before it and
+    ``prev`` the previous step's ``(inventory, mid)``; cash is one left-to-right running sum, so
+    consecutive stretches chained this way reproduce a single pass exactly.
+    """
+    n = len(m)
+    v = order_size
+    is_buy = side == BUY
+    inventory = levels[j0 + np.cumsum(steps)]
+    flows = np.zeros((n, 2))
+    flows[t_fill[is_buy], 0] = -(price[is_buy] * v)
+    flows[t_fill[~is_buy], 1] = price[~is_buy] * v
+    cash = np.cumsum(np.concatenate([[cash0], flows.ravel()]))[2::2]
+    realized_spread = np.zeros(n)
+    realized_spread[t_fill[is_buy]] += (m[t_fill[is_buy]] - price[is_buy]) * v
+    realized_spread[t_fill[~is_buy]] += (price[~is_buy] - m[t_fill[~is_buy]]) * v
+    inventory_pnl = np.zeros(n)
+    inventory_pnl[1:] = inventory[:-1] * (m[1:] - m[:-1])
+    if prev is not None and n:
+        inventory_pnl[0] = prev[0] * (m[0] - prev[1])
+    return inventory, cash, realized_spread, inventory_pnl
+
+
+def _simulate_tables(
+    m: np.ndarray,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    levels: np.ndarray,
+    zero: int,
+    sigma: float,
+) -> tuple:
+    """The loop engine for a constant sigma and fixed fit: table lookups plus RNG per step.
 
-    ts = pd.DataFrame(
-        {
-            "t": np.arange(n),
-            "mid": m,
-            "inventory": inventory,
-            "cash": cash,
-            "mtm_pnl": mtm,
-            "realized_spread": np.cumsum(realized_spread),
-            "inventory_pnl": np.cumsum(inventory_pnl),
-        }
+    Fill decisions come from :class:`FillTables`; quote prices are only computed on the steps that
+    fill, and the per-step state is rebuilt from the fills afterwards. The result is
+    bit-identical to the per-step loop.
+    """
+    t_fill, side, price, delta, steps = TableStepper(fit, strat, cfg, levels, zero, sigma).run(m)
+    state = table_state(m, levels, strat.order_size, t_fill, side, price, steps, zero)
+    fills = new_fill_log(cfg)
+    fills.extend(t=t_fill, side=side, price=price, mid=m[t_fill], delta=delta)
+    return (*state, fills)
+
+
+def new_fill_log(cfg: BacktestConfig, extra: dict[str, type] | None = None) -> FillLog:
+    """Fill buffer for one run; streams to ``cfg.fill_log_dir`` in chunks when that is set."""
+    return FillLog(extra=extra, spill_dir=cfg.fill_log_dir or None, chunk_rows=cfg.fill_chunk_rows)
+
+
+VECTOR_ENGINE_MAX_LEVELS = 4096
+
+
+def _inventory_levels(strat: StrategyConfig) -> tuple[np.ndarray, int] | None:
+    """Reachable inventory levels as exact multiples of order_size, plus the index of q=0.
+
+    Returns None when the levels are not exactly representable, i.e. when the loop's running
+    ``q += order_size`` could drift away from ``j * order_size`` and the scan would not be
+    bit-identical.
+    """
+    v = strat.order_size
+    if not v > 0.0:
+        return None
+    hi = 0
+    while hi * v + v <= strat.max_inventory:
+        hi += 1
+        if hi > VECTOR_ENGINE_MAX_LEVELS:
+            return None
+    lo = 0
+    while lo * v - v >= -strat.max_inventory:
+        lo -= 1
+        if -lo > VECTOR_ENGINE_MAX_LEVELS:
+            return None
+    j = np.arange(lo, hi + 1)
+    levels = j * v
+    if not (np.array_equal(levels[:-1] + v, levels[1:]) and np.array_equal(levels[1:] - v, levels[:-1])):
+        return None
+    return levels, -lo
+
+
+def _simulate_vectorized(
+    m: np.ndarray,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    online: OnlineIntensityEstimator | None = None,
+    sigma: np.ndarray | None = None,
+    vol: MidVolatility | None = None,
+) -> tuple:
+    """Block-scan engine, bit-identical to :func:`_simulate_loop` for the same seed.
+
+    Inventory lives on a bounded lattice of levels, so the path dependence can be resolved as a
+    scan over finite-state transition maps: (1) run every block of ``B`` steps from every possible
+    starting level at once, (2) chain the per-block maps sequentially to find each block's true
+    starting level, (3) replay all blocks in lock-step from those levels. Python iterations are
+    ``O(2B + n/B)`` instead of ``O(n)``; each one is a NumPy op across blocks x levels.
+    """
+    n = len(m)
+    lattice = _inventory_levels(strat)
+    if n == 0 or lattice is None or online is not None:
+        # on-line re-fits change the intensity mid-run, which the block scan cannot absorb
+        return _simulate_loop(m, fit, strat, cfg, online, sigma, vol)
+    levels, zero = lattice
+    L = len(levels)
+
+    rng = np.random.default_rng(cfg.seed)
+    u = rng.uniform(size=2 * n).reshape(n, 2)
+
+    g, v, dt = strat.gamma, strat.order_size, strat.dt
+    s = np.full(n, strat.sigma) if sigma is None else (vol.series(m) if vol is not None else sigma)
+    if vol is not None:
+        sigma[:] = s
+    tau = np.maximum(strat.horizon_steps - np.arange(n), 0) * dt
+    # Same operation order as optimal_quote so every intermediate rounds identically.
+    half_spread = _spread_term(g, fit) + 0.5 * g * s * s * tau
+    # constant sigma: fold the per-level risk into one table (same rounding as the loop's product)
+    q_risk = levels * g * s[0] * s[0] if np.all(s == s[0]) else None
+    can_buy = levels + v <= strat.max_inventory
+    can_sell = levels - v >= -strat.max_inventory
+
+    if fit.model not in ("exponential", "power"):
+        raise ValueError(f"Unknown intensity model: {fit.model}")
+
+    def step(t: np.ndarray, j: np.ndarray) -> tuple:
+        mt = m[t]
+        qr = q_risk[j] * tau[t] if q_risk is not None else levels[j] * g * s[t] * s[t] * tau[t]
+        bid = mt - qr - half_spread[t]
+        ask = mt - qr + half_spread[t]
+        d_bid = qr + half_spread[t]
+        d_bid = np.where(0.0 > d_bid, 0.0, d_bid)
+        d_ask = half_spread[t] - qr
+        d_ask = np.where(0.0 > d_ask, 0.0, d_ask)
+        p_bid = 1.0 - np.exp(-_arrival_rates(d_bid, fit) * dt)
+        p_ask = 1.0 - np.exp(-_arrival_rates(d_ask, fit) * dt)
+        bid_fill = (u[t, 0] < p_bid) & can_buy[j]
+        ask_fill = (u[t, 1] < p_ask) & can_sell[j]
+        return bid_fill, ask_fill, bid, ask, d_bid, d_ask
+
+    B = max(1, math.isqrt(n))
+    nb = -(-n // B)
+    starts = np.arange(nb) * B
+
+    # (1) end level of each block for every possible start level
+    state = np.tile(np.arange(L), (nb, 1))
+    for b in range(B):
+        t = starts + b
+        live = (t < n)[:, None]
+        tt = np.broadcast_to(np.minimum(t, n - 1)[:, None], state.shape)
+        bid_fill, ask_fill = step(tt, state)[:2]
+        state += (bid_fill & live).astype(np.int64) - (ask_fill & live)
+
+    # (2) chain block maps
+    block_start = np.empty(nb, dtype=np.int64)
+    j = zero
+    for i in range(nb):
+        block_start[i] = j
+        j = state[i, j]
+
+    # (3) replay the realised path
+    bid_fill = np.zeros(n, dtype=bool)
+    ask_fill = np.zeros(n, dtype=bool)
+    bid = np.empty(n)
+    ask = np.empty(n)
+    d_bid = np.empty(n)
+    d_ask = np.empty(n)
+    level = np.empty(n, dtype=np.int64)
+    j = block_start
+    for b in range(B):
+        t = starts + b
+        live = t < n
+        t, j_live = t[live], j[live]
+        fb, fa, bid[t], ask[t], d_bid[t], d_ask[t] = step(t, j_live)
+        bid_fill[t], ask_fill[t] = fb, fa
+        j_live = j_live + fb.astype(np.int64) - fa
+        level[t] = j_live
+        j = j.copy()
+        j[live] = j_live
+
+    inventory = levels[level]
+    flows = np.zeros((n, 2))
+    flows[:, 0] = np.where(bid_fill, -(bid * v), 0.0)
+    flows[:, 1] = np.where(ask_fill, ask * v, 0.0)
+    cash = np.cumsum(flows.ravel())[1::2]
+
+    realized_spread = np.zeros(n) + np.where(bid_fill, (m - bid) * v, 0.0)
+    realized_spread = realized_spread + np.where(ask_fill, (ask - m) * v, 0.0)
+
+    inventory_pnl = np.zeros(n)
+    inventory_pnl[1:] = inventory[:-1] * (m[1:] - m[:-1])
+
+    t_buy = np.flatnonzero(bid_fill)
+    t_sell = np.flatnonzero(ask_fill)
+    order = np.argsort(np.concatenate([2 * t_buy, 2 * t_sell + 1]), kind="stable")
+    fills = new_fill_log(cfg)
+    fills.extend(
+        t=np.concatenate([t_buy, t_sell])[order],
+        side=np.repeat(np.array([BUY, SELL], dtype=np.int8), [len(t_buy), len(t_sell)])[order],
+        price=np.concatenate([bid[t_buy], ask[t_sell]])[order],
+        mid=np.concatenate([m[t_buy], m[t_sell]])[order],
+        delta=np.concatenate([d_bid[t_buy], d_ask[t_sell]])[order],
     )
+    return inventory, cash, realized_spread, inventory_pnl, fills
+
+
+ENGINES = {"loop": _simulate_loop, "vectorized": _simulate_vectorized}
+QUOTING = ("as", "glft")
+
+
+def _simulate_glft(
+    m: np.ndarray,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    online: OnlineIntensityEstimator | None = None,
+    sigma: np.ndarray | None = None,
+    vol: MidVolatility | None = None,
+) -> tuple:
+    """Quotes from the precomputed GLFT table (:func:`~market_making_engine.glft.quote_table`).
+
+    The table is solved for one fit and one sigma, so on-line re-fits and per-step sigma are
+    rejected. Both engines run the table-driven loop here, since it only does lookups.
+    """
+    if online is not None or vol is not None or not np.all(sigma == strat.sigma):
+        raise ValueError("GLFT quoting uses a fixed fit and the constant strat.sigma")
+    lattice = _inventory_levels(strat)
+    if lattice is None:
+        raise ValueError("GLFT quoting needs inventory levels that are exact multiples of order_size")
+    return _simulate_tables(m, fit, strat, cfg, *lattice, strat.sigma)
+
+
+def run_backtest(
+    mid: np.ndarray | pd.Series,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    online: OnlineIntensityEstimator | None = None,
+    sigma: np.ndarray | pd.Series | MidVolatility | None = None,
+) -> BacktestResult:
+    """Simulate quoting over ``mid``.
+
+    With an ``online`` estimator, every step's quotes and fills are fed to it and the intensity
+    used for fills is re-solved every ``cfg.refit_every`` steps (loop engine only).
+
+    ``sigma`` replaces the constant ``strat.sigma`` with a per-step series, or with a
+    :class:`~market_making_engine.volatility.RollingVolatility`/``EWMAVolatility`` estimator. The loop
+    engine updates the estimator step by step and the vectorized engine uses its bulk series
+    (equal up to rounding). The sigma actually used is returned in the timeseries.
+
+    ``strat.quoting="glft"`` quotes from the finite-inventory GLFT table instead of the A-S
+    formula (exponential fits, constant sigma).
+    """
+    m = np.asarray(mid, dtype=float)
+    n = len(m)
+    if cfg.engine not in ENGINES:
+        raise ValueError(f"Unknown backtest engine: {cfg.engine}")
+    if strat.quoting not in QUOTING:
+        raise ValueError(f"Unknown quoting model: {strat.quoting}")
+    vol = None
+    if sigma is None:
+        sig = np.full(n, strat.sigma)
+    elif hasattr(sigma, "update"):
+        if not hasattr(sigma, "series"):
+            raise ValueError("Range volatility needs OHLC bars; pass its sigma series instead")
+        vol, sig = sigma, np.empty(n)
+    else:
+        sig = np.array(sigma, dtype=float)
+        if sig.shape != (n,):
+            raise ValueError(f"sigma has {len(sig)} steps, mid has {n}")
+    with stage("backtest.simulate"):
+        simulate = _simulate_glft if strat.quoting == "glft" else ENGINES[cfg.engine]
+        inventory, cash, realized_spread, inventory_pnl, fills = simulate(m, fit, strat, cfg, online, sig, vol)
+    count("steps", n)
+    count("fills", len(fills))
+
+    with stage("backtest.summarize"):
+        result = _summarize(m, inventory, cash, realized_spread, inventory_pnl, fills, cfg, sig)
+    if online is not None:
+        result.summary["online_refits"] = online.refits
+        if online.fit is not None:
+            result.summary["online_A"] = online.fit.A
+            result.summary["online_k"] = online.fit.k
+    return result
+
+
+def _summarize(
+    m: np.ndarray,
+    inventory: np.ndarray,
+    cash: np.ndarray,
+    realized_spread: np.ndarray,
+    inventory_pnl: np.ndarray,
+    fills: FillLog,
+    cfg: BacktestConfig,
+    sigma: np.ndarray | None = None,
+) -> BacktestResult:
+    """Build the timeseries, markouts and summary from per-step state arrays (shared by all engines)."""
+    n = len(m)
+    mtm = cash + inventory * m
+
+    columns = {
+        "t": np.arange(n),
+        "mid": m,
+        "inventory": inventory,
+        "cash": cash,
+        "mtm_pnl": mtm,
+        "realized_spread": np.cumsum(realized_spread),
+        "inventory_pnl": np.cumsum(inventory_pnl),
+    }
+    if sigma is not None:
+        columns["sigma"] = sigma
 
-    fills_df = pd.DataFrame(fills)
     adverse = 0.0
-    if not fills_df.empty:
-        mark = []
-        for row in fills_df.itertuples(index=False):
-            t0 = int(row.t)
-            t1 = min(t0 + cfg.markout_horizon, n - 1)
-            future_mid = m[t1]
-            side = 1.0 if row.side == "buy" else -1.0
+    horizons = tuple(sorted(set(cfg.markout_horizons)))
+    t = fills.column("t")
+    side = fills.column("side")
+    fill_mid = fills.column("mid")
+    with stage("backtest.markouts"):
+        if len(fills):
             # positive means adverse move against fill
-            adverse_cost = side * (row.mid - future_mid)
-            mark.append(adverse_cost)
-        fills_df["adverse_selection_cost"] = mark
-        adverse = float(np.sum(mark))
+            mark = markout_matrix(m, t, side, fill_mid, (cfg.markout_horizon,))[:, 0]
+            fills.add_column("adverse_selection_cost", mark)
+            adverse = float(np.sum(mark))
+        markouts = markout_sums(m, t, side, fill_mid, horizons) if horizons else None
 
     summary = {
         "final_pnl": float(mtm[-1]),
@@ -122,7 +667,11 @@ def run_backtest(mid: pd.Series, fit: IntensityFit, strat: StrategyConfig, cfg:
         "realized_spread_capture": float(np.sum(realized_spread)),
         "inventory_pnl": float(np.sum(inventory_pnl)),
         "adverse_selection_cost": adverse,
-        "num_fills": int(len(fills_df)),
+        "num_fills": int(len(fills)),
+        "fill_log_peak_bytes": int(fills.peak_bytes),
     }
+    if markouts is not None:
+        summary.update(markouts.curve())
 
-    return BacktestResult(timeseries=ts, fills=fills_df, summary=summary)
+    fills.close()
+    return BacktestResult(columns=columns, fill_log=fills, summary=summary, markout_sums=markouts)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from .avellaneda_stoikov import optimal_quote
+from .backtest import run_backtest
+from .config import BacktestConfig, StrategyConfig
+from .intensity import IntensityFit, fit_exponential_mle, fit_power_mle
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+BASELINE_VERSION = 1
+SUITES = {
+    "quick": {"steps": (1_000, 10_000, 100_000), "bins": (50, 500), "grid": (200, 2000), "quotes": 100_000, "rows": (100_000,)},
+    "full": {
+        "steps": (1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+        "bins": (50, 500, 5000),
+        "grid": (200, 2000, 20000),
+        "quotes": 1_000_000,
+        "rows": (100_000, 1_000_000),
+    },
+}
+
+
+@dataclass(slots=True)
+class BenchCase:
+    name: str
+    unit: str  # what ``run`` returns a count of, e.g. "steps"
+    setup: Callable[[], object]  # builds inputs; not timed
+    run: Callable[[object], int]
+    teardown: Callable[[object], None] | None = None
+
+
+def _demo_mid(n: int, seed: int = 7) -> pd.Series:
+    # same construction as ``mm-engine demo``
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    return pd.Series(100.0 + np.cumsum(rng.normal(0.0, 0.002, size=n)), name="mid")
+
+
+def _demo_bins(n_bins: int, model: str, seed: int = 7) -> pd.DataFrame:
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    deltas = np.linspace(0.01, 0.5, n_bins)
+    exposure = np.full_like(deltas, 200.0)
+    lam = 1.2 * np.exp(-8.0 * deltas) if model == "exponential" else 0.05 * (deltas + 1e-4) ** -1.5
+    return pd.DataFrame({"delta": deltas, "count": rng.poisson(lam * exposure), "exposure": exposure})
+
+
+DEMO_FIT = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+
+
+def _backtest_case(n: int, engine: str) -> BenchCase:
+    def run(mid: pd.Series) -> int:
+        run_backtest(mid, DEMO_FIT, StrategyConfig(horizon_steps=n), BacktestConfig(seed=7, engine=engine))
+        return n
+
+    return BenchCase(f"backtest_{engine}_{n}", "steps", lambda: _demo_mid(n), run)
+
+
+def _fit_case(model: str, n_bins: int, grid: int, method: str) -> BenchCase:
+    fit_fn = fit_exponential_mle if model == "exponential" else fit_power_mle
+
+    def run(df: pd.DataFrame) -> int:
+        fit_fn(df, grid_points=grid, method=method)
+        return 1
+
+    name = f"fit_{model}_{method}_b{n_bins}" + (f"_g{grid}" if method == "grid" else "")
+    return BenchCase(name, "fits", lambda: _demo_bins(n_bins, model), run)
+
+
+def _quote_case(n: int) -> BenchCase:
+    def run(inputs: tuple) -> int:
+        mids, invs = inputs
+        for mid, q in zip(mids, invs):
+            optimal_quote(mid, q, 0.1, 0.02, 150.0, 8.0)
+        return n
+
+    def setup() -> tuple:
+        rng = np.random.default_rng(7)
+        return (100.0 + rng.normal(0.0, 0.1, size=n)).tolist(), rng.integers(-20, 21, size=n).astype(float).tolist()
+
+    return BenchCase(f"optimal_quote_{n}", "quotes", setup, run)
+
+
+def _csv_case(rows: int) -> BenchCase:
+    from .cli import _load_csv
+
+    def setup() -> str:
+        path = Path(tempfile.mkdtemp(prefix="mm-bench-")) / "mid.csv"
+        _demo_mid(rows).to_frame().to_csv(path, index=False)
+        return str(path)
+
+    def run(path: str) -> int:
+        _load_csv(path)
+        return rows
+
+    return BenchCase(f"load_csv_{rows}", "rows", setup, run, lambda path: shutil.rmtree(Path(path).parent))
+
+
+# What each kind of process imports before it can do any work.
+STARTUP_MODULES = {
+    "cli": "market_making_engine.cli",  # parser and --help; commands import their own modules
+    "quote": "market_making_engine.live",
+    "backtest": "market_making_engine.backtest",
+    "calibrate": "market_making_engine.intensity",
+    "sweep": "market_making_engine.sweep",
+}
+
+
+def _startup_case(label: str, module: str) -> BenchCase:
+    def run(_) -> int:
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        return 1
+
+    return BenchCase(f"startup_{label}", "starts", lambda: None, run)
+
+
+def _spawn_case(module: str = "market_making_engine.sweep") -> BenchCase:
+    # a fresh interpreter that imports the pool's worker module, as with the spawn/forkserver start methods
+    def run(_) -> int:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx, initializer=importlib.import_module, initargs=(module,)) as pool:
+            pool.submit(os.getpid).result()
+        return 1
+
+    return BenchCase("worker_spawn", "starts", lambda: None, run)
+
+
+def benchmark_cases(suite: str = "quick", pattern: str | None = None) -> list[BenchCase]:
+    if suite not in SUITES:
+        raise ValueError(f"Unknown benchmark suite: {suite}")
+    spec = SUITES[suite]
+    cases = []
+    for n in spec["steps"]:
+        cases.append(_backtest_case(n, "vectorized"))
+        if n <= 1_000_000:
+            # the loop engine is ~2 us/step; 1e7 steps only runs on the vectorised engine
+            cases.append(_backtest_case(n, "loop"))
+    for model in ("exponential", "power"):
+        for n_bins in spec["bins"]:
+            cases.append(_fit_case(model, n_bins, 2000, "newton"))
+            cases.extend(_fit_case(model, n_bins, g, "grid") for g in spec["grid"])
+    cases.append(_quote_case(spec["quotes"]))
+    cases.extend(_csv_case(r) for r in spec["rows"])
+    cases.extend(_startup_case(label, module) for label, module in STARTUP_MODULES.items())
+    cases.append(_spawn_case())
+    return [c for c in cases if pattern is None or pattern in c.name]
+
+
+def run_case(case: BenchCase, repeat: int = 3, memory: bool = True, min_time: float = 0.05) -> dict:
+    """Best-of-``repeat`` wall time and throughput, plus traced peak memory from one extra run.
+
+    Cases faster than ``min_time`` are run several times per timed sample to average out timer noise.
+    """
+    inputs = case.setup()
+    best = float("inf")
+    peak = None
+    try:
+        t0 = time.perf_counter()
+        units = case.run(inputs)  # warm-up; also sizes the inner loop
+        inner = max(1, math.ceil(min_time / max(time.perf_counter() - t0, 1e-9)))
+        for _ in range(max(repeat, 1)):
+            t0 = time.perf_counter()
+            for _ in range(inner):
+                case.run(inputs)
+            best = min(best, (time.perf_counter() - t0) / inner)
+        if memory:
+            # tracemalloc slows Python-level code, so it gets its own, untimed run
+            tracemalloc.start()
+            try:
+                case.run(inputs)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    finally:
+        if case.teardown is not None:
+            case.teardown(inputs)
+    return {"seconds": best, "throughput": units / best if best > 0 else float("inf"), "unit": f"{case.unit}/s", "peak_bytes": peak}
+
+
+def run_benchmarks(
+    cases: list[BenchCase],
+    repeat: int = 3,
+    memory: bool = True,
+    progress: Callable[[str, dict], None] | None = None,
+    min_time: float = 0.05,
+) -> dict:
+    import pandas as pd
+
+    results = {}
+    for case in cases:
+        results[case.name] = run_case(case, repeat=repeat, memory=memory, min_time=min_time)
+        if progress is not None:
+            progress(case.name, results[case.name])
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": results,
+    }
+
+
+def save_baseline(report: dict, path: str | Path) -> Path:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(report, indent=1, sort_keys=True))
+    return p
+
+
+def load_baseline(path: str | Path) -> dict:
+    report = json.loads(Path(path).read_text())
+    if report.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported benchmark baseline version: {report.get('version')}")
+    return report
+
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float = 0.2) -> pd.DataFrame:
+    """One row per benchmark present in both reports.
+
+    A case regresses when its throughput drops below ``(1 - threshold)`` of the baseline or its
+    peak memory grows beyond ``(1 + threshold)`` of it.
+    """
+    import pandas as pd
+
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        speed = cur["throughput"] / base["throughput"] if base["throughput"] else float("nan")
+        mem = None
+        if cur.get("peak_bytes") and base.get("peak_bytes"):
+            mem = cur["peak_bytes"] / base["peak_bytes"]
+        rows.append(
+            {
+                "name": name,
+                "throughput": cur["throughput"],
+                "baseline_throughput": base["throughput"],
+                "speed_ratio": speed,
+                "memory_ratio": mem,
+                "regression": bool(speed < 1.0 - threshold or (mem is not None and mem > 1.0 + threshold)),
+            }
+        )
+    return pd.DataFrame(rows, columns=["name", "throughput", "baseline_throughput", "speed_ratio", "memory_ratio", "regression"])
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CACHE_VERSION = 1
+
+
+def file_digest(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DataCache:
+    """Columnar on-disk cache of tabular inputs as one ``.npy`` file per column.
+
+    Entries are keyed by the source file's content hash (CSV inputs) or by an explicit request key
+    (fetched klines). Numeric columns are memory-mapped on load, so e.g. a mid series goes into
+    ``run_backtest`` without being parsed or copied. The content hash of a file is itself
+    remembered per (path, size, mtime), so unchanged files are not re-hashed either.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._index_path = self.root / "file_index.json"
+        self._index = json.loads(self._index_path.read_text()) if self._index_path.exists() else {}
+
+    # -- keys -----------------------------------------------------------------
+    def key_for_file(self, path: str | Path) -> str:
+        p = Path(path).resolve()
+        st = p.stat()
+        stamp = f"{p}|{st.st_size}|{st.st_mtime_ns}"
+        digest = self._index.get(stamp)
+        if digest is None:
+            digest = file_digest(p)
+            self._index = {k: v for k, v in self._index.items() if not k.startswith(f"{p}|")}
+            self._index[stamp] = digest
+            self._write_atomic(self._index_path, json.dumps(self._index, indent=1))
+        return f"file-{digest}"
+
+    @staticmethod
+    def key_for_request(**params) -> str:
+        blob = json.dumps(params, sort_keys=True, default=str)
+        return "req-" + hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+    # -- storage --------------------------------------------------------------
+    def _entry(self, key: str) -> Path:
+        return self.root / key
+
+    def contains(self, key: str) -> bool:
+        return (self._entry(key) / "meta.json").exists()
+
+    def put(self, key: str, df: pd.DataFrame, source: str = "") -> None:
+        import pandas as pd
+
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        columns = []
+        for i, col in enumerate(df.columns):
+            s = df[col]
+            if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+                arr = s.to_numpy()
+            elif pd.api.types.is_datetime64_any_dtype(s):
+                arr = s.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy() if s.dt.tz is not None else s.to_numpy()
+            else:
+                arr = s.astype(str).to_numpy(dtype=str)
+            fname = f"c{i}.npy"
+            np.save(entry / fname, np.ascontiguousarray(arr))
+            tz = str(s.dt.tz) if pd.api.types.is_datetime64_any_dtype(s) and s.dt.tz is not None else None
+            columns.append({"name": str(col), "file": fname, "tz": tz})
+        meta = {"version": CACHE_VERSION, "rows": len(df), "columns": columns, "source": source}
+        # meta.json is written last, so a partially written entry is never treated as a hit
+        self._write_atomic(entry / "meta.json", json.dumps(meta, indent=1))
+
+    def _meta(self, key: str) -> dict:
+        return json.loads((self._entry(key) / "meta.json").read_text())
+
+    def column(self, key: str, name: str) -> np.ndarray:
+        """Memory-mapped (read-only) view of one cached column."""
+        for c in self._meta(key)["columns"]:
+            if c["name"] == name:
+                return np.load(self._entry(key) / c["file"], mmap_mode="r")
+        raise KeyError(f"Column {name!r} not in cache entry {key}")
+
+    def frame(self, key: str) -> pd.DataFrame:
+        import pandas as pd
+
+        out = {}
+        for c in self._meta(key)["columns"]:
+            arr = np.load(self._entry(key) / c["file"], mmap_mode="r")
+            s = pd.Series(arr, copy=False)
+            if c["tz"]:
+                s = s.dt.tz_localize("UTC").dt.tz_convert(c["tz"])
+            out[c["name"]] = s
+        return pd.DataFrame(out)
+
+    def iter_chunks(self, key: str, chunksize: int = 1_000_000):
+        """Yield row chunks of an entry; only the current chunk is materialised in memory."""
+        import pandas as pd
+
+        meta = self._meta(key)
+        cols = {c["name"]: np.load(self._entry(key) / c["file"], mmap_mode="r") for c in meta["columns"]}
+        for start in range(0, meta["rows"], chunksize):
+            yield pd.DataFrame({name: np.array(arr[start : start + chunksize]) for name, arr in cols.items()})
+
+    def get_or_build(self, key: str, build: Callable[[], pd.DataFrame], source: str = "") -> str:
+        if self.contains(key):
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.put(key, build(), source=source)
+        return key
+
+    # -- CSV front end ----------------------------------------------------------
+    def csv_key(self, path: str | Path) -> str:
+        import pandas as pd
+
+        return self.get_or_build(self.key_for_file(path), lambda: pd.read_csv(path), source=str(path))
+
+    def read_csv(self, path: str | Path) -> pd.DataFrame:
+        return self.frame(self.csv_key(path))
+
+    def read_csv_column(self, path: str | Path, column: str) -> np.ndarray:
+        return self.column(self.csv_key(path), column)
+
+    def stats(self) -> dict:
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str) -> None:
+        tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+        tmp.write_text(text)
+        os.replace(tmp, path)
+
+
+class LRUCache:
+    """In-memory memo of tuples of NumPy arrays, bounded by total ``nbytes``.
+
+    The least recently used entries are evicted once the budget is exceeded; a result larger than
+    the whole budget is returned without being stored.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 26):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[object, tuple] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_build(self, key, build: Callable[[], tuple]) -> tuple:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = build()
+        size = sum(a.nbytes for a in entry)
+        if size <= self.max_bytes:
+            self._entries[key] = entry
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self.nbytes -= sum(a.nbytes for a in old)
+                self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self), "nbytes": self.nbytes}
@@ -1,32 +1,76 @@
 from __future__ import annotations
 
 import argparse
-from dataclasses import asdict
+import cProfile
+import os
+from dataclasses import asdict, replace
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
-import pandas as pd
+from . import instrument
+from .config import BacktestConfig, CalibrationConfig, LOBConfig, PortfolioConfig, StrategyConfig, WalkForwardConfig
+from .instrument import count, stage
 
-from .backtest import run_backtest
-from .config import BacktestConfig, CalibrationConfig, StrategyConfig
-from .data_provider import fetch_binance_klines
-from .intensity import fit_intensity
-from .reporting import write_backtest_summary, write_mle_report
+if TYPE_CHECKING:
+    import pandas as pd
 
+    from .cache import DataCache
+    from .intensity import IntensityFit
+    from .online import OnlineIntensityEstimator
+
+# Command modules (and NumPy/pandas with them) are imported inside each command, so building the
+# parser, ``--help`` and pool workers that import this module stay cheap.
+
+
+def _open_cache(args: argparse.Namespace) -> DataCache | None:
+    from .cache import DataCache
+
+    return DataCache(args.cache_dir) if getattr(args, "cache_dir", None) else None
+
+
+def _load_csv(path: str, cache: DataCache | None = None) -> pd.DataFrame:
+    import pandas as pd
+
+    with stage("io.load_csv"):
+        if cache is not None:
+            return cache.read_csv(path)
+        count("bytes_read", os.path.getsize(path))
+        return pd.read_csv(path)
+
+
+def _load_mid(path: str, col: str, cache: DataCache | None = None) -> pd.Series:
+    import pandas as pd
 
-def _load_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
+    if cache is not None:
+        # memory-mapped straight from the columnar cache, no parse and no copy
+        with stage("io.load_csv"):
+            return pd.Series(cache.read_csv_column(path, col), name=col, copy=False)
+    return _load_csv(path)[col]
+
+
+def _report_cache(cache: DataCache | None) -> None:
+    if cache is not None:
+        print(f"Cache ({cache.root}): hits={cache.hits} misses={cache.misses}")
 
 
 def cmd_calibrate(args: argparse.Namespace) -> int:
-    df = _load_csv(args.input)
-    cfg = CalibrationConfig(model=args.model)
-    fit = fit_intensity(
+    import pandas as pd
+
+    from .intensity import fit_intensity_with_profile
+    from .reporting import write_mle_report
+
+    cache = _open_cache(args)
+    df = _load_csv(args.input, cache)
+    if args.group_by:
+        return _cmd_calibrate_groups(args, df, cache)
+    cfg = CalibrationConfig(model=args.model, method=args.method)
+    fit, profile = fit_intensity_with_profile(
         df,
         model=cfg.model,
-        k_min=args.k_min,
-        k_max=args.k_max,
+        k_min=cfg.k_min if args.k_min is None else args.k_min,
+        k_max=cfg.k_max if args.k_max is None else args.k_max,
         grid_points=args.k_grid_points,
+        method=cfg.method,
     )
 
     out = Path(args.output)
@@ -34,20 +78,52 @@ def cmd_calibrate(args: argparse.Namespace) -> int:
     pd.DataFrame([asdict(fit)]).to_csv(out, index=False)
 
     report_path = args.report or "reports/mle_report.md"
-    write_mle_report(report_path, fit, df)
+    write_mle_report(report_path, fit, df, profile=profile)
     print(f"Saved fit -> {out}")
     print(f"Saved report -> {report_path}")
+    _report_cache(cache)
     return 0
 
 
-def cmd_backtest(args: argparse.Namespace) -> int:
-    mid_df = _load_csv(args.mid)
-    fit_df = _load_csv(args.fit)
+def _cmd_calibrate_groups(args: argparse.Namespace, df: pd.DataFrame, cache: DataCache | None) -> int:
+    from .intensity import fit_intensity_batch
+
+    table = fit_intensity_batch(
+        df,
+        [c.strip() for c in args.group_by.split(",")],
+        select=args.select,
+        k_min=args.k_min,
+        k_max=args.k_max,
+        grid_points=args.k_grid_points,
+        method=args.method,
+        workers=args.workers,
+    )
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(out, index=False)
+    counts = table["model"].value_counts()
+    print(f"Saved {len(table)} group fits -> {out}")
+    print("  selected by " + args.select + ": " + ", ".join(f"{m}={n}" for m, n in counts.items()))
+    _report_cache(cache)
+    return 0
+
+
+def _load_fit(path: str, cache: DataCache | None = None) -> IntensityFit:
+    return _fit_from_row(_load_csv(path, cache).iloc[0].to_dict())
+
+
+def _load_fits(path: str, cache: DataCache | None = None) -> IntensityFit | dict[str, IntensityFit]:
+    """One shared fit, or one per symbol when the CSV has a ``symbol`` column."""
+    df = _load_csv(path, cache)
+    if "symbol" not in df:
+        return _fit_from_row(df.iloc[0].to_dict())
+    return {str(row["symbol"]): _fit_from_row(row) for row in df.to_dict(orient="records")}
 
-    fit_row = fit_df.iloc[0].to_dict()
+
+def _fit_from_row(fit_row: dict) -> IntensityFit:
     from .intensity import IntensityFit
 
-    fit = IntensityFit(
+    return IntensityFit(
         model=str(fit_row["model"]),
         A=float(fit_row["A"]),
         k=float(fit_row["k"]),
@@ -56,47 +132,461 @@ def cmd_backtest(args: argparse.Namespace) -> int:
         bic=float(fit_row.get("bic", 0.0)),
     )
 
-    strat = StrategyConfig(
+
+def _strategy_config(args: argparse.Namespace) -> StrategyConfig:
+    return StrategyConfig(
         gamma=args.gamma,
         sigma=args.sigma,
         horizon_steps=args.horizon_steps,
         dt=args.dt,
         max_inventory=args.max_inventory,
         order_size=args.order_size,
+        quoting=args.quoting,
     )
-    cfg = BacktestConfig(markout_horizon=args.markout_horizon, seed=args.seed)
 
-    result = run_backtest(mid_df[args.mid_col], fit, strat, cfg)
 
-    Path(args.outdir).mkdir(parents=True, exist_ok=True)
-    result.timeseries.to_csv(Path(args.outdir) / "backtest_timeseries.csv", index=False)
-    result.fills.to_csv(Path(args.outdir) / "fills.csv", index=False)
-    write_backtest_summary(Path(args.outdir) / "backtest_summary.md", result.summary)
+def _strategy_from_args(args: argparse.Namespace) -> tuple[StrategyConfig, BacktestConfig]:
+    from .markout import parse_horizons
+
+    cfg = BacktestConfig(
+        markout_horizon=args.markout_horizon,
+        markout_horizons=parse_horizons(args.markout_horizons),
+        seed=args.seed,
+        engine=args.engine,
+        quote_cache_dir=getattr(args, "cache_dir", None) or "",
+    )
+    return _strategy_config(args), cfg
+
+
+def cmd_aggregate(args: argparse.Namespace) -> int:
+    import numpy as np
+
+    from .aggregator import aggregate_events, iter_event_chunks
+
+    cache = _open_cache(args)
+    deltas = np.linspace(args.delta_max / args.bins, args.delta_max, args.bins)
+    if cache is not None:
+        chunks = cache.iter_chunks(cache.csv_key(args.events), chunksize=args.chunksize)
+    else:
+        chunks = iter_event_chunks(args.events, chunksize=args.chunksize)
+    table = aggregate_events(chunks, deltas, side=args.side)
+
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(out, index=False)
+    print(f"Saved {len(table)} intensity bins -> {out}")
+    _report_cache(cache)
+    return 0
+
+
+def _online_estimator(fit: IntensityFit, strat: StrategyConfig, args: argparse.Namespace) -> OnlineIntensityEstimator:
+    import numpy as np
+
+    from .avellaneda_stoikov import optimal_quote
+    from .online import OnlineIntensityEstimator
+
+    # Bins span twice the widest A-S half-spread the strategy will quote (at the start of the horizon).
+    widest = optimal_quote(0.0, 0.0, strat.gamma, strat.sigma, strat.horizon_steps * strat.dt, max(fit.k, 1e-8)).half_spread
+    return OnlineIntensityEstimator(
+        np.linspace(0.0, 2.0 * widest, args.refit_bins),
+        model=fit.model,
+        half_life=args.refit_half_life,
+        prior=fit,
+        prior_exposure=args.refit_prior_exposure,
+    )
+
+
+def cmd_backtest(args: argparse.Namespace) -> int:
+    if args.stream_chunk > 0:
+        return _cmd_backtest_streaming(args)
+    from .backtest import run_backtest
+    from .reporting import write_backtest_summary
+    from .volatility import RangeVolatility, parse_estimator, sigma_series
+
+    cache = _open_cache(args)
+    mid = _load_mid(args.mid, args.mid_col, cache)
+    fit = _load_fit(args.fit, cache)
+    strat, cfg = _strategy_from_args(args)
+    cfg = replace(cfg, fill_log_dir=args.fill_log_dir or "")
+    online = None
+    if args.refit_every > 0:
+        cfg = replace(cfg, refit_every=args.refit_every)
+        online = _online_estimator(fit, strat, args)
+    sigma = None
+    if args.sigma_estimator:
+        sigma = parse_estimator(args.sigma_estimator, dt=strat.dt, initial=strat.sigma)
+        if isinstance(sigma, RangeVolatility):
+            sigma = sigma_series(sigma, _load_csv(args.mid, cache))
+
+    result = run_backtest(mid, fit, strat, cfg, online=online, sigma=sigma)
+
+    with stage("io.write_outputs"):
+        Path(args.outdir).mkdir(parents=True, exist_ok=True)
+        result.timeseries.to_csv(Path(args.outdir) / "backtest_timeseries.csv", index=False)
+        result.fill_log.to_csv(Path(args.outdir) / "fills.csv")
+        if result.markouts is not None:
+            result.markouts.to_csv(Path(args.outdir) / "markouts.csv", index=False)
+        write_backtest_summary(Path(args.outdir) / "backtest_summary.md", result.summary, result.markouts)
 
     print("Backtest done.")
     for k, v in result.summary.items():
         print(f"  {k}: {v}")
+    _report_cache(cache)
+    return 0
+
+
+def _cmd_backtest_streaming(args: argparse.Namespace) -> int:
+    from .streaming import run_streaming_backtest
+
+    if args.refit_every > 0 or args.sigma_estimator or args.fill_log_dir:
+        raise ValueError("--stream-chunk does not combine with --refit-every, --sigma-estimator or --fill-log-dir")
+    cache = _open_cache(args)
+    source = cache.read_csv_column(args.mid, args.mid_col) if cache is not None else args.mid
+    fit = _load_fit(args.fit, cache)
+    strat, cfg = _strategy_from_args(args)
+    result = run_streaming_backtest(
+        source,
+        fit,
+        strat,
+        cfg,
+        args.outdir,
+        chunk_size=args.stream_chunk,
+        mid_col=args.mid_col,
+        checkpoint_every=args.checkpoint_every,
+        resume=args.resume,
+    )
+    print("Streaming backtest done.")
+    for k, v in result.summary.items():
+        print(f"  {k}: {v}")
+    _report_cache(cache)
+    return 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    from .sweep import expand_grid, parse_grid_spec, run_sweep, sample_grid
+
+    cache = _open_cache(args)
+    mid = _load_mid(args.mid, args.mid_col, cache)
+    fit = _load_fit(args.fit, cache)
+    strat, cfg = _strategy_from_args(args)
+
+    space = parse_grid_spec(args.grid)
+    configs = sample_grid(space, args.samples, seed=args.sample_seed) if args.samples else expand_grid(space)
+    table = run_sweep(mid, fit, configs, strat=strat, cfg=cfg, workers=args.workers)
+
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(out, index=False)
+    print(f"Ran {len(table)} configurations -> {out}")
+    _report_cache(cache)
+    return 0
+
+
+def cmd_portfolio(args: argparse.Namespace) -> int:
+    from .portfolio import run_portfolio_backtest
+    from .reporting import write_backtest_summary
+
+    cache = _open_cache(args)
+    mids = _load_csv(args.mids, cache).drop(columns=[args.ts_col], errors="ignore")
+    if args.symbols:
+        mids = mids[[s.strip() for s in args.symbols.split(",")]]
+    fits = _load_fits(args.fit, cache)
+    strat, cfg = _strategy_from_args(args)
+    portfolio = PortfolioConfig(max_gross_notional=args.max_gross_notional, workers=args.workers or 0)
+
+    result = run_portfolio_backtest(mids, fits, strat, cfg, portfolio)
+
+    with stage("io.write_outputs"):
+        Path(args.outdir).mkdir(parents=True, exist_ok=True)
+        result.timeseries.to_csv(Path(args.outdir) / "portfolio_timeseries.csv", index=False)
+        result.inventory.to_csv(Path(args.outdir) / "portfolio_inventory.csv", index=False)
+        result.symbols.to_csv(Path(args.outdir) / "portfolio_symbols.csv", index=False)
+        write_backtest_summary(Path(args.outdir) / "portfolio_summary.md", result.summary)
+
+    print("Portfolio backtest done.")
+    for k, v in result.summary.items():
+        print(f"  {k}: {v}")
+    _report_cache(cache)
+    return 0
+
+
+def cmd_montecarlo(args: argparse.Namespace) -> int:
+    from .montecarlo import run_monte_carlo
+    from .reporting import write_backtest_summary
+
+    cache = _open_cache(args)
+    fit = _load_fit(args.fit, cache)
+    strat, cfg = _strategy_from_args(args)
+    mid = None if args.mid is None else _load_mid(args.mid, args.mid_col, cache)
+    if mid is None and args.steps is None:
+        raise ValueError("Pass --mid to replay a series or --steps for synthetic mid paths")
+
+    result = run_monte_carlo(fit, strat, cfg, n_paths=args.paths, mid=mid, steps=args.steps, step_vol=args.step_vol)
+
+    Path(args.outdir).mkdir(parents=True, exist_ok=True)
+    result.bands.to_csv(Path(args.outdir) / "montecarlo_bands.csv", index=False)
+    result.paths.to_csv(Path(args.outdir) / "montecarlo_paths.csv", index=False)
+    write_backtest_summary(Path(args.outdir) / "montecarlo_summary.md", result.summary)
+
+    print("Monte Carlo done.")
+    for k, v in result.summary.items():
+        print(f"  {k}: {v}")
+    _report_cache(cache)
+    return 0
+
+
+def cmd_lob_backtest(args: argparse.Namespace) -> int:
+    from .lob import events_from_frame, run_lob_backtest, synthetic_lob_events
+    from .markout import parse_horizons
+    from .reporting import write_backtest_summary
+
+    cache = _open_cache(args)
+    fit = _load_fit(args.fit, cache)
+    strat = _strategy_config(args)
+    cfg = BacktestConfig(
+        markout_horizon=args.markout_horizon,
+        markout_horizons=parse_horizons(args.markout_horizons),
+        seed=args.seed,
+        fill_log_dir=args.fill_log_dir or "",
+        quote_cache_dir=args.cache_dir or "",
+    )
+    lob = LOBConfig(tick_size=args.tick_size, entry_latency=args.entry_latency, cancel_latency=args.cancel_latency)
+    if args.events is not None:
+        events = events_from_frame(_load_csv(args.events, cache), tick_size=args.tick_size)
+    elif args.synthetic:
+        events = synthetic_lob_events(args.synthetic, seed=args.seed)
+    else:
+        raise ValueError("Pass --events CSV or --synthetic N")
+
+    result = run_lob_backtest(events, fit, strat, cfg, lob)
+
+    with stage("io.write_outputs"):
+        Path(args.outdir).mkdir(parents=True, exist_ok=True)
+        result.timeseries.to_csv(Path(args.outdir) / "lob_timeseries.csv", index=False)
+        result.fill_log.to_csv(Path(args.outdir) / "lob_fills.csv")
+        if result.markouts is not None:
+            result.markouts.to_csv(Path(args.outdir) / "lob_markouts.csv", index=False)
+        write_backtest_summary(Path(args.outdir) / "lob_summary.md", result.summary, result.markouts)
+
+    print("LOB backtest done.")
+    for k, v in result.summary.items():
+        print(f"  {k}: {v}")
+    _report_cache(cache)
+    return 0
+
+
+def cmd_kline_backtest(args: argparse.Namespace) -> int:
+    import numpy as np
+    import pandas as pd
+
+    from .backtest import run_backtest
+    from .kline import run_kline_backtest
+    from .reporting import write_backtest_summary
+    from .volatility import parse_estimator, sigma_series
+
+    cache = _open_cache(args)
+    fit = _load_fit(args.fit, cache)
+    strat, cfg = _strategy_from_args(args)
+    bars = _load_csv(args.bars, cache)
+    sigma = None
+    if args.sigma_estimator:
+        est = parse_estimator(args.sigma_estimator, dt=strat.dt, initial=strat.sigma)
+        # quotes go out at the open, so bar t only sees the estimate through bar t - 1
+        sigma = np.concatenate([[strat.sigma], sigma_series(est, bars, args.mid_col)[:-1]])
+
+    result = run_kline_backtest(bars, fit, strat, cfg, max_participation=args.max_participation, sigma=sigma)
+    compare = None
+    if args.compare:
+        stochastic = run_backtest(bars[args.mid_col], fit, strat, cfg, sigma=sigma)
+        keys = [k for k in result.summary if k in stochastic.summary]
+        compare = pd.DataFrame(
+            {"metric": keys, "kline": [result.summary[k] for k in keys], "stochastic": [stochastic.summary[k] for k in keys]}
+        )
+
+    with stage("io.write_outputs"):
+        Path(args.outdir).mkdir(parents=True, exist_ok=True)
+        result.timeseries.to_csv(Path(args.outdir) / "kline_timeseries.csv", index=False)
+        result.fill_log.to_csv(Path(args.outdir) / "kline_fills.csv")
+        if result.markouts is not None:
+            result.markouts.to_csv(Path(args.outdir) / "kline_markouts.csv", index=False)
+        if compare is not None:
+            compare.to_csv(Path(args.outdir) / "kline_compare.csv", index=False)
+        write_backtest_summary(Path(args.outdir) / "kline_summary.md", result.summary, result.markouts)
+
+    print("Kline backtest done.")
+    for k, v in result.summary.items():
+        print(f"  {k}: {v}")
+    if compare is not None:
+        print(compare.to_string(index=False))
+    _report_cache(cache)
+    return 0
+
+
+def cmd_walkforward(args: argparse.Namespace) -> int:
+    from .markout import parse_horizons
+    from .reporting import write_backtest_summary
+    from .walkforward import run_walk_forward
+
+    cache = _open_cache(args)
+    events = _load_csv(args.events, cache)
+    strat = _strategy_config(args)
+    cfg = BacktestConfig(markout_horizon=args.markout_horizon, markout_horizons=parse_horizons(args.markout_horizons), seed=args.seed)
+    cal = CalibrationConfig(
+        model=args.model, k_min=args.k_min, k_max=args.k_max, k_grid_points=args.k_grid_points, method=args.method
+    )
+    wf = WalkForwardConfig(
+        train_window=args.train_window,
+        test_window=args.test_window,
+        step=args.step,
+        delta_max=args.delta_max,
+        bins=args.bins,
+        side=args.side,
+    )
+
+    result = run_walk_forward(events, strat, cfg, cal=cal, wf=wf, workers=args.workers, cache=cache)
+
+    with stage("io.write_outputs"):
+        Path(args.outdir).mkdir(parents=True, exist_ok=True)
+        result.folds.to_csv(Path(args.outdir) / "walkforward_folds.csv", index=False)
+        result.timeseries.to_csv(Path(args.outdir) / "walkforward_timeseries.csv", index=False)
+        write_backtest_summary(Path(args.outdir) / "walkforward_summary.md", result.summary)
+
+    print("Walk-forward done.")
+    for k, v in result.summary.items():
+        print(f"  {k}: {v}")
+    _report_cache(cache)
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    from .bench import benchmark_cases, compare_to_baseline, load_baseline, run_benchmarks, save_baseline
+
+    cases = benchmark_cases(args.suite, pattern=args.filter)
+    if not cases:
+        raise ValueError(f"No benchmarks match {args.filter!r}")
+
+    def progress(name: str, r: dict) -> None:
+        peak = f"{r['peak_bytes'] / 2**20:.1f} MiB" if r["peak_bytes"] is not None else "-"
+        print(f"  {name}: {r['throughput']:.4g} {r['unit']} ({r['seconds']:.4g}s, peak {peak})")
+
+    print(f"Running {len(cases)} benchmarks ({args.suite})")
+    report = run_benchmarks(cases, repeat=args.repeat, memory=not args.no_memory, progress=progress)
+    if args.output:
+        print(f"Saved results -> {save_baseline(report, args.output)}")
+    if args.baseline is None or not Path(args.baseline).exists():
+        if args.baseline is not None:
+            print(f"Saved new baseline -> {save_baseline(report, args.baseline)}")
+        return 0
+    if args.update_baseline:
+        save_baseline(report, args.baseline)
+        print(f"Updated baseline -> {args.baseline}")
+        return 0
+
+    table = compare_to_baseline(report, load_baseline(args.baseline), threshold=args.threshold)
+    regressed = table[table["regression"]]
+    print(f"Compared {len(table)} benchmarks against {args.baseline} (threshold {args.threshold:.0%})")
+    for row in regressed.itertuples(index=False):
+        mem = f", memory x{row.memory_ratio:.2f}" if row.memory_ratio is not None else ""
+        print(f"  REGRESSION {row.name}: speed x{row.speed_ratio:.2f}{mem}")
+    return 1 if len(regressed) else 0
+
+
+def cmd_quote_latency(args: argparse.Namespace) -> int:
+    from .avellaneda_stoikov import QuoteEngine, measure_quote_latency
+    from .glft import quote_table
+    from .intensity import IntensityFit
+
+    if args.quoting == "glft":
+        fit = IntensityFit(model="exponential", A=args.A, k=args.k, log_likelihood=0.0, aic=0.0, bic=0.0)
+        strat = StrategyConfig(gamma=args.gamma, sigma=args.sigma, horizon_steps=args.horizon_steps, max_inventory=args.max_inventory)
+        engine = quote_table(fit, strat)
+    else:
+        engine = QuoteEngine(gamma=args.gamma, sigma=args.sigma, k=args.k)
+    stats = measure_quote_latency(engine, samples=args.samples, batch_size=args.batch_size)
+    print("Quote latency:")
+    for k, v in stats.items():
+        print(f"  {k}: {v}")
+    return 0
+
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    from .live import run_replay
+    from .reporting import write_backtest_summary
+    from .volatility import RangeVolatility, parse_estimator
+
+    cache = _open_cache(args)
+    mid_df = _load_csv(args.mid, cache)
+    fit = _load_fit(args.fit, cache)
+    strat = _strategy_config(args)
+    speed = args.speed if args.speed > 0 else None
+
+    vol = None
+    if args.sigma_estimator:
+        vol = parse_estimator(args.sigma_estimator, dt=strat.dt, initial=strat.sigma)
+        if isinstance(vol, RangeVolatility):
+            raise ValueError("replay streams mids only; use rolling:N or ewma:HALF_LIFE")
+
+    stats = run_replay(mid_df, fit, strat, seed=args.seed, speed=speed, mid_col=args.mid_col, ts_col=args.ts_col, vol=vol)
+
+    Path(args.outdir).mkdir(parents=True, exist_ok=True)
+    stats.latency.to_frame().to_csv(Path(args.outdir) / "replay_latency_histogram.csv", index=False)
+    write_backtest_summary(Path(args.outdir) / "replay_summary.md", stats.summary())
+
+    print("Replay done.")
+    for k, v in stats.summary().items():
+        print(f"  {k}: {v}")
+    _report_cache(cache)
     return 0
 
 
 def cmd_fetch_data(args: argparse.Namespace) -> int:
+    from .cache import DataCache
+    from .data_provider import download_binance_klines, fetch_binance_klines
+
     if args.provider != "binance":
         raise ValueError("Only binance provider is supported in MVP")
 
-    df = fetch_binance_klines(
+    request = dict(
         symbol=args.symbol,
         interval=args.interval,
         start_time=args.start,
         end_time=args.end,
         limit=args.limit,
     )
+    if args.bulk:
+        if not (args.start and args.end):
+            raise ValueError("--bulk needs both --start and --end")
+
+        def fetch() -> pd.DataFrame:
+            return download_binance_klines(**request, workers=args.workers, checkpoint_dir=args.checkpoint_dir)
+
+    else:
+
+        def fetch() -> pd.DataFrame:
+            return fetch_binance_klines(**request)
+
+    cache = _open_cache(args)
+    if cache is not None and args.start and args.end:
+        # only closed time ranges are immutable; open-ended requests always hit the network
+        key = cache.get_or_build(DataCache.key_for_request(provider=args.provider, bulk=args.bulk, **request), fetch)
+        df = cache.frame(key)
+    else:
+        df = fetch()
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(args.output, index=False)
     print(f"Saved {len(df)} rows to {args.output}")
+    _report_cache(cache)
     return 0
 
 
 def cmd_demo(args: argparse.Namespace) -> int:
+    import numpy as np
+    import pandas as pd
+
+    from .backtest import run_backtest
+    from .intensity import fit_intensity_with_profile
+    from .reporting import write_backtest_summary, write_mle_report
+
     rng = np.random.default_rng(args.seed)
 
     # Synthetic intensity calibration data
@@ -111,9 +601,9 @@ def cmd_demo(args: argparse.Namespace) -> int:
     calib_path = Path(args.outdir) / "sample_intensity_data.csv"
     calib.to_csv(calib_path, index=False)
 
-    fit = fit_intensity(calib, model="exponential")
+    fit, profile = fit_intensity_with_profile(calib, model="exponential")
     pd.DataFrame([asdict(fit)]).to_csv(Path(args.outdir) / "fit.csv", index=False)
-    write_mle_report(Path(args.outdir) / "mle_report.md", fit, calib)
+    write_mle_report(Path(args.outdir) / "mle_report.md", fit, calib, profile=profile)
 
     # Synthetic mid-price path
     n = args.steps
@@ -121,16 +611,48 @@ def cmd_demo(args: argparse.Namespace) -> int:
     mid = 100.0 + np.cumsum(rets)
     mid_df = pd.DataFrame({"mid": mid})
     mid_df.to_csv(Path(args.outdir) / "mid.csv", index=False)
+    cache = _open_cache(args)
+    if cache is not None:
+        cache.put(cache.key_for_file(Path(args.outdir) / "mid.csv"), mid_df, source=str(Path(args.outdir) / "mid.csv"))
 
     result = run_backtest(mid_df["mid"], fit, StrategyConfig(horizon_steps=n), BacktestConfig(seed=args.seed))
     result.timeseries.to_csv(Path(args.outdir) / "backtest_timeseries.csv", index=False)
-    result.fills.to_csv(Path(args.outdir) / "fills.csv", index=False)
-    write_backtest_summary(Path(args.outdir) / "backtest_summary.md", result.summary)
+    result.fill_log.to_csv(Path(args.outdir) / "fills.csv")
+    write_backtest_summary(Path(args.outdir) / "backtest_summary.md", result.summary, result.markouts)
 
     print(f"Demo artifacts written to {args.outdir}")
     return 0
 
 
+def _add_strategy_args(b: argparse.ArgumentParser, mid_required: bool = True, with_mid: bool = True, with_fit: bool = True) -> None:
+    if with_mid:
+        b.add_argument("--mid", required=mid_required, help="CSV with mid price series")
+        b.add_argument("--mid-col", default="mid")
+    if with_fit:
+        b.add_argument("--fit", required=True, help="CSV output from calibrate")
+    b.add_argument("--gamma", type=float, default=0.1)
+    b.add_argument("--sigma", type=float, default=0.02)
+    b.add_argument("--horizon-steps", type=int, default=300)
+    b.add_argument("--dt", type=float, default=1.0)
+    b.add_argument("--max-inventory", type=int, default=20)
+    b.add_argument("--order-size", type=float, default=1.0)
+    b.add_argument("--seed", type=int, default=7)
+    b.add_argument("--quoting", default="as", choices=["as", "glft"], help="A-S formula or finite-inventory GLFT quote table")
+
+
+def _add_backtest_args(b: argparse.ArgumentParser, mid_required: bool = True) -> None:
+    _add_strategy_args(b, mid_required=mid_required)
+    b.add_argument("--markout-horizon", type=int, default=5)
+    b.add_argument("--markout-horizons", default="1,5,30,300", help="Comma-separated horizons for the markout curve")
+    b.add_argument("--engine", default="loop", choices=["loop", "vectorized"])
+
+
+SIGMA_ESTIMATOR_HELP = (
+    "Per-step sigma instead of --sigma: rolling:N, ewma:HALF_LIFE (steps) or parkinson:N / garman_klass:N "
+    "(needs open,high,low,close columns in --mid); --sigma seeds the warm-up"
+)
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="mm-engine")
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -138,35 +660,158 @@ def build_parser() -> argparse.ArgumentParser:
     c = sub.add_parser("calibrate", help="Calibrate order-arrival intensity via MLE")
     c.add_argument("--input", required=True, help="CSV with delta,count,exposure")
     c.add_argument("--model", default="exponential", choices=["exponential", "power"])
-    c.add_argument("--k-min", type=float, default=1e-4)
-    c.add_argument("--k-max", type=float, default=50.0)
+    c.add_argument("--k-min", type=float, default=None, help="Default 1e-4 (with --group-by: per-model range)")
+    c.add_argument("--k-max", type=float, default=None, help="Default 50 (with --group-by: per-model range)")
     c.add_argument("--k-grid-points", type=int, default=2000)
+    c.add_argument("--method", default="grid", choices=["grid", "newton"], help="k search: grid scan or safeguarded Newton")
+    c.add_argument("--group-by", default=None, help="Comma-separated key columns; fit both models for every group in one batch")
+    c.add_argument("--select", default="aic", choices=["aic", "bic"], help="With --group-by, criterion that picks each group's model")
+    c.add_argument("--workers", type=int, default=1, help="With --group-by, worker processes (0 = all CPUs)")
     c.add_argument("--output", default="reports/fit.csv")
     c.add_argument("--report", default="reports/mle_report.md")
     c.set_defaults(func=cmd_calibrate)
 
+    a = sub.add_parser("aggregate", help="Stream raw quote/trade events into delta,count,exposure bins")
+    a.add_argument("--events", required=True, help="CSV/Parquet with ts,kind(quote|trade),bid,ask,price")
+    a.add_argument("--delta-max", type=float, default=0.5)
+    a.add_argument("--bins", type=int, default=50)
+    a.add_argument("--side", default="both", choices=["both", "bid", "ask"])
+    a.add_argument("--chunksize", type=int, default=1_000_000)
+    a.add_argument("--output", default="data/intensity_bins.csv")
+    a.set_defaults(func=cmd_aggregate)
+
     b = sub.add_parser("backtest", help="Run market-making backtest")
-    b.add_argument("--mid", required=True, help="CSV with mid price series")
-    b.add_argument("--fit", required=True, help="CSV output from calibrate")
-    b.add_argument("--mid-col", default="mid")
-    b.add_argument("--gamma", type=float, default=0.1)
-    b.add_argument("--sigma", type=float, default=0.02)
-    b.add_argument("--horizon-steps", type=int, default=300)
-    b.add_argument("--dt", type=float, default=1.0)
-    b.add_argument("--max-inventory", type=int, default=20)
-    b.add_argument("--order-size", type=float, default=1.0)
-    b.add_argument("--markout-horizon", type=int, default=5)
-    b.add_argument("--seed", type=int, default=7)
+    _add_backtest_args(b)
+    b.add_argument("--refit-every", type=int, default=0, help="Re-fit intensity on-line every N steps (0 = off)")
+    b.add_argument("--refit-half-life", type=float, default=3600.0, help="Decay half-life of on-line bins, in time units")
+    b.add_argument("--refit-bins", type=int, default=50)
+    b.add_argument("--refit-prior-exposure", type=float, default=100.0, help="Exposure weight of the --fit prior per bin")
+    b.add_argument("--fill-log-dir", default=None, help="Stream fills to this directory in chunks (for very long runs)")
+    b.add_argument("--sigma-estimator", default=None, help=SIGMA_ESTIMATOR_HELP)
+    b.add_argument("--stream-chunk", type=int, default=0, help="Stream the mids in chunks of N rows with bounded memory (0 = off)")
+    b.add_argument("--checkpoint-every", type=int, default=0, help="With --stream-chunk, checkpoint every K chunks")
+    b.add_argument("--resume", action="store_true", help="With --stream-chunk, resume from the checkpoint in --outdir")
     b.add_argument("--outdir", default="reports")
     b.set_defaults(func=cmd_backtest)
 
+    sw = sub.add_parser("sweep", help="Run backtests over a parameter grid on a process pool")
+    _add_backtest_args(sw)
+    sw.add_argument("--grid", action="append", required=True, help="name=v1,v2,... or name=lo:hi (with --samples); repeatable")
+    sw.add_argument("--samples", type=int, default=0, help="Random-sample this many configs instead of the full grid")
+    sw.add_argument("--sample-seed", type=int, default=0)
+    sw.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    sw.add_argument("--output", default="reports/sweep_summary.csv")
+    sw.set_defaults(func=cmd_sweep)
+
+    pf = sub.add_parser("portfolio", help="Backtest many symbols as one book, sharded over worker processes")
+    pf.add_argument("--mids", required=True, help="Wide CSV: one mid column per symbol, one row per step")
+    pf.add_argument("--ts-col", default="ts", help="Timestamp column to drop if present")
+    pf.add_argument("--symbols", default=None, help="Comma-separated subset of --mids columns")
+    pf.add_argument("--fit", required=True, help="calibrate CSV; with a symbol column, one fit per symbol")
+    _add_strategy_args(pf, with_mid=False, with_fit=False)
+    pf.add_argument("--markout-horizon", type=int, default=5)
+    pf.add_argument("--markout-horizons", default="1,5,30,300", help="Comma-separated horizons for the markout curve")
+    pf.add_argument("--engine", default="vectorized", choices=["loop", "vectorized"])
+    pf.add_argument("--max-gross-notional", type=float, default=0.0, help="Portfolio gross notional cap (0 = off)")
+    pf.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    pf.add_argument("--outdir", default="reports")
+    pf.set_defaults(func=cmd_portfolio)
+
+    mc = sub.add_parser("montecarlo", help="Run many fill (and optionally mid) paths in lock-step")
+    _add_backtest_args(mc, mid_required=False)
+    mc.add_argument("--paths", type=int, default=1000)
+    mc.add_argument("--steps", type=int, default=None, help="Synthetic mid path length (used when --mid is omitted)")
+    mc.add_argument("--step-vol", type=float, default=0.002, help="Per-step stdev of synthetic mid paths")
+    mc.add_argument("--outdir", default="reports")
+    mc.set_defaults(func=cmd_montecarlo)
+
+    r = sub.add_parser("replay", help="Replay a recorded mid series through the asyncio quote loop")
+    _add_strategy_args(r)
+    r.add_argument("--ts-col", default="ts", help="Timestamp column (seconds or datetimes); row index if absent")
+    r.add_argument("--speed", type=float, default=0.0, help="Replay speed vs wall clock (0 = as fast as possible)")
+    r.add_argument("--sigma-estimator", default=None, help="rolling:N or ewma:HALF_LIFE, updated on every quote")
+    r.add_argument("--outdir", default="reports")
+    r.set_defaults(func=cmd_replay)
+
+    lb = sub.add_parser("lob-backtest", help="Replay L2 book/trade events with queue position, latency and partial fills")
+    _add_strategy_args(lb, with_mid=False)
+    lb.add_argument("--markout-horizon", type=int, default=5, help="Markout horizon in --dt samples")
+    lb.add_argument("--markout-horizons", default="1,5,30,300", help="Comma-separated horizons for the markout curve")
+    lb.add_argument("--events", default=None, help="CSV with ts,kind(book|trade),side,price,size, time-ordered")
+    lb.add_argument("--synthetic", type=int, default=0, help="Generate this many synthetic book steps instead")
+    lb.add_argument("--tick-size", type=float, default=0.01)
+    lb.add_argument("--entry-latency", type=float, default=0.0, help="Order entry latency, in event time units")
+    lb.add_argument("--cancel-latency", type=float, default=0.0, help="Cancel latency, in event time units")
+    lb.add_argument("--fill-log-dir", default=None, help="Stream fills to this directory in chunks (for very long runs)")
+    lb.add_argument("--outdir", default="reports")
+    lb.set_defaults(func=cmd_lob_backtest)
+
+    kb = sub.add_parser("kline-backtest", help="Backtest OHLC bars with fills decided by each bar's high/low")
+    _add_strategy_args(kb, with_mid=False)
+    kb.add_argument("--bars", required=True, help="CSV with open,high,low,close[,volume] (fetch-data output)")
+    kb.add_argument("--mid-col", default="mid", help="Mid column for --compare and rolling/EWMA --sigma-estimator")
+    kb.add_argument("--markout-horizon", type=int, default=5, help="Markout horizon in bars")
+    kb.add_argument("--markout-horizons", default="1,5,30,300", help="Comma-separated horizons for the markout curve")
+    kb.add_argument("--engine", default="vectorized", choices=["loop", "vectorized"], help="Engine for --compare")
+    kb.add_argument("--max-participation", type=float, default=0.0, help="Only fill when order_size <= this share of bar volume (0 = no cap)")
+    kb.add_argument("--sigma-estimator", default=None, help=SIGMA_ESTIMATOR_HELP)
+    kb.add_argument("--compare", action="store_true", help="Also run the stochastic engine on --mid-col and write kline_compare.csv")
+    kb.add_argument("--outdir", default="reports")
+    kb.set_defaults(func=cmd_kline_backtest)
+
+    wf = sub.add_parser("walkforward", help="Rolling calibrate-then-backtest over out-of-sample windows")
+    wf.add_argument("--events", required=True, help="CSV with ts,kind(quote|trade),bid,ask,price, time-ordered")
+    _add_strategy_args(wf, with_mid=False, with_fit=False)
+    wf.add_argument("--markout-horizon", type=int, default=5)
+    wf.add_argument("--markout-horizons", default="1,5,30,300", help="Comma-separated horizons for the markout curve")
+    wf.add_argument("--train-window", type=float, default=3600.0, help="In-sample span, in seconds")
+    wf.add_argument("--test-window", type=float, default=900.0, help="Out-of-sample span, in seconds")
+    wf.add_argument("--step", type=float, default=0.0, help="Fold spacing in seconds (0 = test window)")
+    wf.add_argument("--delta-max", type=float, default=0.5)
+    wf.add_argument("--bins", type=int, default=50)
+    wf.add_argument("--side", default="both", choices=["both", "bid", "ask"])
+    wf.add_argument("--model", default="exponential", choices=["exponential", "power"])
+    wf.add_argument("--k-min", type=float, default=1e-4)
+    wf.add_argument("--k-max", type=float, default=50.0)
+    wf.add_argument("--k-grid-points", type=int, default=2000)
+    wf.add_argument("--method", default="newton", choices=["grid", "newton"])
+    wf.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    wf.add_argument("--outdir", default="reports")
+    wf.set_defaults(func=cmd_walkforward)
+
+    bn = sub.add_parser("bench", help="Benchmark engine hot paths and compare against a JSON baseline")
+    bn.add_argument("--suite", default="quick", choices=["quick", "full"], help="full adds 1e6/1e7-step backtests and larger fits")
+    bn.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this substring")
+    bn.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (best is kept)")
+    bn.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory run")
+    bn.add_argument("--baseline", default=None, help="Baseline JSON to compare against (created if missing)")
+    bn.add_argument("--update-baseline", action="store_true", help="Overwrite --baseline with this run")
+    bn.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown or memory growth flagged as regression")
+    bn.add_argument("--output", default=None, help="Also write this run's results as JSON")
+    bn.set_defaults(func=cmd_bench)
+
+    ql = sub.add_parser("quote-latency", help="Measure p50/p99 per-quote latency of the cached quote engine")
+    ql.add_argument("--gamma", type=float, default=0.1)
+    ql.add_argument("--sigma", type=float, default=0.02)
+    ql.add_argument("--k", type=float, default=8.0)
+    ql.add_argument("--quoting", default="as", choices=["as", "glft"], help="Time the A-S engine or a GLFT quote-table lookup")
+    ql.add_argument("--A", type=float, default=1.0, help="Intensity scale for --quoting glft")
+    ql.add_argument("--max-inventory", type=int, default=20, help="Inventory cap for --quoting glft")
+    ql.add_argument("--horizon-steps", type=int, default=1000, help="Table rows for --quoting glft")
+    ql.add_argument("--samples", type=int, default=100_000)
+    ql.add_argument("--batch-size", type=int, default=1024)
+    ql.set_defaults(func=cmd_quote_latency)
+
     f = sub.add_parser("fetch-data", help="Fetch free market data (MVP: Binance klines)")
     f.add_argument("--provider", default="binance", choices=["binance"])
     f.add_argument("--symbol", default="BTCUSDT")
     f.add_argument("--interval", default="1m")
     f.add_argument("--start", default=None, help="ISO-8601 start time, e.g. 2026-02-01T00:00:00Z")
     f.add_argument("--end", default=None, help="ISO-8601 end time")
-    f.add_argument("--limit", type=int, default=1000)
+    f.add_argument("--limit", type=int, default=1000, help="Rows per request (page size with --bulk)")
+    f.add_argument("--bulk", action="store_true", help="Page through [--start, --end] concurrently with retries")
+    f.add_argument("--workers", type=int, default=4, help="Concurrent page downloads with --bulk")
+    f.add_argument("--checkpoint-dir", default=None, help="Save finished pages here so --bulk can resume")
     f.add_argument("--output", default="data/processed/binance_klines.csv")
     f.set_defaults(func=cmd_fetch_data)
 
@@ -176,12 +821,42 @@ def build_parser() -> argparse.ArgumentParser:
     d.add_argument("--seed", type=int, default=7)
     d.set_defaults(func=cmd_demo)
 
+    for name in ("calibrate", "aggregate", "backtest", "sweep", "montecarlo", "portfolio", "lob-backtest", "kline-backtest", "walkforward", "replay", "fetch-data", "demo"):
+        sub.choices[name].add_argument("--cache-dir", default=None, help="Columnar .npy cache for inputs (memory-mapped on reuse)")
+    for sp in sub.choices.values():
+        sp.add_argument("--profile", action="store_true", help="Write a per-stage timing/counter breakdown (profile.md)")
+        sp.add_argument("--cprofile", action="store_true", help="With --profile, also record a cProfile (profile.pstats)")
+
     return p
 
 
+def _profile_dir(args: argparse.Namespace) -> Path:
+    if getattr(args, "outdir", None):
+        return Path(args.outdir)
+    if getattr(args, "output", None):
+        return Path(args.output).parent
+    return Path("reports")
+
+
+def _run_profiled(args: argparse.Namespace) -> int:
+    instrument.enable()
+    profiler = cProfile.Profile() if args.cprofile else None
+    total = f"cmd.{args.cmd}"
+    try:
+        with stage(total):
+            rc = profiler.runcall(args.func, args) if profiler is not None else args.func(args)
+    finally:
+        instrument.disable()
+    path = instrument.write_profile(_profile_dir(args), total_stage=total, profiler=profiler)
+    print(f"Saved profile -> {path}")
+    return rc
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
+    if args.profile:
+        return _run_profiled(args)
     return args.func(args)
 
 
@@ -11,12 +11,19 @@ class StrategyConfig:
     dt: float = 1.0
     max_inventory: int = 20
     order_size: float = 1.0
+    quoting: str = "as"  # as (Avellaneda-Stoikov formula) | glft (finite-inventory quote table)
 
 
 @dataclass(slots=True)
 class BacktestConfig:
     markout_horizon: int = 5
+    markout_horizons: tuple[int, ...] = (1, 5, 30, 300)  # markout curve horizons, in steps
     seed: int = 7
+    engine: str = "loop"  # loop | vectorized (bit-identical block scan)
+    refit_every: int = 0  # steps between on-line intensity re-fits (0 = off)
+    fill_log_dir: str = ""  # stream fills to this directory in chunks instead of keeping them in memory
+    fill_chunk_rows: int = 1 << 16
+    quote_cache_dir: str = ""  # on-disk cache for glft quote tables
 
 
 @dataclass(slots=True)
@@ -25,4 +32,29 @@ class CalibrationConfig:
     k_min: float = 1e-4
     k_max: float = 50.0
     k_grid_points: int = 2000
+    method: str = "grid"  # grid | newton
     delta0: float = 1e-4  # for power-law model
+
+
+@dataclass(slots=True)
+class LOBConfig:
+    tick_size: float = 0.01
+    entry_latency: float = 0.0  # time from quote decision until the order rests in the book
+    cancel_latency: float = 0.0  # time until a cancel takes effect (the order can still fill meanwhile)
+    chunk_size: int = 1 << 16  # events converted to Python scalars at a time
+
+
+@dataclass(slots=True)
+class WalkForwardConfig:
+    train_window: float = 3600.0  # in-sample span, in event time units (seconds)
+    test_window: float = 900.0  # out-of-sample span backtested after each training window
+    step: float = 0.0  # fold spacing (0 = test_window, i.e. back-to-back test windows)
+    delta_max: float = 0.5  # calibration bins: linspace(delta_max / bins, delta_max, bins)
+    bins: int = 50
+    side: str = "both"
+
+
+@dataclass(slots=True)
+class PortfolioConfig:
+    max_gross_notional: float = 0.0  # cap on sum |inventory * mid| across symbols (0 = off)
+    workers: int = 0  # symbol shards / worker processes (0 = CPU count)
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import http.client
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional
-from urllib.parse import urlencode
-from urllib.request import urlopen
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Protocol
+from urllib.parse import urlencode, urlsplit
 
-import pandas as pd
+import numpy as np
+
+from .instrument import count, stage
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 BINANCE_REST = "https://api.binance.com/api/v3/klines"
+KLINE_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+
+_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
 
 
 def _to_ms(ts: Optional[str]) -> Optional[int]:
@@ -19,12 +31,107 @@ def _to_ms(ts: Optional[str]) -> Optional[int]:
     return int(dt.timestamp() * 1000)
 
 
+def interval_ms(interval: str) -> int:
+    """Bar length of a Binance interval string such as ``1m`` or ``4h`` (``1M`` has no fixed length)."""
+    unit = interval[-1:]
+    if unit not in _UNIT_MS or not interval[:-1].isdigit():
+        raise ValueError(f"Unsupported interval for paging: {interval}")
+    return int(interval[:-1]) * _UNIT_MS[unit]
+
+
+class RateLimited(Exception):
+    def __init__(self, status: int, retry_after: float | None):
+        super().__init__(f"HTTP {status} rate limited (retry after {retry_after})")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class HttpClient(Protocol):
+    def get_json(self, url: str) -> object: ...
+
+
+class PooledHttpClient:
+    """Keep-alive HTTP(S) client with one persistent connection per host per thread.
+
+    Raises :class:`RateLimited` on HTTP 418/429 so callers can back off.
+    """
+
+    def __init__(self, timeout: float = 20.0):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        pool = self._local.__dict__.setdefault("pool", {})
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = pool[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop(self, scheme: str, netloc: str) -> None:
+        conn = self._local.__dict__.get("pool", {}).pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def get_json(self, url: str) -> object:
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        with stage("data_provider.request"):
+            for attempt in range(2):
+                conn = self._conn(parts.scheme, parts.netloc)
+                try:
+                    conn.request("GET", target, headers={"Connection": "keep-alive"})
+                    resp = conn.getresponse()
+                    body = resp.read()
+                    break
+                except (http.client.HTTPException, OSError):
+                    # stale keep-alive connection: reconnect once
+                    self._drop(parts.scheme, parts.netloc)
+                    if attempt:
+                        raise
+        count("http_requests")
+        count("bytes_read", len(body))
+        if resp.status in (418, 429):
+            count("rate_limited")
+            retry = resp.getheader("Retry-After")
+            raise RateLimited(resp.status, float(retry) if retry else None)
+        if resp.status >= 400:
+            raise RuntimeError(f"HTTP {resp.status} from {url}: {body[:200]!r}")
+        return json.loads(body.decode("utf-8"))
+
+    def close(self) -> None:
+        for conn in self._local.__dict__.get("pool", {}).values():
+            conn.close()
+
+
+_default_client = PooledHttpClient()
+
+
+def _kline_rows(data: list) -> np.ndarray:
+    # ms timestamps are exact in float64, so a page is one (rows x 6) float array
+    return np.asarray([row[:6] for row in data], dtype=float).reshape(-1, 6)
+
+
+def _klines_frame(rows: np.ndarray) -> pd.DataFrame:
+    """Vectorised conversion of (rows x 6) kline values into the normalized frame."""
+    import pandas as pd
+
+    if len(rows) == 0:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows[:, 1:6], columns=KLINE_COLUMNS[1:])
+    df.insert(0, "ts", pd.to_datetime(rows[:, 0].astype(np.int64), unit="ms", utc=True))
+    df["mid"] = (df["high"] + df["low"]) / 2.0
+    return df
+
+
 def fetch_binance_klines(
     symbol: str,
     interval: str = "1m",
     start_time: str | None = None,
     end_time: str | None = None,
     limit: int = 1000,
+    client: HttpClient | None = None,
+    base_url: str = BINANCE_REST,
 ) -> pd.DataFrame:
     """Fetch free public OHLCV from Binance and return normalized DataFrame.
 
@@ -43,28 +150,96 @@ def fetch_binance_klines(
     if e is not None:
         params["endTime"] = e
 
-    url = f"{BINANCE_REST}?{urlencode(params)}"
-    with urlopen(url, timeout=20) as r:
-        data = json.loads(r.read().decode("utf-8"))
+    data = (client or _default_client).get_json(f"{base_url}?{urlencode(params)}")
 
     if not isinstance(data, list):
         raise RuntimeError(f"Unexpected Binance response: {data}")
+    return _klines_frame(_kline_rows(data))
 
-    rows = []
-    for k in data:
-        rows.append(
-            {
-                "ts": pd.to_datetime(int(k[0]), unit="ms", utc=True),
-                "open": float(k[1]),
-                "high": float(k[2]),
-                "low": float(k[3]),
-                "close": float(k[4]),
-                "volume": float(k[5]),
-            }
-        )
-
-    df = pd.DataFrame(rows)
-    if df.empty:
-        return df
-    df["mid"] = (df["high"] + df["low"]) / 2.0
-    return df
+
+class _Pacer:
+    """Shared back-off: once any worker is rate limited, every worker waits until the pause ends."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def download_binance_klines(
+    symbol: str,
+    interval: str,
+    start_time: str,
+    end_time: str,
+    workers: int = 4,
+    limit: int = 1000,
+    checkpoint_dir: str | Path | None = None,
+    client: HttpClient | None = None,
+    base_url: str = BINANCE_REST,
+    max_retries: int = 8,
+    backoff: float = 0.5,
+) -> pd.DataFrame:
+    """Download [start_time, end_time] as concurrent ``limit``-bar pages.
+
+    Pages are fetched by ``workers`` threads over pooled keep-alive connections. HTTP 418/429
+    pauses all workers (``Retry-After`` if given, else exponential ``backoff``). With a
+    ``checkpoint_dir`` every finished page is saved as ``.npy`` and skipped on the next run, so an
+    interrupted download resumes where it stopped. The HTTP layer is injectable via ``client``.
+    """
+    s, e = _to_ms(start_time), _to_ms(end_time)
+    if s is None or e is None or e < s:
+        raise ValueError("download_binance_klines needs start_time <= end_time")
+    limit = min(max(limit, 1), 1000)
+    span = interval_ms(interval) * limit
+    page_starts = list(range(s, e + 1, span))
+    client = client or PooledHttpClient()
+    pacer = _Pacer()
+    ckpt = Path(checkpoint_dir) if checkpoint_dir is not None else None
+    if ckpt is not None:
+        ckpt.mkdir(parents=True, exist_ok=True)
+
+    def page_path(p0: int, p1: int) -> Path | None:
+        # the clipped page end is part of the key: a short last page must not stand in for a full one
+        return ckpt / f"{symbol.upper()}_{interval}_{p0}_{p1}_{limit}.npy" if ckpt is not None else None
+
+    def fetch_page(p0: int) -> np.ndarray:
+        p1 = min(p0 + span - 1, e)
+        path = page_path(p0, p1)
+        if path is not None and path.exists():
+            return np.load(path)
+        params = {"symbol": symbol.upper(), "interval": interval, "limit": limit, "startTime": p0, "endTime": p1}
+        url = f"{base_url}?{urlencode(params)}"
+        for attempt in range(max_retries + 1):
+            pacer.wait()
+            try:
+                data = client.get_json(url)
+                break
+            except RateLimited as exc:
+                if attempt == max_retries:
+                    raise
+                pacer.pause(exc.retry_after if exc.retry_after is not None else backoff * 2**attempt)
+        if not isinstance(data, list):
+            raise RuntimeError(f"Unexpected Binance response: {data}")
+        page = _kline_rows(data)
+        # pages reaching into the future may still grow, so only closed pages are checkpointed
+        if path is not None and p1 < time.time() * 1000:
+            tmp = path.with_suffix(".tmp.npy")
+            np.save(tmp, page)
+            tmp.replace(path)
+        return page
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pages = list(pool.map(fetch_page, page_starts))
+
+    rows = np.concatenate(pages) if pages else np.empty((0, 6))
+    _, first = np.unique(rows[:, 0], return_index=True)
+    return _klines_frame(rows[first])
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .instrument import stage
+
+BUY = 1
+SELL = -1
+FILL_COLUMNS = {"t": np.int64, "side": np.int8, "price": np.float64, "mid": np.float64, "delta": np.float64}
+
+
+class FillLog:
+    """Growable struct-of-arrays fill buffer: one typed NumPy array per column.
+
+    ``append`` writes one fill into preallocated arrays (capacity doubles when full) and
+    ``extend`` adds whole columns at once. With ``spill_dir`` the buffer is capped at
+    ``chunk_rows`` and full chunks are appended to one raw ``<column>.bin`` file per column, so a
+    run of any length holds at most one chunk in memory; columns are then read back
+    memory-mapped. ``side`` is stored as int8 (+1 buy, -1 sell) and only becomes ``buy``/``sell``
+    labels in :meth:`to_frame`. ``peak_bytes`` tracks the largest buffer footprint seen.
+    """
+
+    def __init__(
+        self,
+        extra: dict[str, type] | None = None,
+        capacity: int = 1024,
+        spill_dir: str | Path | None = None,
+        chunk_rows: int = 1 << 16,
+    ):
+        self.dtypes = {name: np.dtype(d) for name, d in {**FILL_COLUMNS, **(extra or {})}.items()}
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.chunk_rows = max(int(chunk_rows), 1)
+        cap = max(int(capacity), 1)
+        if self.spill_dir is not None:
+            cap = min(cap, self.chunk_rows)
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            for name in self.dtypes:
+                self._path(name).write_bytes(b"")
+        self._cols = {name: np.empty(cap, dtype=d) for name, d in self.dtypes.items()}
+        self._arrays = list(self._cols.values())
+        self._n = 0
+        self.spilled = 0
+        self.peak_bytes = self.nbytes
+        self._derived: dict[str, np.ndarray] = {}
+        self._frame: pd.DataFrame | None = None
+
+    @classmethod
+    def load(cls, spill_dir: str | Path) -> FillLog:
+        """Reopen a finished on-disk log (see :meth:`close`)."""
+        meta = json.loads((Path(spill_dir) / "meta.json").read_text())
+        log = cls.__new__(cls)
+        log.dtypes = {name: np.dtype(d) for name, d in meta["columns"].items()}
+        log.spill_dir = Path(spill_dir)
+        log.chunk_rows = meta["chunk_rows"]
+        log._cols = {name: np.empty(0, dtype=d) for name, d in log.dtypes.items()}
+        log._arrays = list(log._cols.values())
+        log._n = 0
+        log.spilled = meta["rows"]
+        log.peak_bytes = meta["peak_bytes"]
+        log._derived = {}
+        log._frame = None
+        return log
+
+    def __len__(self) -> int:
+        return self.spilled + self._n
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self._cols.values())
+
+    def _path(self, name: str) -> Path:
+        return self.spill_dir / f"{name}.bin"
+
+    def _grow(self, need: int) -> None:
+        if self.spill_dir is not None and need > self.chunk_rows:
+            self.flush()
+            return
+        cap = len(self._arrays[0])
+        while cap < need:
+            cap *= 2
+        if self.spill_dir is not None:
+            cap = min(cap, self.chunk_rows)
+        for name, arr in self._cols.items():
+            grown = np.empty(cap, dtype=arr.dtype)
+            grown[: self._n] = arr[: self._n]
+            self._cols[name] = grown
+        self._arrays = list(self._cols.values())
+        self.peak_bytes = max(self.peak_bytes, self.nbytes)
+
+    def append(self, t: int, side: int, price: float, mid: float, delta: float, *extra: float) -> None:
+        i = self._n
+        if i == len(self._arrays[0]):
+            self._grow(i + 1)
+            i = self._n
+        a = self._arrays
+        a[0][i] = t
+        a[1][i] = side
+        a[2][i] = price
+        a[3][i] = mid
+        a[4][i] = delta
+        for j, v in enumerate(extra, 5):
+            a[j][i] = v
+        self._n = i + 1
+        self._frame = None
+
+    def extend(self, **columns: np.ndarray) -> None:
+        """Append many fills given as one array per column (all columns required)."""
+        k = len(columns["t"])
+        if self.spill_dir is not None:
+            self.flush()
+            for name, d in self.dtypes.items():
+                with open(self._path(name), "ab") as f:
+                    np.asarray(columns[name], dtype=d).tofile(f)
+            self.spilled += k
+        else:
+            if self._n + k > len(self._arrays[0]):
+                self._grow(self._n + k)
+            for name, arr in self._cols.items():
+                arr[self._n : self._n + k] = columns[name]
+            self._n += k
+        self._frame = None
+
+    def flush(self) -> None:
+        """Write buffered rows to the spill files (no-op for in-memory logs)."""
+        if self.spill_dir is None or self._n == 0:
+            return
+        for name, arr in self._cols.items():
+            with open(self._path(name), "ab") as f:
+                arr[: self._n].tofile(f)
+        self.spilled += self._n
+        self._n = 0
+
+    def close(self) -> None:
+        """Flush and write ``meta.json`` so the spill directory can be reopened with :meth:`load`."""
+        if self.spill_dir is None:
+            return
+        self.flush()
+        meta = {
+            "rows": self.spilled,
+            "chunk_rows": self.chunk_rows,
+            "peak_bytes": self.peak_bytes,
+            "columns": {name: d.str for name, d in self.dtypes.items()},
+        }
+        (self.spill_dir / "meta.json").write_text(json.dumps(meta, indent=1))
+
+    def column(self, name: str) -> np.ndarray:
+        if name in self._derived:
+            return self._derived[name]
+        if name not in self.dtypes:
+            raise KeyError(f"Unknown fill column: {name}")
+        if self.spill_dir is None:
+            return self._cols[name][: self._n]
+        self.flush()
+        if self.spilled == 0:
+            return np.empty(0, dtype=self.dtypes[name])
+        return np.memmap(self._path(name), dtype=self.dtypes[name], mode="r", shape=(self.spilled,))
+
+    def add_column(self, name: str, values: np.ndarray) -> None:
+        """Attach a derived per-fill column (e.g. markouts) computed after the run."""
+        values = np.asarray(values)
+        if len(values) != len(self):
+            raise ValueError(f"Column {name!r} has {len(values)} rows, log has {len(self)}")
+        if self.spill_dir is not None:
+            self.flush()
+            values.tofile(self._path(name))
+            self.dtypes[name] = values.dtype
+        else:
+            self._derived[name] = values
+        self._frame = None
+
+    def _frame_of(self, cols: dict[str, np.ndarray]) -> pd.DataFrame:
+        import pandas as pd
+
+        df = pd.DataFrame({name: np.asarray(v) for name, v in cols.items()})
+        if "side" in df:
+            df["side"] = np.where(df["side"].to_numpy() > 0, "buy", "sell").astype(object)
+        return df
+
+    def to_frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            names = list(self.dtypes) + [n for n in self._derived if n not in self.dtypes]
+            with stage("fills.to_frame"):
+                self._frame = self._frame_of({name: self.column(name) for name in names})
+        return self._frame
+
+    def iter_frames(self, chunk_rows: int | None = None) -> Iterator[pd.DataFrame]:
+        step = chunk_rows or self.chunk_rows
+        names = list(self.dtypes) + [n for n in self._derived if n not in self.dtypes]
+        cols = {name: self.column(name) for name in names}
+        for lo in range(0, len(self), step):
+            yield self._frame_of({name: c[lo : lo + step] for name, c in cols.items()})
+
+    def to_csv(self, path: str | Path) -> None:
+        """Write the log chunk by chunk, so spilled logs never load fully into memory."""
+        header = True
+        with open(path, "w", newline="") as f:
+            for chunk in self.iter_frames():
+                chunk.to_csv(f, index=False, header=header)
+                header = False
+            if header:
+                self._frame_of({name: self.column(name)[:0] for name in self.dtypes}).to_csv(f, index=False)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .cache import DataCache, LRUCache
+from .config import StrategyConfig
+from .instrument import stage
+from .intensity import IntensityFit
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+QUOTE_TABLES = LRUCache(1 << 26)
+QUOTE_TABLE_ROWS = 4096  # tau steps solved per block, as FILL_TABLE_ROWS for the A-S tables
+STATIONARY_RTOL = 1e-12
+
+
+def inventory_grid(strat: StrategyConfig) -> np.ndarray:
+    """Inventory levels ``n * order_size`` with ``|n * order_size| <= max_inventory``."""
+    v = strat.order_size
+    if not v > 0.0:
+        raise ValueError("order_size must be positive")
+    n = int(math.floor(strat.max_inventory / v))
+    while (n + 1) * v <= strat.max_inventory:
+        n += 1
+    while n > 0 and n * v > strat.max_inventory:
+        n -= 1
+    return np.arange(-n, n + 1) * v
+
+
+def solve_quote_offsets(
+    A: float,
+    k: float,
+    gamma: float,
+    sigma: float,
+    order_size: float,
+    levels: int,
+    dt: float,
+    tau_steps: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Optimal bid/ask offsets from mid, shape ``(len(tau_steps), 2 * levels + 1)``.
+
+    Gueant-Lehalle-Fernandez-Tapia solution for CARA utility, exponential intensity
+    ``A exp(-k delta)`` and inventory ``n * order_size`` with ``|n| <= levels``. With
+    ``v(tau) = exp(-M tau) 1``, where ``M`` is tridiagonal with ``alpha n^2`` on the diagonal,
+    ``-eta`` beside it, ``alpha = k gamma sigma^2 order_size / 2`` and
+    ``eta = A (1 + gamma order_size / k)^-(1 + k / (gamma order_size))``:
+
+        delta_bid(n) = ln(v_n / v_{n+1}) / k + ln(1 + gamma order_size / k) / (gamma order_size)
+        delta_ask(n) = ln(v_n / v_{n-1}) / k + (same constant)
+
+    ``M`` is symmetric, so ``exp(-M tau)`` comes from one eigendecomposition for all tau. The bid
+    at the top level and the ask at the bottom level are ``inf`` (no quote past the cap). A
+    ``tau_steps`` entry of ``inf`` gives the stationary (long-horizon) offsets.
+    """
+    if not (A > 0.0 and k > 0.0 and gamma > 0.0):
+        raise ValueError("GLFT quotes need A, k and gamma > 0")
+    g = gamma * order_size
+    n = np.arange(-levels, levels + 1, dtype=float)
+    alpha = 0.5 * k * gamma * sigma * sigma * order_size
+    eta = A * (1.0 + g / k) ** -(1.0 + k / g)
+    M = np.diag(alpha * n * n) - eta * (np.eye(len(n), k=1) + np.eye(len(n), k=-1))
+    lam, V = np.linalg.eigh(M)
+    tau = np.asarray(tau_steps, dtype=float)[:, None] * dt
+    # shifting by the smallest eigenvalue rescales v, which leaves the log-ratios unchanged
+    with np.errstate(invalid="ignore"):
+        decay = np.exp(-(lam - lam[0]) * tau)
+    decay[:, 0] = 1.0  # exp(0 * inf) for the stationary row
+    v = (decay * (V.T @ np.ones(len(n)))) @ V.T
+    log_v = np.log(np.maximum(v, np.finfo(float).tiny))
+    const = math.log1p(g / k) / g
+    d_bid = np.full(v.shape, np.inf)
+    d_ask = np.full(v.shape, np.inf)
+    d_bid[:, :-1] = (log_v[:, :-1] - log_v[:, 1:]) / k + const
+    d_ask[:, 1:] = (log_v[:, 1:] - log_v[:, :-1]) / k + const
+    return d_bid, d_ask
+
+
+@dataclass(slots=True)
+class QuoteTable:
+    """Optimal offsets per (tau step, inventory level); each quote is two flat-buffer lookups."""
+
+    levels: np.ndarray  # inventory at each column
+    bid: np.ndarray  # (rows, levels) distance of the bid below mid; tau past the last row uses it
+    ask: np.ndarray  # (rows, levels) distance of the ask above mid
+    dt: float
+    order_size: float
+    _flat: tuple = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._flat = (
+            memoryview(np.ascontiguousarray(self.bid, dtype=float).reshape(-1)),
+            memoryview(np.ascontiguousarray(self.ask, dtype=float).reshape(-1)),
+            len(self.bid) - 1,
+            len(self.levels),
+        )
+
+    def index(self, inventory: float, time_to_horizon: float) -> tuple[int, int]:
+        """Nearest tau row and inventory column, clipped to the table."""
+        _, _, last, L = self._flat
+        row = int(time_to_horizon / self.dt + 0.5)
+        row = last if row > last else (row if row > 0 else 0)
+        j = round(inventory / self.order_size) + L // 2
+        j = L - 1 if j >= L else (j if j > 0 else 0)
+        return row, j
+
+    def quote(self, mid_price: float, inventory: float, time_to_horizon: float) -> tuple[float, float]:
+        bid, ask, _, L = self._flat
+        row, j = self.index(inventory, time_to_horizon)
+        x = row * L + j
+        return mid_price - bid[x], mid_price + ask[x]
+
+    def quote_batch(self, mid_price: np.ndarray, inventory: np.ndarray, time_to_horizon: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        row = np.clip(np.floor(np.asarray(time_to_horizon, dtype=float) / self.dt + 0.5).astype(np.int64), 0, len(self.bid) - 1)
+        j = np.rint(np.asarray(inventory, dtype=float) / self.order_size).astype(np.int64) + len(self.levels) // 2
+        j = np.clip(j, 0, len(self.levels) - 1)
+        mid = np.asarray(mid_price, dtype=float)
+        return mid - self.bid[row, j], mid + self.ask[row, j]
+
+
+def quote_table(fit: IntensityFit, strat: StrategyConfig, cache_dir: str | Path | None = None) -> QuoteTable:
+    """GLFT offsets for tau steps ``0..strat.horizon_steps`` on the inventory grid of ``strat``.
+
+    The offsets are solved in blocks of ``QUOTE_TABLE_ROWS`` tau steps. They converge to their
+    stationary values after roughly ``1 / (lambda_1 - lambda_0)`` of ``M``'s spectral gap, so the
+    table stops at the first row within ``STATIONARY_RTOL`` of them and longer tau is clamped to
+    that row; a long horizon then costs no more than a short one.
+
+    Tables are memoised in-process (``QUOTE_TABLES``) and, with ``cache_dir``, stored in a
+    :class:`DataCache` keyed by (A, k, gamma, sigma, max_inventory, order_size, dt, horizon), so
+    later runs and processes load them instead of solving again.
+    """
+    if fit.model != "exponential":
+        raise ValueError("GLFT quotes have a closed form for the exponential intensity model only")
+    levels = inventory_grid(strat)
+    params = {
+        "A": fit.A,
+        "k": fit.k,
+        "gamma": strat.gamma,
+        "sigma": strat.sigma,
+        "max_inventory": strat.max_inventory,
+        "order_size": strat.order_size,
+        "dt": strat.dt,
+        "horizon_steps": strat.horizon_steps,
+    }
+    L = len(levels)
+
+    def solve() -> tuple[np.ndarray, np.ndarray]:
+        def offsets(tau_steps: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            return solve_quote_offsets(fit.A, fit.k, strat.gamma, strat.sigma, strat.order_size, L // 2, strat.dt, tau_steps)
+
+        with stage("glft.solve"):
+            inf_bid, _ = offsets(np.array([np.inf]))
+            tol = STATIONARY_RTOL * np.maximum(np.abs(inf_bid[0, :-1]), 1.0)
+            bids, asks = [], []
+            for start in range(0, strat.horizon_steps + 1, QUOTE_TABLE_ROWS):
+                bid, ask = offsets(np.arange(start, min(start + QUOTE_TABLE_ROWS, strat.horizon_steps + 1)))
+                # bid and ask mirror each other, so checking the bid side is enough
+                settled = np.all(np.abs(bid[:, :-1] - inf_bid[0, :-1]) <= tol, axis=1)
+                if settled[-1]:
+                    cut = len(settled) - int(np.argmin(settled[::-1])) if not settled.all() else 0
+                    bids.append(bid[: cut + 1])
+                    asks.append(ask[: cut + 1])
+                    break
+                bids.append(bid)
+                asks.append(ask)
+            return np.concatenate(bids), np.concatenate(asks)
+
+    def build() -> tuple[np.ndarray, np.ndarray]:
+        if cache_dir is None:
+            return solve()
+        cache = DataCache(cache_dir)
+
+        def frame() -> pd.DataFrame:
+            import pandas as pd
+
+            bid, ask = solve()
+            return pd.DataFrame({**{f"bid{j}": bid[:, j] for j in range(L)}, **{f"ask{j}": ask[:, j] for j in range(L)}})
+
+        key = cache.get_or_build(cache.key_for_request(kind="glft_quotes", **params), frame, source="glft")
+        cols = cache.frame(key)
+        return (
+            np.column_stack([cols[f"bid{j}"].to_numpy() for j in range(L)]),
+            np.column_stack([cols[f"ask{j}"].to_numpy() for j in range(L)]),
+        )
+
+    bid, ask = QUOTE_TABLES.get_or_build(tuple(params.values()), build)
+    return QuoteTable(levels=levels, bid=bid, ask=ask, dt=strat.dt, order_size=strat.order_size)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import cProfile
+import contextlib
+import io
+import json
+import pstats
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Registry:
+    """Process-wide stage timings and counters.
+
+    Disabled by default: :func:`stage` then hands back one shared no-op context manager and
+    :func:`count` returns after a single attribute check, so instrumented code pays close to nothing.
+    Stages are named with dotted paths (``backtest.simulate``); nested stages are counted in their
+    parents as well.
+    """
+
+    __slots__ = ("enabled", "timings", "counters")
+
+    def __init__(self):
+        self.enabled = False
+        self.timings: dict[str, list] = {}  # name -> [calls, total_ns]
+        self.counters: dict[str, float] = {}
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self.counters.clear()
+
+
+REGISTRY = Registry()
+_NULL = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> _Stage:
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter_ns() - self.t0
+        rec = REGISTRY.timings.get(self.name)
+        if rec is None:
+            REGISTRY.timings[self.name] = [1, elapsed]
+        else:
+            rec[0] += 1
+            rec[1] += elapsed
+
+
+def stage(name: str):
+    """Time a block: ``with stage("backtest.simulate"): ...``."""
+    if not REGISTRY.enabled:
+        return _NULL
+    return _Stage(name)
+
+
+def count(name: str, n: float = 1) -> None:
+    if REGISTRY.enabled:
+        REGISTRY.counters[name] = REGISTRY.counters.get(name, 0) + n
+
+
+def enable(reset: bool = True) -> None:
+    if reset:
+        REGISTRY.reset()
+    REGISTRY.enabled = True
+
+
+def disable() -> None:
+    REGISTRY.enabled = False
+
+
+def stage_table(total_stage: str | None = None) -> pd.DataFrame:
+    """Per-stage calls, total/mean time and share of ``total_stage`` (default: the largest)."""
+    import pandas as pd
+
+    rows = [{"stage": k, "calls": v[0], "total_s": v[1] / 1e9} for k, v in REGISTRY.timings.items()]
+    df = pd.DataFrame(rows, columns=["stage", "calls", "total_s"])
+    if df.empty:
+        return df.assign(mean_ms=[], share=[])
+    df["mean_ms"] = df["total_s"] / df["calls"] * 1e3
+    total = REGISTRY.timings[total_stage][1] / 1e9 if total_stage in REGISTRY.timings else df["total_s"].max()
+    df["share"] = df["total_s"] / total if total > 0 else 0.0
+    return df.sort_values("total_s", ascending=False, ignore_index=True)
+
+
+def derived_rates() -> dict:
+    """Throughput counters (per second of the stage that produced them)."""
+    t = {k: v[1] / 1e9 for k, v in REGISTRY.timings.items()}
+    c = REGISTRY.counters
+    out = {}
+    for counter, stage_name in (("steps", "backtest.simulate"), ("fills", "backtest.simulate"), ("events", "lob.replay")):
+        if c.get(counter) and t.get(stage_name):
+            out[f"{counter}_per_s"] = c[counter] / t[stage_name]
+    read_time = sum(v for k, v in t.items() if k in ("io.load_csv", "data_provider.request"))
+    if c.get("bytes_read") and read_time:
+        out["read_bytes_per_s"] = c["bytes_read"] / read_time
+    return out
+
+
+def write_profile(outdir: str | Path, total_stage: str | None = None, profiler: cProfile.Profile | None = None, top: int = 40) -> Path:
+    """Write ``profile.md``/``profile.json`` (and ``profile.pstats`` with a text digest for cProfile)."""
+    out = Path(outdir)
+    out.mkdir(parents=True, exist_ok=True)
+    table = stage_table(total_stage)
+    rates = derived_rates()
+    lines = ["# Profile", "", "## Stages", "", "| stage | calls | total_s | mean_ms | share |", "|---|---:|---:|---:|---:|"]
+    lines += [f"| {r.stage} | {r.calls} | {r.total_s:.6f} | {r.mean_ms:.4f} | {r.share:.1%} |" for r in table.itertuples(index=False)]
+    lines += ["", "## Counters", ""] + [f"- {k}: {v:g}" for k, v in {**REGISTRY.counters, **rates}.items()]
+    payload = {"stages": table.to_dict(orient="records"), "counters": dict(REGISTRY.counters), "rates": rates}
+    if profiler is not None:
+        profiler.dump_stats(out / "profile.pstats")
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top)
+        (out / "profile_cprofile.txt").write_text(buf.getvalue())
+        lines += ["", f"cProfile: `profile.pstats` (top {top} by cumulative time in `profile_cprofile.txt`)"]
+    (out / "profile.json").write_text(json.dumps(payload, indent=1))
+    path = out / "profile.md"
+    path.write_text("\n".join(lines) + "\n")
+    return path
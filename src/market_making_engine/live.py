@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Protocol
+
+import numpy as np
+
+from .avellaneda_stoikov import QuoteEngine
+from .backtest import _arrival_rate
+from .config import StrategyConfig
+from .glft import quote_table
+from .intensity import IntensityFit
+from .online import OnlineIntensityEstimator
+from .volatility import MidVolatility
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(slots=True)
+class MarketUpdate:
+    ts: float
+    mid: float
+    received_ns: int = 0
+
+
+@dataclass(slots=True)
+class QuoteUpdate:
+    ts: float
+    mid: float
+    bid: float
+    ask: float
+    inventory: float
+    cash: float
+    latency_ns: int
+
+
+class MarketDataSource(Protocol):
+    def stream(self) -> AsyncIterator[MarketUpdate]: ...
+
+
+class ReplayFeed:
+    """Replays a recorded ``ts``/``mid`` series as a market-data stream.
+
+    ``speed=None`` replays as fast as possible; ``speed=1.0`` sleeps to reproduce the recorded
+    inter-arrival times on the wall clock (``2.0`` is twice as fast, and so on). ``ts`` is in
+    seconds (numeric) or datetimes.
+    """
+
+    def __init__(self, ts: np.ndarray, mid: np.ndarray, speed: float | None = None):
+        if len(ts) != len(mid):
+            raise ValueError("ts and mid must have the same length")
+        self.ts = np.asarray(ts, dtype=float)
+        self.mid = np.asarray(mid, dtype=float)
+        self.speed = speed
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, mid_col: str = "mid", ts_col: str | None = "ts", speed: float | None = None) -> ReplayFeed:
+        import pandas as pd
+
+        if ts_col is not None and ts_col in df.columns:
+            ts = df[ts_col]
+            if not pd.api.types.is_numeric_dtype(ts):
+                ts = pd.to_datetime(ts, utc=True)
+            if pd.api.types.is_datetime64_any_dtype(ts):
+                ts = ts.to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+            ts = np.asarray(ts, dtype=float)
+        else:
+            ts = np.arange(len(df), dtype=float)
+        return cls(ts, df[mid_col].to_numpy(dtype=float), speed=speed)
+
+    async def stream(self) -> AsyncIterator[MarketUpdate]:
+        start_wall = time.perf_counter()
+        t0 = self.ts[0] if len(self.ts) else 0.0
+        for ts, mid in zip(self.ts.tolist(), self.mid.tolist()):
+            if self.speed:
+                delay = (ts - t0) / self.speed - (time.perf_counter() - start_wall)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield MarketUpdate(ts=ts, mid=mid)
+            await asyncio.sleep(0)
+
+
+class LatencyHistogram:
+    """Log2-bucketed latency histogram in nanoseconds (fixed memory, O(1) record)."""
+
+    def __init__(self, max_exponent: int = 40):
+        self.buckets = np.zeros(max_exponent + 1, dtype=np.int64)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        self.buckets[min(max(int(ns), 1).bit_length() - 1, len(self.buckets) - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+        self.max_ns = max(self.max_ns, ns)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bucket holding the p-th percentile (conservative)."""
+        if self.count == 0:
+            return math.nan
+        rank = math.ceil(p / 100.0 * self.count)
+        i = int(np.searchsorted(np.cumsum(self.buckets), max(rank, 1)))
+        return float(min(2 ** (i + 1), self.max_ns))
+
+    def summary(self) -> dict:
+        return {
+            "latency_count": self.count,
+            "latency_mean_ns": self.total_ns / self.count if self.count else math.nan,
+            "latency_p50_ns": self.percentile(50),
+            "latency_p99_ns": self.percentile(99),
+            "latency_max_ns": float(self.max_ns),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        upper = 2 ** np.arange(1, len(self.buckets) + 1, dtype=np.float64)
+        nz = self.buckets > 0
+        return pd.DataFrame({"upper_ns": upper[nz], "count": self.buckets[nz]})
+
+
+@dataclass(slots=True)
+class LiveStats:
+    received: int = 0
+    processed: int = 0
+    dropped: int = 0
+    fills: int = 0
+    inventory: float = 0.0
+    cash: float = 0.0
+    last_mid: float = math.nan
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def summary(self) -> dict:
+        return {
+            "updates_received": self.received,
+            "updates_processed": self.processed,
+            "updates_dropped": self.dropped,
+            "num_fills": self.fills,
+            "inventory": self.inventory,
+            "cash": self.cash,
+            "mtm_pnl": self.cash + self.inventory * self.last_mid,
+            **self.latency.summary(),
+        }
+
+
+QuoteSink = Callable[[QuoteUpdate], "Awaitable[None] | None"]
+
+
+class QuoteLoop:
+    """Asyncio quoting loop: market data in, A-S quotes out.
+
+    A producer task stores only the latest market update; the consumer wakes, takes whatever is
+    newest and quotes it, so bursts are coalesced and stale updates are dropped rather than
+    queued. Fills are simulated exactly like ``run_backtest`` (per-update Bernoulli draws from the
+    intensity model with ``strat.dt``, inventory capped at ``max_inventory``). Latency is measured
+    from receipt of an update to emission of its quote. A ``vol`` estimator is updated with every
+    quoted mid (weighted by the time since the previous one) and replaces ``strat.sigma``. With
+    ``strat.quoting="glft"`` each quote is a lookup in the precomputed GLFT table.
+    """
+
+    def __init__(
+        self,
+        source: MarketDataSource,
+        fit: IntensityFit,
+        strat: StrategyConfig,
+        seed: int = 7,
+        sink: QuoteSink | None = None,
+        online: OnlineIntensityEstimator | None = None,
+        refit_every: int = 0,
+        vol: MidVolatility | None = None,
+    ):
+        self.source = source
+        self.fit = fit
+        self.strat = strat
+        self.sink = sink
+        self.online = online
+        self.refit_every = refit_every
+        self.vol = vol
+        self._last_ts = math.nan
+        self.rng = np.random.default_rng(seed)
+        if strat.quoting == "glft":
+            if online is not None or vol is not None:
+                raise ValueError("GLFT quoting uses a fixed fit and the constant strat.sigma")
+            self.engine = quote_table(fit, strat)
+        else:
+            self.engine = QuoteEngine(strat.gamma, strat.sigma, max(fit.k, 1e-8))
+        self.stats = LiveStats()
+        self._latest: MarketUpdate | None = None
+        self._wake = asyncio.Event()
+        self._done = False
+        self._t0: float | None = None
+
+    async def _produce(self) -> None:
+        try:
+            async for update in self.source.stream():
+                update.received_ns = time.perf_counter_ns()
+                if self._latest is not None:
+                    self.stats.dropped += 1
+                self._latest = update
+                self.stats.received += 1
+                self._wake.set()
+        finally:
+            self._done = True
+            self._wake.set()
+
+    async def _on_update(self, u: MarketUpdate) -> None:
+        s = self.strat
+        if self._t0 is None:
+            self._t0 = u.ts
+        tau = max(s.horizon_steps * s.dt - (u.ts - self._t0), 0.0)
+        if self.vol is not None:
+            gap = u.ts - self._last_ts
+            sigma = self.vol.update(u.mid, gap if gap > 0 else None)
+            if sigma == sigma and sigma != self.engine.sigma:
+                self.engine.set_params(sigma=sigma)
+            self._last_ts = u.ts
+        q = self.stats.inventory
+        bid, ask = self.engine.quote(u.mid, q, tau)
+
+        delta_bid = max(u.mid - bid, 0.0)
+        delta_ask = max(ask - u.mid, 0.0)
+        p_bid = 1.0 - math.exp(-_arrival_rate(delta_bid, self.fit) * s.dt)
+        p_ask = 1.0 - math.exp(-_arrival_rate(delta_ask, self.fit) * s.dt)
+        bid_fill = (self.rng.uniform() < p_bid) and (q + s.order_size <= s.max_inventory)
+        ask_fill = (self.rng.uniform() < p_ask) and (q - s.order_size >= -s.max_inventory)
+
+        if self.online is not None:
+            self.online.advance(s.dt)
+            if q + s.order_size <= s.max_inventory:
+                self.online.observe(delta_bid, s.dt, float(bid_fill))
+            if q - s.order_size >= -s.max_inventory:
+                self.online.observe(delta_ask, s.dt, float(ask_fill))
+        if bid_fill:
+            self.stats.inventory += s.order_size
+            self.stats.cash -= bid * s.order_size
+            self.stats.fills += 1
+        if ask_fill:
+            self.stats.inventory -= s.order_size
+            self.stats.cash += ask * s.order_size
+            self.stats.fills += 1
+        self.stats.last_mid = u.mid
+        self.stats.processed += 1
+
+        latency = time.perf_counter_ns() - u.received_ns
+        self.stats.latency.record(latency)
+        if self.sink is not None:
+            out = self.sink(QuoteUpdate(u.ts, u.mid, bid, ask, self.stats.inventory, self.stats.cash, latency))
+            if asyncio.iscoroutine(out):
+                await out
+
+        if self.online is not None and self.refit_every > 0 and self.stats.processed % self.refit_every == 0:
+            fit = self.online.refit()
+            if fit is not None and fit is not self.fit:
+                self.fit = fit
+                self.engine.set_params(k=max(fit.k, 1e-8))
+
+    async def run(self) -> LiveStats:
+        producer = asyncio.create_task(self._produce())
+        try:
+            while True:
+                if self._latest is None:
+                    if self._done:
+                        break
+                    await self._wake.wait()
+                    self._wake.clear()
+                    continue
+                update, self._latest = self._latest, None
+                await self._on_update(update)
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+        return self.stats
+
+
+def run_replay(
+    df: pd.DataFrame,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    seed: int = 7,
+    speed: float | None = None,
+    mid_col: str = "mid",
+    ts_col: str | None = "ts",
+    sink: QuoteSink | None = None,
+    vol: MidVolatility | None = None,
+) -> LiveStats:
+    feed = ReplayFeed.from_frame(df, mid_col=mid_col, ts_col=ts_col, speed=speed)
+    return asyncio.run(QuoteLoop(feed, fit, strat, seed=seed, sink=sink, vol=vol).run())
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .avellaneda_stoikov import optimal_quote
+from .backtest import BacktestResult, _summarize, new_fill_log
+from .config import BacktestConfig, LOBConfig, StrategyConfig
+from .fills import BUY, SELL
+from .glft import quote_table
+from .instrument import count, stage
+from .intensity import IntensityFit
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+BOOK = 0  # absolute size update of one L2 level; side +1 bid / -1 ask
+TRADE = 1  # trade print; side +1 buyer-initiated (lifts asks) / -1 seller-initiated (hits bids)
+
+EVENT_DTYPE = np.dtype([("ts", "f8"), ("kind", "i1"), ("side", "i1"), ("price", "i8"), ("size", "f8")])
+EVENT_COLUMNS = list(EVENT_DTYPE.names)
+
+# working order: [price index, remaining, queue ahead (-1 until live), live at, cancel at, traded at level]
+_PX, _REM, _AHEAD, _LIVE, _CANCEL, _TRADED = range(6)
+_INF = math.inf
+
+
+def events_from_frame(df: pd.DataFrame, tick_size: float = 0.01) -> np.ndarray:
+    """Convert a ``ts,kind,side,price,size`` frame (prices in price units) into an event array.
+
+    ``kind`` may be 0/1 or ``book``/``trade``; ``side`` may be +1/-1 or ``bid``/``ask``
+    (book) and ``buy``/``sell`` (trade aggressor).
+    """
+    import pandas as pd
+
+    missing = [c for c in EVENT_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Event frame is missing columns: {missing}")
+    kind = df["kind"]
+    if not pd.api.types.is_numeric_dtype(kind):
+        kind = kind.str.lower().map({"book": BOOK, "trade": TRADE})
+    side = df["side"]
+    if not pd.api.types.is_numeric_dtype(side):
+        side = side.str.lower().map({"bid": 1, "buy": 1, "ask": -1, "sell": -1})
+    if kind.isna().any() or side.isna().any():
+        raise ValueError("Unrecognized kind/side values in event frame")
+    ev = np.empty(len(df), dtype=EVENT_DTYPE)
+    ev["ts"] = df["ts"].to_numpy(dtype=float)
+    ev["kind"] = kind.to_numpy(dtype=np.int8)
+    ev["side"] = side.to_numpy(dtype=np.int8)
+    ev["price"] = np.rint(df["price"].to_numpy(dtype=float) / tick_size).astype(np.int64)
+    ev["size"] = df["size"].to_numpy(dtype=float)
+    return ev
+
+
+def synthetic_lob_events(
+    n_steps: int,
+    seed: int = 0,
+    levels: int = 10,
+    start_tick: int = 10_000,
+    spread_ticks: int = 1,
+    move_prob: float = 0.05,
+    trade_prob: float = 0.3,
+    mean_size: float = 5.0,
+    rate: float = 10.0,
+) -> np.ndarray:
+    """Generate a consistent L2 book + trade stream (prices in ticks), fully vectorised.
+
+    The best bid follows a +/-1 tick random walk with a constant spread. Each step emits up to
+    six events: on a move, the vacated best level is zeroed and both new best levels are set;
+    then one random depth update within ``levels`` of the touch; then, with ``trade_prob``, a
+    trade at the touch followed by the book update that consumes it.
+    """
+    rng = np.random.default_rng(seed)
+    move = np.where(rng.uniform(size=n_steps) < move_prob, rng.choice([-1, 1], size=n_steps), 0)
+    bb = start_tick + np.cumsum(move)
+    ts = np.cumsum(rng.exponential(1.0 / rate, size=n_steps))
+
+    def sizes(k: int) -> np.ndarray:
+        return np.ceil(rng.exponential(mean_size, size=k))
+
+    slots = np.zeros((n_steps, 6), dtype=EVENT_DTYPE)
+    valid = np.zeros((n_steps, 6), dtype=bool)
+    slots["ts"] = ts[:, None]
+    slots["kind"] = BOOK
+    # moves: zero the vacated level, set the new best bid and best ask
+    up, down = move > 0, move < 0
+    slots["side"][:, 0] = np.where(up, -1, 1)
+    slots["price"][:, 0] = np.where(up, bb - 1 + spread_ticks, bb + 1)
+    slots["side"][:, 1], slots["price"][:, 1], slots["size"][:, 1] = 1, bb, sizes(n_steps)
+    slots["side"][:, 2], slots["price"][:, 2], slots["size"][:, 2] = -1, bb + spread_ticks, sizes(n_steps)
+    valid[:, 0:3] = (up | down)[:, None]
+    # depth update
+    side = rng.choice(np.array([1, -1], dtype=np.int8), size=n_steps)
+    off = rng.integers(0, levels, size=n_steps)
+    slots["side"][:, 3] = side
+    slots["price"][:, 3] = np.where(side > 0, bb - off, bb + spread_ticks + off)
+    slots["size"][:, 3] = sizes(n_steps)
+    valid[:, 3] = True
+    # trade at the touch; the level keeps at least one lot so the touch never empties
+    aggr = rng.choice(np.array([1, -1], dtype=np.int8), size=n_steps)
+    px = np.where(aggr > 0, bb + spread_ticks, bb)
+    qty = sizes(n_steps)
+    slots["kind"][:, 4], slots["side"][:, 4], slots["price"][:, 4], slots["size"][:, 4] = TRADE, aggr, px, qty
+    slots["side"][:, 5], slots["price"][:, 5] = -aggr, px
+    slots["size"][:, 5] = np.maximum(sizes(n_steps) - qty, 1.0)
+    valid[:, 4:6] = (rng.uniform(size=n_steps) < trade_prob)[:, None]
+
+    init = np.zeros(2 * levels, dtype=EVENT_DTYPE)
+    init["side"] = np.repeat(np.array([1, -1], dtype=np.int8), levels)
+    init["price"] = np.concatenate([start_tick - np.arange(levels), start_tick + spread_ticks + np.arange(levels)])
+    init["size"] = sizes(2 * levels)
+    return np.concatenate([init, slots[valid]])
+
+
+def run_lob_backtest(
+    events: np.ndarray,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    lob: LOBConfig | None = None,
+) -> BacktestResult:
+    """Replay L2 book/trade events against our A-S quotes with queue position and latency.
+
+    The book is two flat per-tick ladders (bid and ask sizes) indexed by ``price - min_price``,
+    with the touch tracked incrementally, and events are dispatched from column chunks converted to
+    Python scalars, so there are no per-level or per-event objects. Quotes come from
+    ``optimal_quote`` (k from ``fit``) or, with ``strat.quoting="glft"``, the GLFT table. They are
+    rounded away from mid onto ticks, kept post-only, and re-evaluated when the touch moves or we
+    get filled.
+
+    Queue model: a new order becomes live ``entry_latency`` after the decision and joins the back
+    of its level. Trades at our price consume the volume ahead of us first and then fill us,
+    possibly partially; trades through our price fill us directly. Size decreases at our level that
+    are not explained by traded volume are cancels, taken pro-rata from the queue ahead. A replaced
+    order stays live (and fillable) for ``cancel_latency``. One trade fills our orders best price
+    first, then oldest first, and never for more than its size in total. Fills are capped at
+    ``max_inventory``.
+
+    State is sampled every ``strat.dt`` time units from the first two-sided book, giving the same
+    ``BacktestResult`` schema as ``run_backtest``; fills additionally carry ``ts`` and ``size``.
+    """
+    lob = lob or LOBConfig()
+    ev = np.asarray(events)
+    if ev.dtype != EVENT_DTYPE:
+        raise ValueError(f"events must have dtype {EVENT_DTYPE}")
+    if len(ev) == 0:
+        raise ValueError("No events to replay")
+
+    tick = lob.tick_size
+    base = int(ev["price"].min()) - 1
+    width = int(ev["price"].max()) - base + 2
+    bid_sz = [0.0] * width
+    ask_sz = [0.0] * width
+    bb, ba = -1, width  # touch indices (sentinels = empty side)
+    bids: list[list] = []
+    asks: list[list] = []
+
+    size, max_inv, dt = strat.order_size, strat.max_inventory, strat.dt
+    horizon = strat.horizon_steps * dt
+    k = max(fit.k, 1e-8)
+    table = quote_table(fit, strat, cfg.quote_cache_dir or None) if strat.quoting == "glft" else None
+    lat_in, lat_out = lob.entry_latency, lob.cancel_latency
+
+    q = c = 0.0
+    mid = math.nan
+    t0 = next_sample = _INF
+    next_timer = _INF
+    inv_s: list[float] = []
+    cash_s: list[float] = []
+    mid_s: list[float] = []
+    rs_s: list[float] = []
+    rs_step = 0.0
+    fills = new_fill_log(cfg, extra={"size": np.float64, "ts": np.float64})
+
+    def retarget(orders: list[list], book: list[float], target: int | None, ts: float) -> None:
+        keep = False
+        orders[:] = [o for o in orders if o[_REM] > 0.0]
+        for o in orders:
+            if o[_CANCEL] == _INF:
+                if target is not None and o[_PX] == target and not keep:
+                    keep = True
+                else:
+                    o[_CANCEL] = ts + lat_out
+        if lat_out <= 0.0:
+            orders[:] = [o for o in orders if o[_CANCEL] == _INF]
+        if target is not None and not keep:
+            # with zero entry latency the order joins the queue immediately
+            ahead = (book[target] if 0 <= target < width else 0.0) if lat_in <= 0.0 else -1.0
+            orders.append([target, size, ahead, ts + lat_in, _INF, 0.0])
+
+    def run_timers(ts: float) -> float:
+        nt = _INF
+        for orders, book in ((bids, bid_sz), (asks, ask_sz)):
+            live = []
+            for o in orders:
+                if o[_CANCEL] <= ts or o[_REM] <= 0.0:
+                    continue
+                if o[_AHEAD] < 0.0:
+                    if o[_LIVE] <= ts:
+                        p = o[_PX]
+                        o[_AHEAD] = book[p] if 0 <= p < width else 0.0
+                    else:
+                        nt = min(nt, o[_LIVE])
+                nt = min(nt, o[_CANCEL])
+                live.append(o)
+            orders[:] = live
+        return nt
+
+    with stage("lob.replay"):
+        chunk = max(int(lob.chunk_size), 1)
+        for start in range(0, len(ev), chunk):
+            part = ev[start : start + chunk]
+            cols = (
+                part["ts"].tolist(),
+                part["kind"].tolist(),
+                part["side"].tolist(),
+                (part["price"] - base).tolist(),
+                part["size"].tolist(),
+            )
+            for ts, kind, side, p, sz in zip(*cols):
+                while next_sample < ts:
+                    inv_s.append(q)
+                    cash_s.append(c)
+                    mid_s.append(mid)
+                    rs_s.append(rs_step)
+                    rs_step = 0.0
+                    next_sample = t0 + len(inv_s) * dt
+                if next_timer <= ts:
+                    next_timer = run_timers(ts)
+
+                obb, oba = bb, ba
+                filled = False
+                if kind == BOOK:
+                    if side > 0:
+                        old = bid_sz[p]
+                        bid_sz[p] = sz
+                        if bids and sz < old:
+                            _queue_decrease(bids, p, old, sz)
+                        if sz > 0.0:
+                            if p > bb:
+                                bb = p
+                        elif p == bb:
+                            while bb >= 0 and bid_sz[bb] <= 0.0:
+                                bb -= 1
+                    else:
+                        old = ask_sz[p]
+                        ask_sz[p] = sz
+                        if asks and sz < old:
+                            _queue_decrease(asks, p, old, sz)
+                        if sz > 0.0:
+                            if p < ba:
+                                ba = p
+                        elif p == ba:
+                            while ba < width and ask_sz[ba] <= 0.0:
+                                ba += 1
+                elif side > 0:
+                    # buyer lifts asks at or above p: our asks at <= p are reachable, best price
+                    # first and then by time; ``left`` is the print not yet filled by our orders,
+                    # so a requote at a price still held by a cancelling order cannot double-fill
+                    left = sz
+                    for o in sorted(asks, key=_price_key) if len(asks) > 1 else asks:
+                        if o[_AHEAD] < 0.0 or o[_PX] > p:
+                            continue
+                        if o[_PX] == p:
+                            o[_TRADED] += sz
+                            eat = min(o[_AHEAD], left)
+                            o[_AHEAD] -= eat
+                            x = min(o[_REM], left - eat)
+                        else:
+                            x = min(o[_REM], left)
+                        x = min(x, q + max_inv)
+                        if x > 0.0:
+                            px = (o[_PX] + base) * tick
+                            left -= x
+                            o[_REM] -= x
+                            q -= x
+                            c += px * x
+                            rs_step += (px - mid) * x
+                            fills.append(len(inv_s), SELL, px, mid, px - mid, x, ts)
+                            filled = True
+                else:
+                    left = sz
+                    for o in sorted(bids, key=_price_key, reverse=True) if len(bids) > 1 else bids:
+                        if o[_AHEAD] < 0.0 or o[_PX] < p:
+                            continue
+                        if o[_PX] == p:
+                            o[_TRADED] += sz
+                            eat = min(o[_AHEAD], left)
+                            o[_AHEAD] -= eat
+                            x = min(o[_REM], left - eat)
+                        else:
+                            x = min(o[_REM], left)
+                        x = min(x, max_inv - q)
+                        if x > 0.0:
+                            px = (o[_PX] + base) * tick
+                            left -= x
+                            o[_REM] -= x
+                            q += x
+                            c -= px * x
+                            rs_step += (mid - px) * x
+                            fills.append(len(inv_s), BUY, px, mid, mid - px, x, ts)
+                            filled = True
+
+                if (filled or bb != obb or ba != oba) and bb >= 0 and ba < width:
+                    mid = (bb + ba + 2 * base) * 0.5 * tick
+                    if t0 == _INF:
+                        t0 = next_sample = ts
+                    tau = max(horizon - (ts - t0), 0.0)
+                    if table is not None:
+                        qb, qa = table.quote(mid, q, tau)
+                    else:
+                        quote = optimal_quote(mid, q, strat.gamma, strat.sigma, tau, k)
+                        qb, qa = quote.bid, quote.ask
+                    bid_t = min(math.floor(qb / tick + 1e-9) - base, ba - 1) if q + size <= max_inv and qb > -_INF else None
+                    ask_t = max(math.ceil(qa / tick - 1e-9) - base, bb + 1) if q - size >= -max_inv and qa < _INF else None
+                    retarget(bids, bid_sz, bid_t, ts)
+                    retarget(asks, ask_sz, ask_t, ts)
+                    if lat_in > 0.0 or lat_out > 0.0:
+                        next_timer = min(next_timer, ts + min(lat for lat in (lat_in, lat_out) if lat > 0.0))
+    count("events", len(ev))
+
+    if t0 == _INF:
+        raise ValueError("The book never had both a bid and an ask")
+    last = float(ev["ts"][-1])
+    while next_sample < last:
+        inv_s.append(q)
+        cash_s.append(c)
+        mid_s.append(mid)
+        rs_s.append(0.0)
+        next_sample = t0 + len(inv_s) * dt
+    # closing sample at the first grid point >= the last event; trailing fills belong to it
+    inv_s.append(q)
+    cash_s.append(c)
+    mid_s.append(mid)
+    rs_s.append(rs_step)
+
+    m = np.asarray(mid_s)
+    inventory = np.asarray(inv_s)
+    inventory_pnl = np.zeros(len(m))
+    inventory_pnl[1:] = inventory[:-1] * np.diff(m)
+    result = _summarize(m, inventory, np.asarray(cash_s), np.asarray(rs_s), inventory_pnl, fills, cfg, np.full(len(m), strat.sigma))
+    result.summary["num_events"] = int(len(ev))
+    result.summary["partial_fills"] = int(np.sum(fills.column("size") < size))
+    return result
+
+
+def _price_key(o: list) -> int:
+    return o[_PX]
+
+
+def _queue_decrease(orders: list[list], p: int, old: float, new: float) -> None:
+    """Size at level ``p`` fell from ``old`` to ``new``: net out traded volume, rest are cancels."""
+    for o in orders:
+        if o[_PX] != p or o[_AHEAD] <= 0.0:
+            continue
+        dec = old - new
+        traded = o[_TRADED]
+        cancels = dec - traded if dec > traded else 0.0
+        o[_TRADED] = traded - dec if traded > dec else 0.0
+        o[_AHEAD] = min(o[_AHEAD] - cancels * o[_AHEAD] / old, new)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_HORIZONS = (1, 5, 30, 300)
+SIDES = ("all", "buy", "sell")
+
+
+def parse_horizons(spec: str) -> tuple[int, ...]:
+    """``"1,5,30"`` -> ``(1, 5, 30)``; horizons must be non-negative step counts."""
+    horizons = tuple(int(x) for x in spec.split(",") if x.strip())
+    if any(h < 0 for h in horizons):
+        raise ValueError(f"Markout horizons must be >= 0: {spec}")
+    return horizons
+
+
+def side_sign(side: np.ndarray) -> np.ndarray:
+    """+1 for buys, -1 for sells; accepts ``buy``/``sell`` labels or signed numbers."""
+    s = np.asarray(side)
+    if s.dtype.kind in "OUS":
+        return np.where(s == "buy", 1.0, -1.0)
+    return np.sign(s).astype(float)
+
+
+def markout_matrix(
+    mid: np.ndarray,
+    t: np.ndarray,
+    side: np.ndarray,
+    fill_mid: np.ndarray,
+    horizons: tuple[int, ...] | np.ndarray,
+) -> np.ndarray:
+    """Adverse-selection cost of every fill at every horizon, shape ``(fills, horizons)``.
+
+    cost = side * (fill_mid - mid[t + h]), with ``t + h`` clipped to the last step, so a positive
+    value means the mid moved against the fill. ``side`` is +1 for buys and -1 for sells.
+    """
+    m = np.asarray(mid, dtype=float)
+    h = np.asarray(horizons, dtype=np.int64)
+    idx = np.minimum(np.asarray(t, dtype=np.int64)[:, None] + h[None, :], len(m) - 1)
+    return np.asarray(side, dtype=float)[:, None] * (np.asarray(fill_mid, dtype=float)[:, None] - m[idx])
+
+
+MARKOUT_MAX_ELEMENTS = 1 << 22
+
+
+def markout_block_rows(horizons, max_elements: int = MARKOUT_MAX_ELEMENTS) -> int:
+    """Fills per row block in :func:`markout_table` (at most ``max_elements`` matrix entries)."""
+    return max(1, max_elements // max(len(horizons), 1))
+
+
+class MarkoutAccumulator:
+    """Per-side running sums behind :func:`markout_table`, fed one row block of costs at a time.
+
+    Feeding the same consecutive blocks (see :func:`markout_block_rows`) gives the same table
+    whether the fills arrive all at once or stream in.
+    """
+
+    def __init__(self, horizons):
+        self.horizons = np.asarray(horizons, dtype=np.int64)
+        # rows: buy, sell
+        self.count = np.zeros(2)
+        self.s1 = np.zeros((2, len(self.horizons)))
+        self.s2 = np.zeros((2, len(self.horizons)))
+
+    def add(self, cost: np.ndarray, sign: np.ndarray) -> None:
+        buy = sign > 0
+        self.count += [np.sum(buy), np.sum(sign < 0)]
+        for j, rows in enumerate((buy, ~buy)):
+            part = cost[rows]
+            self.s1[j] += part.sum(axis=0)
+            self.s2[j] += np.square(part).sum(axis=0)
+
+    def curve(self) -> dict:
+        """The ``side == "all"`` means of :meth:`table` as ``markout_<h>`` keys, without building it."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.s1.sum(axis=0) / self.count.sum()
+        return {f"markout_{int(h)}": float(v) for h, v in zip(self.horizons, mean)}
+
+    def table(self) -> pd.DataFrame:
+        import pandas as pd
+
+        h = self.horizons
+        count = np.concatenate([[self.count.sum()], self.count])
+        s1 = np.vstack([self.s1.sum(axis=0), self.s1])
+        s2 = np.vstack([self.s2.sum(axis=0), self.s2])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s1 / count[:, None]
+            std = np.sqrt(np.maximum(s2 / count[:, None] - mean * mean, 0.0))
+        return pd.DataFrame(
+            {
+                "horizon": np.tile(h, len(SIDES)),
+                "side": np.repeat(SIDES, len(h)),
+                "fills": np.repeat(count, len(h)).astype(np.int64),
+                "mean": mean.ravel(),
+                "std": std.ravel(),
+                "total": s1.ravel(),
+            }
+        )
+
+
+def markout_sums(
+    mid: np.ndarray,
+    t: np.ndarray,
+    side: np.ndarray,
+    fill_mid: np.ndarray,
+    horizons: tuple[int, ...] = DEFAULT_HORIZONS,
+    max_elements: int = MARKOUT_MAX_ELEMENTS,
+) -> MarkoutAccumulator:
+    """Per-side markout sums over all fills; :func:`markout_table` renders them as a frame.
+
+    Fills are processed in row blocks of at most ``max_elements`` matrix entries, so memory stays
+    bounded for millions of fills; each block is one gather over ``mid``.
+    """
+    h = np.asarray(horizons, dtype=np.int64)
+    t = np.asarray(t, dtype=np.int64)
+    sign = side_sign(side)
+    fill_mid = np.asarray(fill_mid, dtype=float)
+    acc = MarkoutAccumulator(h)
+    step = markout_block_rows(h, max_elements)
+    for lo in range(0, len(t), step):
+        hi = min(lo + step, len(t))
+        acc.add(markout_matrix(mid, t[lo:hi], sign[lo:hi], fill_mid[lo:hi], h), sign[lo:hi])
+    return acc
+
+
+def markout_table(
+    mid: np.ndarray,
+    t: np.ndarray,
+    side: np.ndarray,
+    fill_mid: np.ndarray,
+    horizons: tuple[int, ...] = DEFAULT_HORIZONS,
+    max_elements: int = MARKOUT_MAX_ELEMENTS,
+) -> pd.DataFrame:
+    """Per-horizon, per-side markout aggregates (``fills``, ``mean``, ``std``, ``total``)."""
+    return markout_sums(mid, t, side, fill_mid, horizons, max_elements).table()
+
+
+def markout_curve(table: pd.DataFrame) -> dict:
+    """Mean cost per fill at each horizon over all fills, as flat ``markout_<h>`` summary keys."""
+    rows = table[table["side"] == "all"]
+    return {f"markout_{int(h)}": float(v) for h, v in zip(rows["horizon"], rows["mean"])}
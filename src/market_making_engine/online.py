@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from .intensity import K_RANGES, IntensityFit, _log_factorial_sum, _solve_profile_k, lambda_exponential, lambda_power
+
+
+class OnlineIntensityEstimator:
+    """Exponentially weighted per-bin counts/exposure with warm-started (A, k) re-solves.
+
+    Observations older than ``half_life`` (in the same time units as exposure) carry half the
+    weight. Decay is applied lazily through a global scale factor, so ``observe`` only touches the
+    bins it updates. ``refit`` runs the profile-likelihood Newton solve starting from the current
+    k, which typically converges in a couple of iterations on a few dozen bins.
+
+    An optional ``prior`` seeds every bin with ``prior_exposure`` of exposure and the counts the
+    prior intensity implies, which keeps early re-fits from jumping on sparse data.
+    """
+
+    def __init__(
+        self,
+        deltas: np.ndarray,
+        model: str = "exponential",
+        half_life: float = 3600.0,
+        prior: IntensityFit | None = None,
+        prior_exposure: float = 0.0,
+        k_min: float | None = None,
+        k_max: float | None = None,
+        delta0: float = 1e-4,
+        min_count: float = 10.0,
+    ):
+        if model not in K_RANGES:
+            raise ValueError(f"Unsupported model: {model}")
+        d = np.asarray(deltas, dtype=float)
+        if d.ndim != 1 or len(d) < 2 or np.any(np.diff(d) <= 0):
+            raise ValueError("deltas must be a strictly increasing 1-D array with at least two bins")
+        self.deltas = d
+        self.model = model
+        self.delta0 = delta0
+        self.k_min = K_RANGES[model][0] if k_min is None else k_min
+        self.k_max = K_RANGES[model][1] if k_max is None else k_max
+        self.min_count = min_count
+        self._decay_rate = math.log(2.0) / half_life
+        self._x = np.maximum(d, 0.0) if model == "exponential" else np.log(np.maximum(d, 0.0) + delta0)
+        self._edges = 0.5 * (d[1:] + d[:-1])
+
+        # true accumulator value = stored value * self._scale
+        self._scale = 1.0
+        self._counts = np.zeros(len(d))
+        self._exposure = np.zeros(len(d))
+        self.fit: IntensityFit | None = prior
+        self.refits = 0
+        if prior is not None and prior_exposure > 0.0:
+            lam = lambda_exponential(d, prior.A, prior.k) if model == "exponential" else lambda_power(d, prior.A, prior.k, delta0)
+            self._counts += lam * prior_exposure
+            self._exposure += prior_exposure
+
+    def advance(self, elapsed: float) -> None:
+        """Let ``elapsed`` time pass, decaying all accumulated weight."""
+        self._scale *= math.exp(-self._decay_rate * elapsed)
+        if self._scale < 1e-150:
+            self._counts *= self._scale
+            self._exposure *= self._scale
+            self._scale = 1.0
+
+    def bin_index(self, delta: float | np.ndarray) -> np.ndarray:
+        return np.searchsorted(self._edges, delta)
+
+    def observe(self, delta: float | np.ndarray, exposure: float | np.ndarray, fills: float | np.ndarray = 0.0) -> None:
+        """Record quotes resting at ``delta`` for ``exposure`` time with ``fills`` arrivals."""
+        if np.ndim(delta) == 0:
+            i = int(self._edges.searchsorted(delta))
+            self._exposure[i] += exposure / self._scale
+            self._counts[i] += fills / self._scale
+            return
+        i = self.bin_index(delta)
+        np.add.at(self._exposure, i, np.asarray(exposure, dtype=float) / self._scale)
+        np.add.at(self._counts, i, np.asarray(fills, dtype=float) / self._scale)
+
+    def update(self, counts: np.ndarray, exposure: np.ndarray) -> None:
+        """Add a bin-aligned batch, e.g. a ``delta,count,exposure`` table from the aggregator."""
+        self._counts += np.asarray(counts, dtype=float) / self._scale
+        self._exposure += np.asarray(exposure, dtype=float) / self._scale
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts * self._scale
+
+    @property
+    def exposure(self) -> np.ndarray:
+        return self._exposure * self._scale
+
+    def refit(self) -> IntensityFit | None:
+        """Re-solve (A, k) on the decayed bins; keeps the previous fit while data is too thin."""
+        counts = self.counts
+        exposure = self.exposure
+        total = float(np.sum(counts))
+        if total < self.min_count:
+            return self.fit
+        k0 = self.fit.k if self.fit is not None else None
+        k = _solve_profile_k(self._x, counts, exposure, self.k_min, self.k_max, k0=k0)
+        A = total / max(float(np.sum(exposure * np.exp(-k * self._x))), 1e-12)
+        lam_e = np.maximum(A * np.exp(-k * self._x) * exposure, 1e-12)
+        ll = float(np.sum(counts * np.log(lam_e) - lam_e)) - _log_factorial_sum(counts)
+        n = len(self.deltas)
+        p = 2
+        self.fit = IntensityFit(model=self.model, A=A, k=k, log_likelihood=ll, aic=2 * p - 2 * ll, bic=math.log(n) * p - 2 * ll)
+        self.refits += 1
+        return self.fit
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import run_backtest
+from .config import BacktestConfig, PortfolioConfig, StrategyConfig
+from .instrument import stage
+from .intensity import IntensityFit
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# per-symbol output rows in the shared result block
+_OUT = ("inventory", "cash", "mtm_pnl", "realized_spread", "inventory_pnl")
+
+
+@dataclass(slots=True)
+class PortfolioResult:
+    symbols: pd.DataFrame  # one summary row per symbol
+    timeseries: pd.DataFrame  # portfolio-level P&L and notional per step
+    inventory: pd.DataFrame  # per-step inventory, one column per symbol
+    summary: dict
+
+
+def _per_symbol(value, symbols: list[str], what: str) -> list:
+    if not isinstance(value, dict):
+        return [value] * len(symbols)
+    missing = [s for s in symbols if s not in value]
+    if missing:
+        raise ValueError(f"No {what} for symbols: {missing}")
+    return [value[s] for s in symbols]
+
+
+def notional_caps(mids: np.ndarray, strats: list[StrategyConfig], max_gross_notional: float) -> list[StrategyConfig]:
+    """Tighten each symbol's ``max_inventory`` so gross notional can never exceed the limit.
+
+    The limit is split evenly; symbol ``i`` may hold at most ``budget / max(mid_i)`` units, so
+    ``sum |q_i| * mid_i <= max_gross_notional`` at every step without coupling the symbols.
+    """
+    if max_gross_notional <= 0:
+        return strats
+    budget = max_gross_notional / len(strats)
+    peak = np.max(np.abs(mids), axis=1)
+    return [
+        replace(st, max_inventory=min(st.max_inventory, int(math.floor(budget / p)) if p > 0 else st.max_inventory))
+        for st, p in zip(strats, peak)
+    ]
+
+
+# Per-worker views onto the shared mid panel and result block, set up once by the pool initializer.
+_worker_shm: list[shared_memory.SharedMemory] = []
+_worker_mids: np.ndarray | None = None
+_worker_out: np.ndarray | None = None
+
+
+def _init_worker(mids_name: str, out_name: str, shape: tuple[int, int]) -> None:
+    global _worker_mids, _worker_out
+    mids_shm = shared_memory.SharedMemory(name=mids_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    _worker_shm[:] = [mids_shm, out_shm]
+    _worker_mids = np.ndarray(shape, dtype=np.float64, buffer=mids_shm.buf)
+    _worker_out = np.ndarray((shape[0], len(_OUT), shape[1]), dtype=np.float64, buffer=out_shm.buf)
+
+
+def _run_shard(
+    mids: np.ndarray,
+    out: np.ndarray,
+    rows: list[int],
+    fits: list[IntensityFit],
+    strats: list[StrategyConfig],
+    cfgs: list[BacktestConfig],
+) -> list[dict]:
+    summaries = []
+    for i, fit, strat, cfg in zip(rows, fits, strats, cfgs):
+        result = run_backtest(mids[i], fit, strat, cfg)
+        for j, col in enumerate(_OUT):
+            out[i, j] = result.columns[col]
+        summaries.append(result.summary)
+    return summaries
+
+
+def _run_shared(rows: list[int], fits: list, strats: list, cfgs: list) -> list[dict]:
+    return _run_shard(_worker_mids, _worker_out, rows, fits, strats, cfgs)
+
+
+def run_portfolio_backtest(
+    mids: pd.DataFrame,
+    fits: IntensityFit | dict[str, IntensityFit],
+    strat: StrategyConfig | dict[str, StrategyConfig],
+    cfg: BacktestConfig,
+    portfolio: PortfolioConfig | None = None,
+) -> PortfolioResult:
+    """Backtest every column of ``mids`` (one symbol per column, one row per step) as one book.
+
+    ``fits`` and ``strat`` are either shared or keyed by symbol. Symbol ``i`` is run with seed
+    ``cfg.seed + i`` so fill draws are independent across symbols and reproducible per symbol.
+    Symbols are split into one contiguous shard per worker; the mid panel and the per-step result
+    block live in shared memory, so workers neither receive nor return arrays through pickling.
+    Results are identical for any worker count.
+    """
+    import pandas as pd
+
+    portfolio = portfolio or PortfolioConfig()
+    symbols = [str(c) for c in mids.columns]
+    if not symbols:
+        raise ValueError("No symbols")
+    panel = np.ascontiguousarray(mids.to_numpy(dtype=np.float64).T)  # (symbols, steps)
+    S, n = panel.shape
+    if n == 0:
+        raise ValueError("Portfolio backtest needs at least one step")
+    if np.isnan(panel).any():
+        raise ValueError("mids must not contain NaN; align symbols on a common grid first")
+
+    fit_list = _per_symbol(fits, symbols, "intensity fit")
+    strat_list = notional_caps(panel, _per_symbol(strat, symbols, "strategy config"), portfolio.max_gross_notional)
+    cfgs = [
+        replace(cfg, seed=cfg.seed + i, fill_log_dir=str(Path(cfg.fill_log_dir) / s) if cfg.fill_log_dir else "")
+        for i, s in enumerate(symbols)
+    ]
+    workers = portfolio.workers if portfolio.workers > 0 else (os.cpu_count() or 1)
+    shards = [list(map(int, r)) for r in np.array_split(np.arange(S), min(workers, S))]
+
+    def args(rows: list[int]) -> tuple:
+        return rows, [fit_list[i] for i in rows], [strat_list[i] for i in rows], [cfgs[i] for i in rows]
+
+    with stage("portfolio.simulate"):
+        if len(shards) <= 1:
+            out = np.empty((S, len(_OUT), n))
+            summaries = _run_shard(panel, out, *args(shards[0]))
+        else:
+            mids_shm = shared_memory.SharedMemory(create=True, size=panel.nbytes)
+            out_shm = shared_memory.SharedMemory(create=True, size=panel.nbytes * len(_OUT))
+            try:
+                np.ndarray(panel.shape, dtype=np.float64, buffer=mids_shm.buf)[:] = panel
+                with ProcessPoolExecutor(
+                    max_workers=len(shards),
+                    initializer=_init_worker,
+                    initargs=(mids_shm.name, out_shm.name, panel.shape),
+                ) as pool:
+                    futures = [pool.submit(_run_shared, *args(rows)) for rows in shards]
+                    summaries = [s for f in futures for s in f.result()]
+                out = np.ndarray((S, len(_OUT), n), dtype=np.float64, buffer=out_shm.buf).copy()
+            finally:
+                for shm in (mids_shm, out_shm):
+                    shm.close()
+                    shm.unlink()
+
+    inventory = out[:, 0]
+    notional = inventory * panel
+    gross = np.abs(notional).sum(axis=0)
+    ts = pd.DataFrame(
+        {
+            "t": np.arange(n),
+            "mtm_pnl": out[:, 2].sum(axis=0),
+            "realized_spread": out[:, 3].sum(axis=0),
+            "inventory_pnl": out[:, 4].sum(axis=0),
+            "net_notional": notional.sum(axis=0),
+            "gross_notional": gross,
+        }
+    )
+    per_symbol = pd.DataFrame(summaries)
+    per_symbol.insert(0, "symbol", symbols)
+    per_symbol.insert(1, "max_inventory", [st.max_inventory for st in strat_list])
+
+    pnl = ts["mtm_pnl"].to_numpy()
+    summary = {
+        "symbols": S,
+        "steps": n,
+        "workers": len(shards),
+        "final_pnl": float(pnl[-1]),
+        "max_drawdown": float(np.max(np.maximum.accumulate(pnl) - pnl)),
+        "realized_spread_capture": float(per_symbol["realized_spread_capture"].sum()),
+        "inventory_pnl": float(per_symbol["inventory_pnl"].sum()),
+        "adverse_selection_cost": float(per_symbol["adverse_selection_cost"].sum()),
+        "num_fills": int(per_symbol["num_fills"].sum()),
+        "max_gross_notional": float(gross.max()),
+        "max_abs_net_notional": float(np.abs(ts["net_notional"]).max()),
+    }
+    if portfolio.max_gross_notional > 0:
+        summary["gross_notional_limit"] = portfolio.max_gross_notional
+        summary["gross_limit_utilisation"] = float(gross.max() / portfolio.max_gross_notional)
+    return PortfolioResult(
+        symbols=per_symbol,
+        timeseries=ts,
+        inventory=pd.DataFrame(inventory.T, columns=symbols),
+        summary=summary,
+    )
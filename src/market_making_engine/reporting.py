@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
+from .intensity import IntensityFit, ProfileLikelihood
 
-from .intensity import IntensityFit
+if TYPE_CHECKING:
+    import pandas as pd
 
 
-def write_mle_report(path: str | Path, fit: IntensityFit, data: pd.DataFrame) -> Path:
+def _profile_section(profile: ProfileLikelihood, level: float) -> str:
+    lo, hi = profile.confidence_interval(level)
+    k0, k1 = float(profile.k[0]), float(profile.k[-1])
+    censored = [name for name, b, edge in (("lower", lo, k0), ("upper", hi, k1)) if b == edge]
+    note = f" ({' and '.join(censored)} bound clipped at the grid edge)" if censored else ""
+    return f"""
+## Profile likelihood
+- k grid: [{k0:.6g}, {k1:.6g}], {len(profile.k)} points
+- {level:.0%} likelihood-ratio interval for k: [{lo:.8f}, {hi:.8f}]{note}
+"""
+
+
+def write_mle_report(
+    path: str | Path,
+    fit: IntensityFit,
+    data: pd.DataFrame,
+    profile: ProfileLikelihood | None = None,
+    level: float = 0.95,
+) -> Path:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
+    profile_text = _profile_section(profile, level) if profile is not None else ""
 
     text = f"""# MLE Estimation Report
 
@@ -26,7 +47,7 @@ def write_mle_report(path: str | Path, fit: IntensityFit, data: pd.DataFrame) ->
 - Sample bins: {len(data)}
 - Total observed arrivals: {float(data['count'].sum()):.2f}
 - Total exposure: {float(data['exposure'].sum()):.2f}
-
+{profile_text}
 ## Data schema used
 Input table columns:
 - `delta` (float): quote distance from mid in price units
@@ -35,15 +56,29 @@ Input table columns:
 
 ## Notes
 - Estimation uses Poisson likelihood per bin.
-- Parameters are fitted by profile-likelihood grid search for robustness without external optimizers.
+- Parameters are fitted by profile likelihood in k with closed-form A(k), via grid search or a safeguarded Newton solve of the concave profile score, without external optimizers.
 """
     p.write_text(text)
     return p
 
 
-def write_backtest_summary(path: str | Path, summary: dict) -> Path:
+def write_backtest_summary(path: str | Path, summary: dict, markouts: pd.DataFrame | None = None) -> Path:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     lines = ["# Backtest Summary", ""] + [f"- {k}: {v}" for k, v in summary.items()]
+    if markouts is not None and len(markouts):
+        lines += [
+            "",
+            "## Markouts",
+            "",
+            "Adverse-selection cost per fill after each horizon (positive = mid moved against the fill).",
+            "",
+            "| horizon | side | fills | mean | std | total |",
+            "|---:|---|---:|---:|---:|---:|",
+        ]
+        lines += [
+            f"| {r.horizon} | {r.side} | {r.fills} | {r.mean:.6g} | {r.std:.6g} | {r.total:.6g} |"
+            for r in markouts.itertuples(index=False)
+        ]
     p.write_text("\n".join(lines) + "\n")
     return p
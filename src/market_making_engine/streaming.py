@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+import numpy as np
+
+from .backtest import QUOTING, TableStepper, _inventory_levels, table_state
+from .config import BacktestConfig, StrategyConfig
+from .fills import FILL_COLUMNS
+from .instrument import count, stage
+from .intensity import IntensityFit
+from .markout import MarkoutAccumulator, markout_block_rows, markout_curve, markout_matrix
+from .reporting import write_backtest_summary
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT = "stream_checkpoint.json"
+TIMESERIES = "backtest_timeseries.csv"
+FILLS = "fills.csv"
+
+
+@dataclass(slots=True)
+class StreamResult:
+    summary: dict
+    markouts: pd.DataFrame | None
+    outdir: Path
+
+
+def iter_mid_chunks(source, chunk_size: int = 1 << 16, mid_col: str = "mid") -> Iterator[np.ndarray]:
+    """Mid chunks from a CSV path (parsed ``chunk_size`` rows at a time), an array or memmap
+    (sliced), or any iterable of arrays/Series (passed through)."""
+    import pandas as pd
+
+    if isinstance(source, (str, Path)):
+        for df in pd.read_csv(source, usecols=[mid_col], chunksize=chunk_size):
+            yield df[mid_col].to_numpy(dtype=float)
+    elif isinstance(source, np.ndarray):
+        for lo in range(0, len(source), chunk_size):
+            yield np.asarray(source[lo : lo + chunk_size], dtype=float)
+    else:
+        for chunk in source:
+            yield np.asarray(chunk, dtype=float)
+
+
+def _skip(chunks: Iterable[np.ndarray], steps: int) -> Iterator[np.ndarray]:
+    for chunk in chunks:
+        if steps >= len(chunk):
+            steps -= len(chunk)
+            continue
+        yield chunk[steps:]
+        steps = 0
+
+
+class StreamingBacktest:
+    """Backtest over a mid series that arrives in chunks, with bounded memory.
+
+    Each chunk is simulated by the table-driven loop engine (:class:`TableStepper`); inventory,
+    cash, the RNG and the running totals carry over between chunks. Timeseries rows are appended
+    to ``backtest_timeseries.csv`` as soon as a chunk is done. A fill is written to ``fills.csv``
+    once the mids for its largest markout horizon have arrived; until then it waits with the last
+    ``max(horizon)`` mids. Markout sums are accumulated in the same fill blocks as
+    :func:`markout_table`. Memory therefore depends on the chunk size and the markout block, not
+    on the length of the series. Output files match an in-memory :func:`run_backtest` with the
+    same seed exactly; summary totals are accumulated per chunk, so they agree to rounding.
+
+    ``checkpoint()`` records the state and the output file offsets; a run constructed with
+    ``resume=True`` truncates the outputs back to the last checkpoint and continues from there.
+    """
+
+    def __init__(
+        self,
+        fit: IntensityFit,
+        strat: StrategyConfig,
+        cfg: BacktestConfig,
+        outdir: str | Path,
+        resume: bool = False,
+    ):
+        if strat.quoting not in QUOTING:
+            raise ValueError(f"Unknown quoting model: {strat.quoting}")
+        lattice = _inventory_levels(strat)
+        if lattice is None:
+            raise ValueError("Streaming backtests need inventory levels that are exact multiples of order_size")
+        self.levels, zero = lattice
+        self.strat = strat
+        self.cfg = cfg
+        self.outdir = Path(outdir)
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        self.stepper = TableStepper(fit, strat, cfg, self.levels, zero, strat.sigma)
+        self.fingerprint = json.loads(json.dumps({"fit": asdict(fit), "strat": asdict(strat), "cfg": asdict(cfg)}))
+
+        self.horizons = tuple(sorted(set(cfg.markout_horizons)))
+        self.max_horizon = max((cfg.markout_horizon, *self.horizons))
+        self.block_rows = markout_block_rows(self.horizons)
+        self.acc = MarkoutAccumulator(self.horizons) if self.horizons else None
+
+        self.cash = 0.0
+        self.prev: tuple[float, float] | None = None
+        self.totals = {"realized_spread": 0.0, "inventory_pnl": 0.0, "inv_mean": 0.0, "inv_m2": 0.0, "adverse": 0.0}
+        self.max_abs_inventory = 0.0
+        self.final_pnl = float("nan")
+        self.num_fills = 0
+        self.chunks = 0
+        self.peak_bytes = 0
+        self.resumed_from = 0
+        self._pending = {name: np.empty(0, dtype=d) for name, d in (("t", np.int64), ("side", np.int8), ("price", float), ("mid", float), ("delta", float))}
+        self._tail = np.empty(0)
+        self._block_cost: list[np.ndarray] = []
+        self._block_sign: list[np.ndarray] = []
+
+        offsets = {TIMESERIES: 0, FILLS: 0}
+        if resume and (self.outdir / CHECKPOINT).exists():
+            offsets = self._restore()
+        self._files = {}
+        for name, offset in offsets.items():
+            path = self.outdir / name
+            f = open(path, "r+b" if path.exists() else "w+b")
+            f.truncate(offset)
+            f.seek(offset)
+            self._files[name] = f
+
+    # -- simulation -------------------------------------------------------------
+    def feed(self, m: np.ndarray) -> None:
+        import pandas as pd
+
+        n = len(m)
+        if n == 0:
+            return
+        t0, j0 = self.stepper.t, self.stepper.j
+        with stage("backtest.simulate"):
+            t_fill, side, price, delta, steps = self.stepper.run(m)
+        count("steps", n)
+        count("fills", len(t_fill))
+        rel = t_fill - t0
+        inventory, cash, realized_spread, inventory_pnl = table_state(
+            m, self.levels, self.strat.order_size, rel, side, price, steps, j0, self.cash, self.prev
+        )
+        tot = self.totals
+        rs_cum = np.cumsum(np.concatenate([[tot["realized_spread"]], realized_spread]))[1:]
+        ipnl_cum = np.cumsum(np.concatenate([[tot["inventory_pnl"]], inventory_pnl]))[1:]
+        mtm = cash + inventory * m
+        ts = pd.DataFrame(
+            {
+                "t": np.arange(t0, t0 + n),
+                "mid": m,
+                "inventory": inventory,
+                "cash": cash,
+                "mtm_pnl": mtm,
+                "realized_spread": rs_cum,
+                "inventory_pnl": ipnl_cum,
+                "sigma": np.full(n, self.strat.sigma),
+            }
+        )
+        self._write(TIMESERIES, ts)
+
+        self.cash = float(cash[-1])
+        self.prev = (float(inventory[-1]), float(m[-1]))
+        tot["realized_spread"] = float(rs_cum[-1])
+        tot["inventory_pnl"] = float(ipnl_cum[-1])
+        # merge this chunk's (n, mean, M2) into the totals; no cancellation for large mean inventory
+        mean = float(np.mean(inventory))
+        d = mean - tot["inv_mean"]
+        tot["inv_mean"] += d * n / (t0 + n)
+        tot["inv_m2"] += float(np.sum((inventory - mean) ** 2)) + d * d * t0 * n / (t0 + n)
+        self.max_abs_inventory = max(self.max_abs_inventory, float(np.max(np.abs(inventory))))
+        self.final_pnl = float(mtm[-1])
+        self.chunks += 1
+
+        new = {"t": t_fill, "side": side, "price": price, "mid": m[rel], "delta": delta}
+        self._pending = {k: np.concatenate([self._pending[k], new[k]]) for k in self._pending}
+        window = np.concatenate([self._tail, m])
+        start = t0 + n - len(window)
+        end = t0 + n - 1
+        ready = int(np.searchsorted(self._pending["t"], end - self.max_horizon, side="right"))
+        self._resolve(ready, window, start)
+        self._tail = window[max(len(window) - self.max_horizon, 0) :] if self.max_horizon else window[:0]
+        self.peak_bytes = max(self.peak_bytes, self._buffer_bytes())
+
+    def _resolve(self, k: int, window: np.ndarray, start: int) -> None:
+        """Write the first ``k`` pending fills, whose markout mids are all inside ``window``."""
+        import pandas as pd
+
+        if k == 0:
+            return
+        p = {name: a[:k] for name, a in self._pending.items()}
+        self._pending = {name: a[k:] for name, a in self._pending.items()}
+        t = p["t"] - start
+        mark = markout_matrix(window, t, p["side"], p["mid"], (self.cfg.markout_horizon,))[:, 0]
+        self.totals["adverse"] += float(np.sum(mark))
+        frame = pd.DataFrame({**p, "adverse_selection_cost": mark})
+        frame["side"] = np.where(p["side"] > 0, "buy", "sell").astype(object)
+        self._write(FILLS, frame)
+        self.num_fills += k
+        if self.acc is None:
+            return
+        cost = markout_matrix(window, t, p["side"], p["mid"], self.horizons)
+        sign = p["side"].astype(float)
+        lo = 0
+        while lo < k:
+            take = min(self.block_rows - sum(len(c) for c in self._block_cost), k - lo)
+            self._block_cost.append(cost[lo : lo + take])
+            self._block_sign.append(sign[lo : lo + take])
+            lo += take
+            if sum(len(c) for c in self._block_cost) == self.block_rows:
+                self._flush_block()
+
+    def _flush_block(self) -> None:
+        if self._block_cost:
+            self.acc.add(np.concatenate(self._block_cost), np.concatenate(self._block_sign))
+        self._block_cost, self._block_sign = [], []
+
+    def _buffer_bytes(self) -> int:
+        return sum(a.nbytes for a in self._pending.values()) + self._tail.nbytes + sum(c.nbytes for c in self._block_cost)
+
+    def _write(self, name: str, frame: pd.DataFrame) -> None:
+        f = self._files[name]
+        f.write(frame.to_csv(index=False, header=f.tell() == 0).encode())
+
+    def finish(self) -> StreamResult:
+        """Resolve the remaining fills (markouts clipped at the last step) and write the reports."""
+        if self.chunks == 0 and self.stepper.t == 0:
+            raise ValueError("Streaming backtest received no mids")
+        self._resolve(len(self._pending["t"]), self._tail, self.stepper.t - len(self._tail))
+        for name, f in self._files.items():
+            if f.tell() == 0 and name == FILLS:
+                f.write((",".join(FILL_COLUMNS) + "\n").encode())
+            f.close()
+        markouts = None
+        if self.acc is not None:
+            self._flush_block()
+            markouts = self.acc.table()
+        tot = self.totals
+        summary = {
+            "final_pnl": self.final_pnl,
+            "max_abs_inventory": self.max_abs_inventory,
+            "inventory_mean": tot["inv_mean"],
+            "inventory_std": math.sqrt(tot["inv_m2"] / self.stepper.t),
+            "realized_spread_capture": tot["realized_spread"],
+            "inventory_pnl": tot["inventory_pnl"],
+            "adverse_selection_cost": tot["adverse"],
+            "num_fills": self.num_fills,
+            "fill_log_peak_bytes": self.peak_bytes,
+        }
+        if markouts is not None:
+            summary.update(markout_curve(markouts))
+            markouts.to_csv(self.outdir / "markouts.csv", index=False)
+        summary["steps"] = self.stepper.t
+        summary["resumed_from_step"] = self.resumed_from
+        write_backtest_summary(self.outdir / "backtest_summary.md", summary, markouts)
+        for path in self.outdir.glob("stream_checkpoint*"):
+            path.unlink()
+        return StreamResult(summary=summary, markouts=markouts, outdir=self.outdir)
+
+    # -- checkpoints ----------------------------------------------------------
+    def checkpoint(self) -> Path:
+        """Persist the state; the JSON is replaced last, so an interrupted checkpoint is ignored."""
+        for f in self._files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        t = self.stepper.t
+        arrays = self.outdir / f"stream_checkpoint_{t}.npz"
+        block = (np.concatenate(self._block_cost), np.concatenate(self._block_sign)) if self._block_cost else (np.empty((0, len(self.horizons))), np.empty(0))
+        acc = (self.acc.count, self.acc.s1, self.acc.s2) if self.acc is not None else (np.empty(0),) * 3
+        np.savez(
+            arrays,
+            **{f"pending_{k}": v for k, v in self._pending.items()},
+            tail=self._tail,
+            block_cost=block[0],
+            block_sign=block[1],
+            acc_count=acc[0],
+            acc_s1=acc[1],
+            acc_s2=acc[2],
+        )
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "config": self.fingerprint,
+            "t": t,
+            "j": self.stepper.j,
+            "rng": self.stepper.rng.bit_generator.state,
+            "cash": self.cash,
+            "prev": self.prev,
+            "totals": self.totals,
+            "max_abs_inventory": self.max_abs_inventory,
+            "final_pnl": self.final_pnl,
+            "num_fills": self.num_fills,
+            "chunks": self.chunks,
+            "peak_bytes": self.peak_bytes,
+            "offsets": {name: f.tell() for name, f in self._files.items()},
+            "arrays": arrays.name,
+        }
+        path = self.outdir / CHECKPOINT
+        tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps(state, indent=1))
+        os.replace(tmp, path)
+        for old in self.outdir.glob("stream_checkpoint_*.npz"):
+            if old != arrays:
+                old.unlink()
+        return path
+
+    def _restore(self) -> dict:
+        state = json.loads((self.outdir / CHECKPOINT).read_text())
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported streaming checkpoint version: {state.get('version')}")
+        if state["config"] != self.fingerprint:
+            raise ValueError("Checkpoint was written with a different fit/strategy/backtest config")
+        with np.load(self.outdir / state["arrays"]) as a:
+            self._pending = {k: a[f"pending_{k}"] for k in self._pending}
+            self._tail = a["tail"]
+            if len(a["block_sign"]):
+                self._block_cost, self._block_sign = [a["block_cost"]], [a["block_sign"]]
+            if self.acc is not None:
+                self.acc.count, self.acc.s1, self.acc.s2 = a["acc_count"], a["acc_s1"], a["acc_s2"]
+        self.stepper.t = state["t"]
+        self.stepper.j = state["j"]
+        self.stepper.rng.bit_generator.state = state["rng"]
+        self.cash = state["cash"]
+        self.prev = tuple(state["prev"]) if state["prev"] is not None else None
+        self.totals = state["totals"]
+        self.max_abs_inventory = state["max_abs_inventory"]
+        self.final_pnl = state["final_pnl"]
+        self.num_fills = state["num_fills"]
+        self.chunks = state["chunks"]
+        self.peak_bytes = state["peak_bytes"]
+        self.resumed_from = state["t"]
+        return state["offsets"]
+
+
+def run_streaming_backtest(
+    source,
+    fit: IntensityFit,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    outdir: str | Path,
+    chunk_size: int = 1 << 16,
+    mid_col: str = "mid",
+    checkpoint_every: int = 0,
+    resume: bool = False,
+) -> StreamResult:
+    """Run :class:`StreamingBacktest` over ``source`` (CSV path, array/memmap or chunk iterable).
+
+    With ``checkpoint_every`` > 0 the state is checkpointed every that many chunks. With
+    ``resume`` the run continues from the checkpoint in ``outdir``: the steps it already covered
+    are skipped from a fresh ``source``.
+    """
+    run = StreamingBacktest(fit, strat, cfg, outdir, resume=resume)
+    for chunk in _skip(iter_mid_chunks(source, chunk_size, mid_col), run.stepper.t):
+        run.feed(chunk)
+        if checkpoint_every > 0 and run.chunks % checkpoint_every == 0:
+            run.checkpoint()
+    return run.finish()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import run_backtest
+from .config import BacktestConfig, StrategyConfig
+from .intensity import IntensityFit
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_CASTS = {"float": float, "int": int, "str": str}
+STRATEGY_PARAMS = {f.name: _CASTS[f.type] for f in fields(StrategyConfig) if f.type in _CASTS}
+BACKTEST_PARAMS = {f.name: _CASTS[f.type] for f in fields(BacktestConfig) if f.type in _CASTS}
+FIT_PARAMS = {"model": str, "A": float, "k": float}
+SWEEP_PARAMS = {**STRATEGY_PARAMS, **BACKTEST_PARAMS, **FIT_PARAMS}
+
+
+def _check_params(names) -> None:
+    unknown = sorted(set(names) - set(SWEEP_PARAMS))
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {unknown}")
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    """Cartesian product of parameter values, e.g. {"gamma": [0.05, 0.1], "max_inventory": [5, 10]}."""
+    _check_params(grid)
+    ranges = [k for k, v in grid.items() if isinstance(v, tuple)]
+    if ranges:
+        raise ValueError(f"Ranges are only valid for random sampling: {ranges}")
+    keys = list(grid)
+    return [
+        {k: SWEEP_PARAMS[k](v) for k, v in zip(keys, values)}
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+
+
+def sample_grid(space: dict[str, list | tuple], n: int, seed: int = 0) -> list[dict]:
+    """Random sample of ``n`` configs; tuples are (lo, hi) uniform ranges, lists are choices."""
+    _check_params(space)
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        point = {}
+        for k, spec in space.items():
+            cast = SWEEP_PARAMS[k]
+            if isinstance(spec, tuple):
+                lo, hi = spec
+                if cast is int:
+                    point[k] = int(rng.integers(int(lo), int(hi) + 1))
+                else:
+                    point[k] = float(rng.uniform(lo, hi))
+            else:
+                point[k] = cast(spec[int(rng.integers(len(spec)))])
+        out.append(point)
+    return out
+
+
+def _split_params(params: dict, fit: IntensityFit, strat: StrategyConfig, cfg: BacktestConfig) -> tuple:
+    fit = replace(fit, **{k: v for k, v in params.items() if k in FIT_PARAMS})
+    strat = replace(strat, **{k: v for k, v in params.items() if k in STRATEGY_PARAMS})
+    cfg = replace(cfg, **{k: v for k, v in params.items() if k in BACKTEST_PARAMS})
+    return fit, strat, cfg
+
+
+def _run_one(mid: np.ndarray, params: dict, fit: IntensityFit, strat: StrategyConfig, cfg: BacktestConfig) -> dict:
+    fit, strat, cfg = _split_params(params, fit, strat, cfg)
+    t0 = time.perf_counter()
+    result = run_backtest(mid, fit, strat, cfg)
+    return {**params, **result.summary, "wall_time_s": time.perf_counter() - t0}
+
+
+# Per-worker view onto the shared mid series, set up once by the pool initializer.
+_worker_shm: shared_memory.SharedMemory | None = None
+_worker_mid: np.ndarray | None = None
+
+
+def _init_worker(name: str, n: int) -> None:
+    global _worker_shm, _worker_mid
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_mid = np.ndarray((n,), dtype=np.float64, buffer=_worker_shm.buf)
+
+
+def _run_shared(params: dict, fit: IntensityFit, strat: StrategyConfig, cfg: BacktestConfig) -> dict:
+    return _run_one(_worker_mid, params, fit, strat, cfg)
+
+
+def run_sweep(
+    mid: pd.Series | np.ndarray,
+    fit: IntensityFit,
+    configs: list[dict],
+    strat: StrategyConfig | None = None,
+    cfg: BacktestConfig | None = None,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Run one backtest per parameter dict and return one summary row per config.
+
+    Each dict overrides fields of ``strat``/``cfg``/``fit``. With ``workers > 1`` the runs are spread
+    over a process pool; the mid series is placed once in shared memory and workers attach to it
+    instead of receiving a pickled copy per task.
+    """
+    import pandas as pd
+
+    strat = strat or StrategyConfig()
+    cfg = cfg or BacktestConfig()
+    for params in configs:
+        _check_params(params)
+    m = np.ascontiguousarray(np.asarray(mid, dtype=np.float64))
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    if workers <= 1 or len(configs) <= 1:
+        rows = [_run_one(m, params, fit, strat, cfg) for params in configs]
+        return pd.DataFrame(rows)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(m.nbytes, 1))
+    try:
+        np.ndarray(m.shape, dtype=np.float64, buffer=shm.buf)[:] = m
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(configs)),
+            initializer=_init_worker,
+            initargs=(shm.name, len(m)),
+        ) as pool:
+            futures = [pool.submit(_run_shared, params, fit, strat, cfg) for params in configs]
+            rows = [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    return pd.DataFrame(rows)
+
+
+def parse_grid_spec(specs: list[str]) -> dict[str, list | tuple]:
+    """Parse CLI specs ``name=v1,v2,...`` (choices) or ``name=lo:hi`` (uniform range, sampling only)."""
+    space: dict[str, list | tuple] = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        name = name.strip().replace("-", "_")
+        if not sep or not values:
+            raise ValueError(f"Bad grid spec {spec!r}; expected name=v1,v2 or name=lo:hi")
+        _check_params([name])
+        cast = SWEEP_PARAMS[name]
+        if ":" in values:
+            lo, hi = values.split(":", 1)
+            space[name] = (cast(lo), cast(hi))
+        else:
+            space[name] = [cast(v) for v in values.split(",")]
+    return space
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RANGE_METHODS = ("parkinson", "garman_klass")
+_PARKINSON = 1.0 / (4.0 * math.log(2.0))
+_GK = 2.0 * math.log(2.0) - 1.0
+
+
+class _RingSum:
+    """Sums of ``x`` and ``w`` over the last ``window`` pushes, O(1) per push.
+
+    The running sums are rebuilt from the buffer once per ``window`` pushes, so add/subtract
+    rounding cannot build up over long runs.
+    """
+
+    __slots__ = ("window", "_x", "_w", "_i", "n", "sx", "sw")
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._x = [0.0] * window
+        self._w = [0.0] * window
+        self._i = 0
+        self.n = 0
+        self.sx = 0.0
+        self.sw = 0.0
+
+    def push(self, x: float, w: float) -> None:
+        i = self._i
+        self.sx += x - self._x[i]
+        self.sw += w - self._w[i]
+        self._x[i] = x
+        self._w[i] = w
+        self._i = i + 1
+        if self._i == self.window:
+            self._i = 0
+            self.sx = math.fsum(self._x)
+            self.sw = math.fsum(self._w)
+        self.n = min(self.n + 1, self.window)
+
+
+def _rolling_mean_rate(x: np.ndarray, window: int, dt: float) -> np.ndarray:
+    """``sum(x) / (count * dt)`` over the trailing ``window`` entries, for every prefix."""
+    c = np.concatenate([[0.0], np.cumsum(x)])
+    i = np.arange(1, len(x) + 1)
+    lo = np.maximum(i - window, 0)
+    return np.maximum(c[i] - c[lo], 0.0) / ((i - lo) * dt)
+
+
+def rolling_volatility(mid: np.ndarray, window: int, dt: float = 1.0, initial: float = math.nan) -> np.ndarray:
+    """Per-step realised volatility of mid increments over the last ``window`` steps.
+
+    ``sigma[t]`` uses increments up to and including ``mid[t]``; ``sigma[0]`` has none and is
+    ``initial``. Matches :class:`RollingVolatility` fed the same mids.
+    """
+    m = np.asarray(mid, dtype=float)
+    out = np.full(len(m), initial, dtype=float)
+    if len(m) > 1:
+        out[1:] = np.sqrt(_rolling_mean_rate(np.square(np.diff(m)), window, dt))
+    return out
+
+
+def ewma_alpha(half_life: float) -> float:
+    if half_life <= 0:
+        raise ValueError("half_life must be positive")
+    return 1.0 - 0.5 ** (1.0 / half_life)
+
+
+def _ewma(x: np.ndarray, alpha: float) -> np.ndarray:
+    """``y[0] = x[0]``, ``y[t] = (1 - alpha) y[t-1] + alpha x[t]`` (pandas ``ewm(adjust=False)``).
+
+    The series is cut into blocks of ``B`` steps with ``(1 - alpha)^-B <= 1e3``. Within a block the
+    recursion from a zero start is one scaled cumsum, done for all blocks at once, so only the
+    carry between blocks runs in Python.
+    """
+    n = len(x)
+    d = 1.0 - alpha
+    B = max(1, min(n, int(math.log(1e3) / -math.log(d)))) if 0.0 < d < 1.0 else 1
+    nb = -(-n // B)
+    X = np.zeros(nb * B)
+    X[:n] = x
+    X = X.reshape(nb, B)
+    p = d ** np.arange(B)
+    local = alpha * np.cumsum(X / p, axis=1) * p
+    carry = np.empty(nb)
+    prev, dB = float(x[0]), d**B  # y[-1] = x[0] reproduces y[0] = x[0]
+    for b, end in enumerate(local[:, -1].tolist()):
+        carry[b] = prev
+        prev = end + dB * prev
+    return (local + (d * p) * carry[:, None]).reshape(-1)[:n]
+
+
+def ewma_volatility(mid: np.ndarray, half_life: float, dt: float = 1.0, initial: float = math.nan) -> np.ndarray:
+    """Per-step EWMA volatility; squared increments lose half their weight every ``half_life`` steps."""
+    m = np.asarray(mid, dtype=float)
+    out = np.full(len(m), initial, dtype=float)
+    if len(m) > 1:
+        out[1:] = np.sqrt(_ewma(np.square(np.diff(m)) / dt, ewma_alpha(half_life)))
+    return out
+
+
+def _bar_variance(o, h, l, c, method: str):
+    """Per-bar variance of log returns from OHLC (works on floats and arrays)."""
+    if method == "parkinson":
+        return _PARKINSON * np.square(np.log(h / l))
+    if method == "garman_klass":
+        return np.maximum(0.5 * np.square(np.log(h / l)) - _GK * np.square(np.log(c / o)), 0.0)
+    raise ValueError(f"Unknown range estimator: {method}")
+
+
+def range_volatility(
+    bars: pd.DataFrame,
+    window: int,
+    method: str = "parkinson",
+    dt: float = 1.0,
+) -> np.ndarray:
+    """Per-bar volatility in price units from ``open/high/low/close`` columns (the kline frame).
+
+    Range estimators measure log-return variance; ``close * sqrt(var / dt)`` converts it to the
+    absolute-price sigma the A-S quotes use.
+    """
+    o, h, l, c = (bars[col].to_numpy(dtype=float) for col in ("open", "high", "low", "close"))
+    var = _rolling_mean_rate(_bar_variance(o, h, l, c, method), window, dt)
+    return c * np.sqrt(var)
+
+
+class RollingVolatility:
+    """Incremental :func:`rolling_volatility`: ``update(mid)`` returns the current sigma.
+
+    ``dt`` may be given per update for irregularly spaced mids; the estimate is then
+    ``sum(dm^2) / sum(dt)`` over the window.
+    """
+
+    __slots__ = ("dt", "value", "_ring", "_last")
+
+    def __init__(self, window: int, dt: float = 1.0, initial: float = math.nan):
+        self.dt = dt
+        self.value = initial
+        self._ring = _RingSum(window)
+        self._last = math.nan
+
+    def update(self, mid: float, dt: float | None = None) -> float:
+        last, self._last = self._last, mid
+        if last == last:
+            d = mid - last
+            self._ring.push(d * d, self.dt if dt is None else dt)
+            self.value = math.sqrt(max(self._ring.sx, 0.0) / self._ring.sw)
+        return self.value
+
+    def series(self, mid: np.ndarray) -> np.ndarray:
+        return rolling_volatility(mid, self._ring.window, self.dt, self.value)
+
+
+class EWMAVolatility:
+    """Incremental :func:`ewma_volatility`; the first increment seeds the variance."""
+
+    __slots__ = ("dt", "half_life", "alpha", "value", "_var", "_last")
+
+    def __init__(self, half_life: float, dt: float = 1.0, initial: float = math.nan):
+        self.dt = dt
+        self.half_life = half_life
+        self.alpha = ewma_alpha(half_life)
+        self.value = initial
+        self._var = math.nan
+        self._last = math.nan
+
+    def update(self, mid: float, dt: float | None = None) -> float:
+        last, self._last = self._last, mid
+        if last == last:
+            d = mid - last
+            x = d * d / (self.dt if dt is None else dt)
+            self._var = x if self._var != self._var else (1.0 - self.alpha) * self._var + self.alpha * x
+            self.value = math.sqrt(self._var)
+        return self.value
+
+    def series(self, mid: np.ndarray) -> np.ndarray:
+        return ewma_volatility(mid, self.half_life, self.dt, self.value)
+
+
+class RangeVolatility:
+    """Incremental :func:`range_volatility` over OHLC bars: ``update_bar(o, h, l, c)``."""
+
+    __slots__ = ("dt", "method", "value", "_ring")
+
+    def __init__(self, window: int, method: str = "parkinson", dt: float = 1.0, initial: float = math.nan):
+        if method not in RANGE_METHODS:
+            raise ValueError(f"Unknown range estimator: {method}")
+        self.dt = dt
+        self.method = method
+        self.value = initial
+        self._ring = _RingSum(window)
+
+    def update_bar(self, open_: float, high: float, low: float, close: float, dt: float | None = None) -> float:
+        self._ring.push(float(_bar_variance(open_, high, low, close, self.method)), self.dt if dt is None else dt)
+        self.value = close * math.sqrt(max(self._ring.sx, 0.0) / self._ring.sw)
+        return self.value
+
+
+def parse_estimator(spec: str, dt: float = 1.0, initial: float = math.nan):
+    """``rolling:N``, ``ewma:HALF_LIFE``, ``parkinson:N`` or ``garman_klass:N`` -> estimator."""
+    kind, sep, arg = spec.partition(":")
+    if not sep or not arg:
+        raise ValueError(f"Bad volatility estimator {spec!r}; expected kind:window")
+    if kind == "rolling":
+        return RollingVolatility(int(arg), dt=dt, initial=initial)
+    if kind == "ewma":
+        return EWMAVolatility(float(arg), dt=dt, initial=initial)
+    if kind in RANGE_METHODS:
+        return RangeVolatility(int(arg), method=kind, dt=dt, initial=initial)
+    raise ValueError(f"Unknown volatility estimator: {kind}")
+
+
+def sigma_series(estimator, frame: pd.DataFrame, mid_col: str = "mid") -> np.ndarray:
+    """Bulk sigma path for ``frame``: mids for rolling/EWMA, OHLC columns for range estimators.
+
+    The first steps, before an estimator has data, fall back to its ``initial`` value.
+    """
+    if isinstance(estimator, RangeVolatility):
+        missing = [c for c in ("open", "high", "low", "close") if c not in frame]
+        if missing:
+            raise ValueError(f"Range volatility needs OHLC columns; missing {missing}")
+        return range_volatility(frame, estimator._ring.window, estimator.method, estimator.dt)
+    return estimator.series(frame[mid_col].to_numpy(dtype=float))
+
+
+MidVolatility = RollingVolatility | EWMAVolatility
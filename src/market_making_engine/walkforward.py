@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .aggregator import IntensityBinAggregator, _seconds
+from .backtest import run_backtest
+from .cache import DataCache
+from .config import BacktestConfig, CalibrationConfig, StrategyConfig, WalkForwardConfig
+from .intensity import IntensityFit, fit_intensity
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(slots=True)
+class WalkForwardResult:
+    folds: pd.DataFrame  # one row per fold: windows, fitted (A, k), cache flag, backtest summary
+    timeseries: pd.DataFrame  # out-of-sample timeseries of all folds, stitched in time order
+    summary: dict
+
+
+def walk_forward_folds(t_start: float, t_end: float, wf: WalkForwardConfig) -> list[tuple[float, float, float, float]]:
+    """``(train_start, train_end, test_start, test_end)`` windows; test windows follow training."""
+    if wf.train_window <= 0 or wf.test_window <= 0:
+        raise ValueError("train_window and test_window must be positive")
+    step = wf.step if wf.step > 0 else wf.test_window
+    folds = []
+    s = t_start
+    while s + wf.train_window < t_end:
+        a, b = s, s + wf.train_window
+        folds.append((a, b, b, min(b + wf.test_window, t_end)))
+        s += step
+    return folds
+
+
+def _window_digest(events: pd.DataFrame) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for col in ("ts", "bid", "ask", "price"):
+        h.update(np.ascontiguousarray(events[col].to_numpy(dtype=float)).tobytes())
+    h.update((events["kind"].to_numpy() == "trade").tobytes())
+    return h.hexdigest()
+
+
+def _fit_key(digest: str, cal: CalibrationConfig, wf: WalkForwardConfig) -> str:
+    return DataCache.key_for_request(
+        kind="walkforward-fit", window=digest, **asdict(cal), delta_max=wf.delta_max, bins=wf.bins, side=wf.side
+    )
+
+
+def _calibrate(train: pd.DataFrame, cal: CalibrationConfig, wf: WalkForwardConfig) -> IntensityFit:
+    agg = IntensityBinAggregator(np.linspace(wf.delta_max / wf.bins, wf.delta_max, wf.bins))
+    agg.update(train)
+    kwargs = {"k_min": cal.k_min, "k_max": cal.k_max, "grid_points": cal.k_grid_points, "method": cal.method}
+    if cal.model == "power":
+        kwargs["delta0"] = cal.delta0
+    return fit_intensity(agg.to_frame(wf.side), model=cal.model, **kwargs)
+
+
+def _run_fold(
+    train: pd.DataFrame,
+    mid: np.ndarray,
+    fit: IntensityFit | None,
+    cal: CalibrationConfig,
+    wf: WalkForwardConfig,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+) -> tuple[IntensityFit, dict, pd.DataFrame]:
+    if fit is None:
+        fit = _calibrate(train, cal, wf)
+    result = run_backtest(mid, fit, strat, cfg)
+    return fit, result.summary, result.timeseries
+
+
+def _grid_mid(ts: np.ndarray, quote_ts: np.ndarray, quote_mid: np.ndarray, start: float, end: float, dt: float) -> tuple:
+    """Prevailing quote mid sampled every ``dt`` over [start, end); leading gaps are dropped."""
+    grid = start + dt * np.arange(max(int(np.ceil((end - start) / dt)), 0))
+    idx = np.searchsorted(quote_ts, grid, side="right") - 1
+    ok = idx >= 0
+    return grid[ok], quote_mid[idx[ok]]
+
+
+def run_walk_forward(
+    events: pd.DataFrame,
+    strat: StrategyConfig,
+    cfg: BacktestConfig,
+    cal: CalibrationConfig | None = None,
+    wf: WalkForwardConfig | None = None,
+    workers: int | None = None,
+    cache: DataCache | None = None,
+) -> WalkForwardResult:
+    """Rolling out-of-sample evaluation: fit on each training window, backtest the next test window.
+
+    ``events`` are time-ordered ``ts,kind(quote|trade),bid,ask,price`` rows (the ``aggregate``
+    input). Each fold bins its training events with :class:`IntensityBinAggregator`, fits the
+    intensity, and backtests the quote mid sampled every ``strat.dt`` over its test window, starting
+    flat. Folds are independent and run on a process pool. With a ``cache`` the fitted parameters
+    are stored under a hash of the training window's events and the calibration settings, so a
+    rerun only calibrates folds whose data or settings changed.
+    """
+    import pandas as pd
+
+    cal = cal or CalibrationConfig()
+    wf = wf or WalkForwardConfig()
+    cfg = replace(cfg, fill_log_dir="")  # folds run concurrently; keep their fills in memory
+    ev = events.copy()
+    ev["ts"] = _seconds(ev["ts"])
+    ts = ev["ts"].to_numpy()
+    if len(ts) == 0:
+        raise ValueError("No events")
+    if np.any(np.diff(ts) < 0):
+        raise ValueError("events must be time-ordered")
+    is_quote = (ev["kind"] == "quote").to_numpy()
+    quote_ts = ts[is_quote]
+    quote_mid = 0.5 * (ev["bid"].to_numpy(dtype=float)[is_quote] + ev["ask"].to_numpy(dtype=float)[is_quote])
+
+    tasks = []
+    for fold, (a, b, c, d) in enumerate(walk_forward_folds(float(ts[0]), float(ts[-1]), wf)):
+        grid, mid = _grid_mid(ts, quote_ts, quote_mid, c, d, strat.dt)
+        if len(mid) == 0:
+            continue
+        lo, hi = np.searchsorted(ts, [a, b])
+        train = ev.iloc[lo:hi]
+        key = _fit_key(_window_digest(train), cal, wf) if cache is not None else None
+        fit = None
+        if cache is not None and cache.contains(key):
+            row = cache.frame(key).iloc[0]
+            fit = IntensityFit(model=str(row["model"]), **{f: float(row[f]) for f in ("A", "k", "log_likelihood", "aic", "bic")})
+            cache.hits += 1
+        elif cache is not None:
+            cache.misses += 1
+        tasks.append({"fold": fold, "window": (a, b, c, d), "grid": grid, "mid": mid, "train": train, "fit": fit, "key": key})
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    # cached folds skip calibration, so their training events are not shipped to the workers
+    args = [(t["train"] if t["fit"] is None else t["train"].iloc[:0], t["mid"], t["fit"], cal, wf, strat, cfg) for t in tasks]
+    if workers <= 1 or len(tasks) <= 1:
+        outputs = [_run_fold(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            outputs = list(pool.map(_run_fold, *zip(*args)))
+
+    rows, frames = [], []
+    offset = 0.0
+    for task, (fit, summary, series) in zip(tasks, outputs):
+        cached = task["fit"] is not None
+        if cache is not None and not cached:
+            cache.put(task["key"], pd.DataFrame([asdict(fit)]), source="walkforward")
+        a, b, c, d = task["window"]
+        rows.append(
+            {
+                "fold": task["fold"],
+                "train_start": a,
+                "train_end": b,
+                "test_start": c,
+                "test_end": d,
+                "A": fit.A,
+                "k": fit.k,
+                "fit_cached": cached,
+                **summary,
+            }
+        )
+        series = series.assign(fold=task["fold"], ts=task["grid"])
+        series["stitched_pnl"] = series["mtm_pnl"] + offset
+        offset += summary["final_pnl"]
+        frames.append(series)
+
+    folds = pd.DataFrame(rows)
+    stitched = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    summary = {
+        "folds": len(folds),
+        "total_pnl": offset,
+        "fold_pnl_mean": float(folds["final_pnl"].mean()) if len(folds) else 0.0,
+        "fold_pnl_std": float(folds["final_pnl"].std(ddof=0)) if len(folds) else 0.0,
+        "positive_folds": int((folds["final_pnl"] > 0).sum()) if len(folds) else 0,
+        "num_fills": int(folds["num_fills"].sum()) if len(folds) else 0,
+        "fits_cached": int(folds["fit_cached"].sum()) if len(folds) else 0,
+    }
+    return WalkForwardResult(folds=folds, timeseries=stitched, summary=summary)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from market_making_engine.aggregator import IntensityBinAggregator, aggregate_events
+
+
+def _events(n: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    ts = np.cumsum(rng.exponential(0.5, size=n))
+    kind = np.where(rng.uniform(size=n) < 0.6, "quote", "trade")
+    mid = 100 + np.cumsum(rng.normal(0.0, 0.01, size=n))
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "kind": kind,
+            "bid": np.where(kind == "quote", mid - 0.01, np.nan),
+            "ask": np.where(kind == "quote", mid + 0.01, np.nan),
+            "price": np.where(kind == "trade", mid + rng.normal(0.0, 0.05, size=n), np.nan),
+        }
+    )
+
+
+def test_chunked_aggregation_matches_single_pass():
+    events = _events()
+    deltas = np.linspace(0.005, 0.1, 20)
+    whole = aggregate_events([events], deltas)
+    chunked = aggregate_events((events.iloc[i : i + 137] for i in range(0, len(events), 137)), deltas)
+
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert (np.diff(whole["count"]) <= 0).all()
+    assert whole["exposure"].iloc[0] > 0
+
+
+def test_single_trade_counts_all_bins_it_reaches():
+    agg = IntensityBinAggregator(np.array([0.01, 0.02, 0.03]))
+    agg.update(
+        pd.DataFrame(
+            {
+                "ts": [0.0, 1.0, 3.0],
+                "kind": ["quote", "trade", "trade"],
+                "bid": [99.99, np.nan, np.nan],
+                "ask": [100.01, np.nan, np.nan],
+                "price": [np.nan, 100.025, 99.99],
+            }
+        )
+    )
+    assert agg.counts("ask").tolist() == [1, 1, 0]
+    assert agg.counts("bid").tolist() == [1, 0, 0]
+    assert agg.exposure_time == 3.0
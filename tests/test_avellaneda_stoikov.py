@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from market_making_engine.avellaneda_stoikov import QuoteEngine, optimal_quote
+
+
+def test_quote_engine_matches_optimal_quote():
+    engine = QuoteEngine(gamma=0.1, sigma=0.02, k=8.0)
+    for mid, q, tau in [(100.0, 0.0, 300.0), (100.5, 3.0, 300.0), (99.0, -7.0, 12.0)]:
+        ref = optimal_quote(mid, q, 0.1, 0.02, tau, 8.0)
+        bid, ask = engine.quote(mid, q, tau)
+        assert bid == pytest.approx(ref.bid, rel=1e-14)
+        assert ask == pytest.approx(ref.ask, rel=1e-14)
+
+    engine.set_params(k=4.0)
+    ref = optimal_quote(100.0, 2.0, 0.1, 0.02, 12.0, 4.0)
+    assert engine.quote_full(100.0, 2.0, 12.0).half_spread == pytest.approx(ref.half_spread, rel=1e-14)
+
+    bids, asks = engine.quote_batch(np.array([100.0, 101.0]), np.array([2.0, -1.0]), 12.0)
+    assert bids[0] == pytest.approx(ref.bid, rel=1e-14)
+    assert asks[1] == pytest.approx(optimal_quote(101.0, -1.0, 0.1, 0.02, 12.0, 4.0).ask, rel=1e-14)
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import numpy as np
 import pandas as pd
 
@@ -12,3 +15,65 @@ def test_backtest_runs_and_has_summary():
     result = run_backtest(mid, fit, StrategyConfig(horizon_steps=50), BacktestConfig(seed=1))
     assert "final_pnl" in result.summary
     assert len(result.timeseries) == 50
+
+
+def test_vectorized_engine_matches_loop_exactly():
+    rng = np.random.default_rng(3)
+    mid = pd.Series(100 + np.cumsum(rng.normal(0.0, 0.05, size=997)))
+    for fit in (
+        IntensityFit(model="exponential", A=2.0, k=1.5, log_likelihood=0.0, aic=0.0, bic=0.0),
+        IntensityFit(model="power", A=0.3, k=0.8, log_likelihood=0.0, aic=0.0, bic=0.0),
+    ):
+        strat = StrategyConfig(gamma=0.05, sigma=0.1, horizon_steps=700, max_inventory=3, order_size=0.5)
+        loop = run_backtest(mid, fit, strat, BacktestConfig(seed=11))
+        vec = run_backtest(mid, fit, strat, BacktestConfig(seed=11, engine="vectorized"))
+        assert loop.summary["num_fills"] > 0
+        assert loop.summary == vec.summary
+        pd.testing.assert_frame_equal(loop.timeseries, vec.timeseries, check_exact=True)
+        pd.testing.assert_frame_equal(loop.fills, vec.fills, check_exact=True)
+
+
+def test_fill_tables_match_per_step_loop_and_are_reused(monkeypatch):
+    from market_making_engine import backtest
+
+    rng = np.random.default_rng(4)
+    mid = pd.Series(100 + np.cumsum(rng.normal(0.0, 0.05, size=5000)))
+    fit = IntensityFit(model="exponential", A=2.0, k=1.5, log_likelihood=0.0, aic=0.0, bic=0.0)
+    strat = StrategyConfig(gamma=0.05, sigma=0.1, horizon_steps=4500, max_inventory=3, order_size=0.5)
+    cache = backtest.LRUCache(1 << 26)
+    monkeypatch.setattr(backtest, "FILL_TABLES", cache)
+    tables = run_backtest(mid, fit, strat, BacktestConfig(seed=2))
+    assert cache.misses == 2 and len(cache) == 2  # tau steps 0..4500 span two blocks
+    run_backtest(mid, fit, strat, BacktestConfig(seed=3))
+    assert cache.hits == 2 and cache.misses == 2
+
+    monkeypatch.setattr(backtest, "_inventory_levels", lambda strat: None)  # forces the per-step loop
+    direct = run_backtest(mid, fit, strat, BacktestConfig(seed=2))
+    assert tables.summary["num_fills"] > 0
+    assert tables.summary == direct.summary
+    pd.testing.assert_frame_equal(tables.timeseries, direct.timeseries, check_exact=True)
+    pd.testing.assert_frame_equal(tables.fills, direct.fills, check_exact=True)
+
+
+def test_core_runs_on_plain_arrays_without_importing_pandas():
+    code = (
+        "import sys, numpy as np\n"
+        "import market_making_engine.cli, market_making_engine.live, market_making_engine.sweep\n"
+        "from market_making_engine.backtest import run_backtest\n"
+        "from market_making_engine.config import BacktestConfig, StrategyConfig\n"
+        "from market_making_engine.intensity import fit_intensity\n"
+        "d = np.linspace(0.01, 0.5, 20)\n"
+        "fit = fit_intensity({'delta': d, 'count': np.round(300 * np.exp(-8 * d)), 'exposure': np.full(20, 200.0)})\n"
+        "r = run_backtest(100 + np.cumsum(np.full(300, 0.01)), fit, StrategyConfig(), BacktestConfig(seed=1))\n"
+        "assert r.summary['num_fills'] > 0 and len(r.columns['mtm_pnl']) == 300\n"
+        "assert 'pandas' not in sys.modules, 'pandas imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    mid = 100 + np.cumsum(np.random.default_rng(2).normal(0.0, 0.05, size=400))
+    fit = IntensityFit(model="exponential", A=2.0, k=1.5, log_likelihood=0.0, aic=0.0, bic=0.0)
+    plain = run_backtest(mid, fit, StrategyConfig(), BacktestConfig(seed=4))
+    series = run_backtest(pd.Series(mid), fit, StrategyConfig(), BacktestConfig(seed=4))
+    assert plain.summary == series.summary
+    pd.testing.assert_frame_equal(plain.timeseries, series.timeseries, check_exact=True)
+    pd.testing.assert_frame_equal(plain.markouts, series.markouts, check_exact=True)
@@ -0,0 +1,30 @@
+import copy
+
+from market_making_engine.bench import benchmark_cases, compare_to_baseline, load_baseline, run_benchmarks, save_baseline
+
+
+def test_quick_suite_covers_hot_paths():
+    names = [c.name for c in benchmark_cases("quick")]
+    assert "backtest_loop_1000" in names and "backtest_vectorized_100000" in names
+    assert any(n.startswith("fit_power_grid") for n in names)
+    assert any(n.startswith("optimal_quote") for n in names)
+    assert any(n.startswith("load_csv") for n in names)
+    assert "startup_cli" in names and "worker_spawn" in names
+    assert [c.name for c in benchmark_cases("full", pattern="_10000000")] == ["backtest_vectorized_10000000"]
+
+
+def test_baseline_round_trip_and_regression_flag(tmp_path):
+    cases = [c for c in benchmark_cases("quick", pattern="fit_exponential_newton") if c.name == "fit_exponential_newton_b50"]
+    report = run_benchmarks(cases, repeat=1, min_time=0.0)
+    result = report["results"]["fit_exponential_newton_b50"]
+    assert result["throughput"] > 0 and result["peak_bytes"] > 0
+
+    path = save_baseline(report, tmp_path / "baseline.json")
+    baseline = load_baseline(path)
+    assert not compare_to_baseline(report, baseline)["regression"].any()
+
+    slower = copy.deepcopy(report)
+    slower["results"]["fit_exponential_newton_b50"]["throughput"] *= 0.5
+    table = compare_to_baseline(slower, baseline, threshold=0.2)
+    assert table["regression"].tolist() == [True]
+    assert table["speed_ratio"].iloc[0] == 0.5
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from market_making_engine.cache import DataCache, LRUCache
+
+
+def test_csv_is_cached_and_memory_mapped(tmp_path):
+    src = tmp_path / "mid.csv"
+    df = pd.DataFrame({"ts": ["2026-01-01T00:00:00Z", "2026-01-01T00:01:00Z"], "mid": [100.0, 100.5]})
+    df.to_csv(src, index=False)
+
+    cache = DataCache(tmp_path / "cache")
+    pd.testing.assert_frame_equal(cache.read_csv(src), pd.read_csv(src))
+    mid = DataCache(tmp_path / "cache").read_csv_column(src, "mid")
+    assert isinstance(mid, np.memmap)
+    assert mid.tolist() == [100.0, 100.5]
+    assert cache.stats() == {"cache_hits": 0, "cache_misses": 1}
+
+    df.assign(mid=[1.0, 2.0]).to_csv(src, index=False)
+    assert cache.read_csv_column(src, "mid").tolist() == [1.0, 2.0]
+    assert cache.misses == 2
+
+
+def test_request_entries_roundtrip_tz_aware_columns(tmp_path):
+    cache = DataCache(tmp_path)
+    klines = pd.DataFrame({"ts": pd.to_datetime([0, 60_000], unit="ms", utc=True), "close": [1.0, 2.0]})
+    key = DataCache.key_for_request(symbol="BTCUSDT", interval="1m", start_time="a", end_time="b")
+    cache.get_or_build(key, lambda: klines)
+    cache.get_or_build(key, lambda: klines)
+
+    pd.testing.assert_frame_equal(cache.frame(key), klines)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_cache_evicts_least_recently_used_beyond_budget():
+    cache = LRUCache(max_bytes=3 * 800)
+    build = lambda: (np.zeros(100),)
+    for key in ("a", "b", "c"):
+        cache.get_or_build(key, build)
+    cache.get_or_build("a", build)  # a becomes most recent
+    cache.get_or_build("d", build)  # evicts b
+    assert cache.evictions == 1 and cache.nbytes == 2400
+    cache.get_or_build("b", build)
+    assert cache.misses == 5 and cache.hits == 1
+    cache.get_or_build("big", lambda: (np.zeros(1000),))
+    assert "big" not in cache._entries and len(cache) == 3
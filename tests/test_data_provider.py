@@ -0,0 +1,79 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from market_making_engine.data_provider import PooledHttpClient, download_binance_klines, fetch_binance_klines
+
+MINUTE = 60_000
+
+
+class _StubBinance(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+    throttle_next = 0
+
+    def do_GET(self):
+        q = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        type(self).requests.append(q)
+        if type(self).throttle_next > 0:
+            type(self).throttle_next -= 1
+            self._send(429, b"{}", {"Retry-After": "0"})
+            return
+        start, end, limit = int(q.get("startTime", 0)), int(q.get("endTime", 10**13)), int(q["limit"])
+        first = -(-start // MINUTE) * MINUTE
+        last = min(end, first + (limit - 1) * MINUTE)
+        rows = [[t, "1.0", str(2.0 + t / MINUTE), "0.5", "1.5", "10", t + MINUTE - 1] for t in range(first, last + 1, MINUTE)]
+        self._send(200, json.dumps(rows).encode())
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubBinance)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/api/v3/klines"
+
+
+def test_paged_download_with_backoff_and_resume(tmp_path):
+    server, url = _serve()
+    try:
+        _StubBinance.requests, _StubBinance.throttle_next = [], 2
+        kwargs = dict(limit=100, workers=3, checkpoint_dir=tmp_path, base_url=url, client=PooledHttpClient(), backoff=0.0)
+        df = download_binance_klines("btcusdt", "1m", "2026-01-01T00:00:00Z", "2026-01-01T08:19:00Z", **kwargs)
+
+        assert len(df) == 500
+        assert df["ts"].is_monotonic_increasing and df["ts"].is_unique
+        assert list(df.columns) == ["ts", "open", "high", "low", "close", "volume", "mid"]
+        assert len(_StubBinance.requests) == 5 + 2
+
+        _StubBinance.requests = []
+        again = download_binance_klines("btcusdt", "1m", "2026-01-01T00:00:00Z", "2026-01-01T08:19:00Z", **kwargs)
+        assert _StubBinance.requests == []
+        pd.testing.assert_frame_equal(df, again)
+
+        # a shorter earlier run leaves a truncated last page; a later end_time must refetch it
+        short = tmp_path / "short"
+        kwargs["checkpoint_dir"] = short
+        head = download_binance_klines("btcusdt", "1m", "2026-01-01T00:00:00Z", "2026-01-01T07:49:00Z", **kwargs)
+        assert len(head) == 470
+        _StubBinance.requests = []
+        resumed = download_binance_klines("btcusdt", "1m", "2026-01-01T00:00:00Z", "2026-01-01T08:19:00Z", **kwargs)
+        assert len(_StubBinance.requests) == 1
+        pd.testing.assert_frame_equal(resumed, df)
+
+        single = fetch_binance_klines("btcusdt", "1m", "2026-01-01T00:00:00Z", limit=100, base_url=url)
+        pd.testing.assert_frame_equal(single, df.iloc[:100])
+    finally:
+        server.shutdown()
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.fills import BUY, SELL, FillLog
+from market_making_engine.intensity import IntensityFit
+
+
+def test_fill_log_grows_and_labels_sides():
+    log = FillLog(capacity=2)
+    for t in range(5):
+        log.append(t, BUY if t % 2 == 0 else SELL, 100.0 + t, 100.5, 0.5)
+    df = log.to_frame()
+    assert len(log) == 5
+    assert df["side"].tolist() == ["buy", "sell", "buy", "sell", "buy"]
+    assert log.column("side").dtype == np.int8
+    assert log.peak_bytes == log.nbytes == 8 * (8 + 1 + 8 + 8 + 8)
+
+
+def test_streamed_fill_log_matches_in_memory(tmp_path):
+    mid = pd.Series(100 + np.cumsum(np.random.default_rng(3).normal(0.0, 0.01, size=3000)))
+    fit = IntensityFit(model="exponential", A=1.5, k=6.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    strat = StrategyConfig(horizon_steps=3000, max_inventory=5)
+    mem = run_backtest(mid, fit, strat, BacktestConfig(seed=2))
+    disk = run_backtest(mid, fit, strat, BacktestConfig(seed=2, fill_log_dir=str(tmp_path / "fills"), fill_chunk_rows=64))
+
+    pd.testing.assert_frame_equal(mem.fills, disk.fills)
+    assert disk.summary["fill_log_peak_bytes"] <= 64 * 33 < mem.summary["fill_log_peak_bytes"]
+    reopened = FillLog.load(tmp_path / "fills")
+    pd.testing.assert_frame_equal(reopened.to_frame(), mem.fills)
+
+    disk.fill_log.to_csv(tmp_path / "fills.csv")
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "fills.csv"), mem.fills, check_dtype=False)
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine import glft
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+
+FIT = IntensityFit(model="exponential", A=2.0, k=1.5, log_likelihood=0.0, aic=0.0, bic=0.0)
+STRAT = StrategyConfig(gamma=0.05, sigma=0.1, horizon_steps=400, max_inventory=3, order_size=0.5, quoting="glft")
+
+
+def test_offsets_match_direct_integration():
+    A, k, g, s, v, N = 2.0, 1.5, 0.05, 0.1, 0.5, 6
+    bid, ask = glft.solve_quote_offsets(A, k, g, s, v, N, 1.0, np.array([0, 7, 40]))
+    n = np.arange(-N, N + 1.0)
+    eta = A * (1 + g * v / k) ** -(1 + k / (g * v))
+    M = np.diag(0.5 * k * g * s * s * v * n * n) - eta * (np.eye(len(n), k=1) + np.eye(len(n), k=-1))
+    # exp(-M h) by a Taylor series, then stepped to each tau
+    h = 0.05
+    step = sum(np.linalg.matrix_power(-M * h, i) / math.factorial(i) for i in range(12))
+    x = np.ones(len(n))
+    for i in range(1, 801):
+        x = step @ x
+        if i in (140, 800):
+            row = 1 if i == 140 else 2
+            ref = np.log(x[:-1] / x[1:]) / k + math.log1p(g * v / k) / (g * v)
+            np.testing.assert_allclose(bid[row, :-1], ref, rtol=1e-10)
+
+    assert np.all(bid[0, :-1] == pytest.approx(math.log1p(g * v / k) / (g * v)))
+    assert np.isinf(bid[:, -1]).all() and np.isinf(ask[:, 0]).all()
+    np.testing.assert_allclose(bid[:, ::-1][:, 1:], ask[:, 1:])  # bid at q mirrors ask at -q
+    assert np.all(np.diff(bid[2, :-1]) > 0)  # longer inventory -> lower bid
+
+
+def test_quote_table_is_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(glft, "QUOTE_TABLES", glft.LRUCache())
+    first = glft.quote_table(FIT, STRAT, cache_dir=tmp_path)
+    monkeypatch.setattr(glft, "QUOTE_TABLES", glft.LRUCache())
+    cache = glft.DataCache(tmp_path)
+    monkeypatch.setattr(glft, "DataCache", lambda root: cache)
+    second = glft.quote_table(FIT, STRAT, cache_dir=tmp_path)
+    assert cache.hits == 1 and cache.misses == 0
+    np.testing.assert_array_equal(first.bid, second.bid)
+    assert first.quote(100.0, 1.0, 12.0) == (100.0 - first.bid[12, 8], 100.0 + first.ask[12, 8])
+
+    with pytest.raises(ValueError):
+        glft.quote_table(IntensityFit("power", 1.0, 0.5, 0.0, 0.0, 0.0), STRAT)
+
+
+def test_backtest_quotes_from_table():
+    mid = pd.Series(100 + np.cumsum(np.random.default_rng(1).normal(0.0, 0.05, size=600)))
+    result = run_backtest(mid, FIT, STRAT, BacktestConfig(seed=3))
+    table = glft.quote_table(FIT, STRAT)
+    fills = result.fills
+    assert len(fills) > 50
+    before = np.concatenate([[0.0], result.timeseries["inventory"].to_numpy()])[fills["t"].to_numpy()]
+    for f, q in zip(fills.itertuples(), before):
+        row = min(max(STRAT.horizon_steps - f.t, 0), len(table.bid) - 1)
+        j = int(round(q / STRAT.order_size)) + 6
+        expected = table.bid[row, j] if f.side == "buy" else table.ask[row, j]
+        assert f.delta == max(expected, 0.0)
+    assert result.summary["max_abs_inventory"] <= STRAT.max_inventory
+    vec = run_backtest(mid, FIT, STRAT, BacktestConfig(seed=3, engine="vectorized"))
+    assert vec.summary == result.summary
+
+
+def test_long_horizon_table_stops_at_stationary_offsets(monkeypatch):
+    monkeypatch.setattr(glft, "QUOTE_TABLES", glft.LRUCache())
+    strat = StrategyConfig(gamma=0.05, sigma=0.1, horizon_steps=10**7, max_inventory=3, order_size=0.5, quoting="glft")
+    table = glft.quote_table(FIT, strat)
+    assert len(table.bid) < 20 * glft.QUOTE_TABLE_ROWS
+    rows = np.array([0, 1000, len(table.bid) - 1, len(table.bid), 10**7])
+    bid, ask = glft.solve_quote_offsets(FIT.A, FIT.k, 0.05, 0.1, 0.5, 6, strat.dt, rows)
+    np.testing.assert_allclose(table.bid[np.minimum(rows, len(table.bid) - 1)], bid, rtol=1e-11)
+    np.testing.assert_allclose(table.ask[np.minimum(rows, len(table.bid) - 1)], ask, rtol=1e-11)
+    assert table.quote(100.0, 0.5, 5e6 * strat.dt) == table.quote(100.0, 0.5, (len(table.bid) - 1) * strat.dt)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from market_making_engine import instrument
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.instrument import REGISTRY, count, stage
+from market_making_engine.intensity import IntensityFit
+
+FIT = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+
+
+def _mid(n=500):
+    rng = np.random.default_rng(3)
+    return pd.Series(100.0 + np.cumsum(rng.normal(0.0, 0.002, size=n)))
+
+
+def test_disabled_registry_records_nothing():
+    instrument.disable()
+    REGISTRY.reset()
+    with stage("x") as s:
+        count("y")
+    assert s is None
+    assert stage("a") is stage("b")
+    assert REGISTRY.timings == {} and REGISTRY.counters == {}
+
+
+def test_profiled_backtest_records_stages_and_rates(tmp_path):
+    instrument.enable()
+    try:
+        with stage("cmd.backtest"):
+            result = run_backtest(_mid(), FIT, StrategyConfig(horizon_steps=500), BacktestConfig(seed=1))
+    finally:
+        instrument.disable()
+    assert REGISTRY.counters["steps"] == 500
+    assert REGISTRY.counters["fills"] == result.summary["num_fills"]
+    assert {"cmd.backtest", "backtest.simulate", "backtest.summarize"} <= set(REGISTRY.timings)
+    table = instrument.stage_table("cmd.backtest")
+    assert table["share"].iloc[0] == 1.0
+    assert instrument.derived_rates()["steps_per_s"] > 0
+
+    path = instrument.write_profile(tmp_path, total_stage="cmd.backtest")
+    assert "backtest.simulate" in path.read_text()
+    assert (tmp_path / "profile.json").exists()
@@ -1,6 +1,10 @@
+import math
+
+import numpy as np
 import pandas as pd
+import pytest
 
-from market_making_engine.intensity import fit_exponential_mle
+from market_making_engine.intensity import fit_exponential_mle, fit_intensity_with_profile, fit_power_mle
 
 
 def test_exponential_fit_returns_positive_params():
@@ -14,3 +18,89 @@ def test_exponential_fit_returns_positive_params():
     fit = fit_exponential_mle(df, k_min=0.01, k_max=20.0, grid_points=200)
     assert fit.A > 0
     assert fit.k > 0
+
+
+def test_newton_solver_matches_fine_grid():
+    rng = np.random.default_rng(0)
+    delta = np.linspace(0.01, 0.5, 40)
+    exposure = np.full_like(delta, 200.0)
+    df = pd.DataFrame({"delta": delta, "count": rng.poisson(1.2 * np.exp(-8.0 * delta) * exposure), "exposure": exposure})
+
+    for fit_fn in (fit_exponential_mle, fit_power_mle):
+        grid = fit_fn(df, grid_points=20000)
+        newton = fit_fn(df, method="newton")
+        assert newton.k == pytest.approx(grid.k, abs=1e-3)
+        assert newton.A == pytest.approx(grid.A, rel=1e-3)
+        assert newton.log_likelihood >= grid.log_likelihood - 1e-9
+
+
+def test_profile_curve_gives_fit_and_lr_interval():
+    rng = np.random.default_rng(1)
+    delta = np.linspace(0.01, 0.5, 40)
+    exposure = np.full_like(delta, 200.0)
+    df = pd.DataFrame({"delta": delta, "count": rng.poisson(1.2 * np.exp(-8.0 * delta) * exposure), "exposure": exposure})
+
+    fit, profile = fit_intensity_with_profile(df, model="exponential", grid_points=5000)
+    assert len(profile.k) == 5000
+    assert fit == fit_exponential_mle(df, grid_points=5000)
+    lo, hi = profile.confidence_interval(0.95)
+    assert lo < fit.k < hi
+    assert profile.k[0] < lo and hi < profile.k[-1]
+
+
+def test_newton_profile_skips_the_grid_scan(monkeypatch):
+    from market_making_engine import intensity
+
+    rng = np.random.default_rng(1)
+    delta = np.linspace(0.01, 0.5, 40)
+    exposure = np.full_like(delta, 200.0)
+    df = pd.DataFrame({"delta": delta, "count": rng.poisson(1.2 * np.exp(-8.0 * delta) * exposure), "exposure": exposure})
+    _, grid = fit_intensity_with_profile(df, model="exponential", grid_points=5000)
+
+    sizes = []
+    inner = intensity.profile_likelihood
+
+    def counting(df, model, k_grid, **kwargs):
+        sizes.append(len(k_grid))
+        return inner(df, model, k_grid, **kwargs)
+
+    monkeypatch.setattr(intensity, "profile_likelihood", counting)
+    fit, profile = intensity.fit_intensity_with_profile(df, model="exponential", grid_points=5000, method="newton")
+    assert max(sizes) <= intensity.BRACKET_POINTS + 1
+    assert fit.k == pytest.approx(fit_exponential_mle(df, method="newton").k)
+    np.testing.assert_allclose(profile.confidence_interval(0.95), grid.confidence_interval(0.95), rtol=1e-3)
+
+
+def test_batch_fit_matches_per_group_fits_and_compares_models():
+    from market_making_engine.intensity import _log_factorial, fit_intensity, fit_intensity_batch
+
+    rng = np.random.default_rng(2)
+    delta = np.linspace(0.01, 0.5, 40)
+    exposure = np.full_like(delta, 200.0)
+    frames = []
+    for sym in ("A", "B"):
+        for hour in range(3):
+            k = rng.uniform(3.0, 12.0)
+            counts = rng.poisson(1.2 * np.exp(-k * delta) * exposure)
+            frames.append(pd.DataFrame({"symbol": sym, "hour": hour, "delta": delta, "count": counts, "exposure": exposure}))
+    df = pd.concat(frames)
+    df = df[~((df["hour"] == 1) & (df["delta"] > 0.3))]  # ragged groups
+
+    for method in ("grid", "newton"):
+        table = fit_intensity_batch(df, ["symbol", "hour"], method=method, grid_points=500)
+        assert len(table) == 6
+        for row, (_, g) in zip(table.itertuples(), df.groupby(["symbol", "hour"])):
+            for model in ("exponential", "power"):
+                ref = fit_intensity(g, model, method=method, grid_points=500)
+                assert getattr(row, f"{model}_k") == pytest.approx(ref.k, rel=1e-9)
+                assert getattr(row, f"{model}_A") == pytest.approx(ref.A, rel=1e-9)
+                assert getattr(row, f"{model}_aic") == pytest.approx(ref.aic, rel=1e-9)
+            assert row.aic == min(row.exponential_aic, row.power_aic)
+    assert set(table["model"]) == {"exponential"}
+    assert list(fit_intensity_batch(df, "symbol", grid_points=50)["symbol"]) == ["A", "B"]
+
+    counts = np.concatenate([np.arange(300.0), [0.5, 7.25, 1e6]])
+    np.testing.assert_allclose(_log_factorial(counts), [math.lgamma(c + 1.0) for c in counts], rtol=1e-12, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        fit_intensity_batch(df, "venue")
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import _inventory_levels, _spread_term
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.kline import run_kline_backtest, scan_levels
+
+FIT = IntensityFit(model="exponential", A=2.0, k=20.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+STRAT = StrategyConfig(gamma=0.1, sigma=0.05, horizon_steps=1500, max_inventory=3, order_size=1.0)
+CFG = BacktestConfig(markout_horizons=(1, 5))
+
+
+def _bars(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0.0, 0.05, size=n))
+    o = np.concatenate([[100.0], c[:-1]])
+    h = np.maximum(o, c) + np.abs(rng.normal(0.0, 0.03, size=n))
+    l = np.minimum(o, c) - np.abs(rng.normal(0.0, 0.03, size=n))
+    return pd.DataFrame({"open": o, "high": h, "low": l, "close": c, "volume": rng.exponential(5.0, size=n)})
+
+
+def test_fills_follow_the_bar_range():
+    half = _spread_term(STRAT.gamma, FIT)  # at tau = 0 the A-S quotes are mid +- this
+    strat = StrategyConfig(gamma=0.1, sigma=0.05, horizon_steps=0, max_inventory=1, order_size=1.0)
+    bars = pd.DataFrame(
+        {
+            "open": [100.0, 100.0, 100.0, 100.0],
+            "high": [100.0, 100.0 + half, 100.0 + 2 * half, 100.0],
+            "low": [100.0 - half, 100.0, 100.0 - 2 * half, 100.0],
+            "close": [100.0, 100.0, 100.0, 101.0],
+        }
+    )
+    result = run_kline_backtest(bars, FIT, strat, CFG)
+    fills = result.fills
+    assert list(zip(fills["t"], fills["side"])) == [(0, "buy"), (1, "sell"), (2, "buy"), (2, "sell")]
+    assert list(result.timeseries["inventory"]) == [1.0, 0.0, 0.0, 0.0]
+    assert result.summary["realized_spread_capture"] == pytest.approx(4 * half)
+
+
+def test_matches_a_bar_by_bar_loop():
+    bars = _bars()
+    result = run_kline_backtest(bars, FIT, STRAT, CFG, max_participation=0.5, chunk_bars=97)
+    levels, j = _inventory_levels(STRAT)
+    g, s = STRAT.gamma, STRAT.sigma
+    inventory, fills = [], 0
+    for t, bar in enumerate(bars.itertuples()):
+        tau = (STRAT.horizon_steps - t if t < STRAT.horizon_steps else 0) * STRAT.dt
+        q_risk = levels[j] * g * s * s * tau
+        half = _spread_term(g, FIT) + 0.5 * g * s * s * tau
+        ok = STRAT.order_size <= 0.5 * bar.volume
+        buy = ok and bar.low <= bar.open - (q_risk + half) and j < len(levels) - 1
+        sell = ok and bar.high >= bar.open + (half - q_risk) and j > 0
+        j += int(buy) - int(sell)
+        fills += int(buy) + int(sell)
+        inventory.append(levels[j])
+    np.testing.assert_array_equal(result.timeseries["inventory"].to_numpy(), inventory)
+    assert result.summary["num_fills"] == fills > 100
+    assert result.summary["volume_blocked_fills"] > 0
+    ts = result.timeseries
+    np.testing.assert_allclose(ts["mtm_pnl"], ts["realized_spread"] + ts["inventory_pnl"], atol=1e-9)
+
+    whole = run_kline_backtest(bars, FIT, STRAT, BacktestConfig(markout_horizons=(1, 5), seed=99), max_participation=0.5)
+    assert whole.summary == result.summary
+
+
+def test_scan_levels_and_errors():
+    rng = np.random.default_rng(3)
+    nxt = rng.integers(0, 5, size=(103, 5))
+    j, ref = 2, []
+    for row in nxt:
+        ref.append(j)
+        j = row[j]
+    np.testing.assert_array_equal(scan_levels(nxt, 2), ref)
+
+    with pytest.raises(ValueError, match="volume"):
+        run_kline_backtest(_bars().drop(columns="volume"), FIT, STRAT, CFG, max_participation=0.1)
+    with pytest.raises(ValueError, match="steps"):
+        run_kline_backtest(_bars(), FIT, STRAT, CFG, sigma=np.ones(3))
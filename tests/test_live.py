@@ -0,0 +1,43 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.live import QuoteLoop, ReplayFeed, run_replay
+
+FIT = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+
+
+def test_replay_without_drops_tracks_backtest_inventory():
+    mid = 100 + np.cumsum(np.random.default_rng(0).normal(0.0, 0.01, size=300))
+    df = pd.DataFrame({"ts": np.arange(300.0), "mid": mid})
+    strat = StrategyConfig(horizon_steps=300, max_inventory=5)
+
+    quotes = []
+    stats = run_replay(df, FIT, strat, seed=3, sink=quotes.append)
+    expected = run_backtest(df["mid"], FIT, strat, BacktestConfig(seed=3))
+
+    assert stats.dropped == 0
+    assert stats.processed == len(quotes) == 300
+    assert stats.fills == expected.summary["num_fills"]
+    assert stats.inventory == expected.timeseries["inventory"].iloc[-1]
+    assert stats.latency.count == 300
+
+
+def test_bursts_are_coalesced():
+    class Burst:
+        async def stream(self):
+            feed = ReplayFeed(np.arange(1000.0), np.full(1000, 100.0))
+            async for u in feed.stream():
+                yield u
+
+    async def slow_sink(update):
+        await asyncio.sleep(0.001)
+
+    loop = QuoteLoop(Burst(), FIT, StrategyConfig(), sink=slow_sink)
+    stats = asyncio.run(loop.run())
+    assert stats.dropped > 0
+    assert stats.processed + stats.dropped == stats.received == 1000
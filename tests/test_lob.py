@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, LOBConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.lob import BOOK, EVENT_DTYPE, TRADE, run_lob_backtest, synthetic_lob_events
+
+# huge k and no horizon: quotes sit one hair inside mid, so they round onto the touch
+TIGHT = IntensityFit(model="exponential", A=1.0, k=1e9, log_likelihood=0.0, aic=0.0, bic=0.0)
+STRAT = StrategyConfig(horizon_steps=0, max_inventory=5)
+
+
+def _events(rows):
+    return np.array(rows, dtype=EVENT_DTYPE)
+
+
+def test_queue_ahead_is_consumed_before_partial_fill():
+    ev = _events(
+        [
+            (0.0, BOOK, 1, 100, 5.0),
+            (0.0, BOOK, -1, 102, 5.0),
+            (1.0, TRADE, -1, 100, 3.0),  # 5 ahead -> 2 ahead, no fill
+            (1.0, BOOK, 1, 100, 2.0),  # decrease explained by the trade: not a cancel
+            (2.0, TRADE, -1, 100, 2.5),  # eats the last 2 ahead, fills 0.5 of our 1.0
+        ]
+    )
+    res = run_lob_backtest(ev, TIGHT, STRAT, BacktestConfig(), LOBConfig(tick_size=0.01))
+    assert len(res.fills) == 1
+    fill = res.fills.iloc[0]
+    assert fill["side"] == "buy"
+    assert fill["size"] == pytest.approx(0.5)
+    assert fill["price"] == pytest.approx(1.00)
+    assert res.summary["partial_fills"] == 1
+    assert res.timeseries["inventory"].iloc[-1] == pytest.approx(0.5)
+
+
+def test_entry_latency_delays_joining_the_queue():
+    ev = _events(
+        [
+            (0.0, BOOK, 1, 100, 5.0),
+            (0.0, BOOK, -1, 102, 5.0),
+            (0.5, TRADE, -1, 100, 10.0),
+            (2.0, TRADE, -1, 100, 10.0),
+        ]
+    )
+    fast = run_lob_backtest(ev, TIGHT, STRAT, BacktestConfig(), LOBConfig())
+    slow = run_lob_backtest(ev, TIGHT, STRAT, BacktestConfig(), LOBConfig(entry_latency=1.0))
+    assert fast.fills["ts"].tolist() == [0.5, 2.0]
+    assert slow.fills["ts"].tolist() == [2.0]
+
+
+def test_synthetic_replay_matches_backtest_schema_and_is_chunk_invariant():
+    ev = synthetic_lob_events(3000, seed=4)
+    fit = IntensityFit(model="exponential", A=1.0, k=300.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    strat = StrategyConfig(sigma=0.01, horizon_steps=100, dt=1.0, max_inventory=5)
+    lob = LOBConfig(entry_latency=0.05, cancel_latency=0.05)
+    res = run_lob_backtest(ev, fit, strat, BacktestConfig(), lob)
+    small = run_lob_backtest(ev, fit, strat, BacktestConfig(), LOBConfig(entry_latency=0.05, cancel_latency=0.05, chunk_size=97))
+
+    ref = run_backtest(res.timeseries["mid"], fit, strat, BacktestConfig())
+    assert list(res.timeseries.columns) == list(ref.timeseries.columns)
+    assert set(ref.summary) <= set(res.summary)
+    assert res.summary["num_fills"] > 0
+    assert res.summary["max_abs_inventory"] <= strat.max_inventory
+    assert res.summary == small.summary
+
+
+def test_requote_during_cancel_latency_shares_the_trade():
+    ev = _events(
+        [
+            (0.0, BOOK, 1, 100, 5.0),
+            (0.0, BOOK, -1, 102, 5.0),
+            (0.1, BOOK, 1, 101, 1.0),  # touch moves up: our bid at 100 is cancelled, cancel in flight
+            (0.2, BOOK, 1, 101, 0.0),  # touch moves back: a second bid joins at 100
+            (0.3, TRADE, -1, 100, 6.0),  # sweeps our 101 bid, then the 5 ahead of both bids at 100
+        ]
+    )
+    res = run_lob_backtest(ev, TIGHT, STRAT, BacktestConfig(), LOBConfig(cancel_latency=1.0))
+    assert res.fills["price"].tolist() == [pytest.approx(1.01)]
+    assert res.fills["size"].sum() == pytest.approx(1.0)
+    assert res.timeseries["inventory"].iloc[-1] == pytest.approx(1.0)
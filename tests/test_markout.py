@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.markout import markout_table
+
+
+def test_markout_table_matches_per_fill_loop_and_is_block_invariant():
+    rng = np.random.default_rng(0)
+    mid = 100 + np.cumsum(rng.normal(0.0, 0.01, size=500))
+    t = rng.integers(0, 500, size=2000)
+    side = rng.choice(["buy", "sell"], size=2000)
+    fill_mid = mid[t]
+    horizons = (1, 5, 30, 300)
+
+    table = markout_table(mid, t, side, fill_mid, horizons)
+    blocked = markout_table(mid, t, side, fill_mid, horizons, max_elements=37)
+    pd.testing.assert_frame_equal(table, blocked, check_exact=False, rtol=1e-9)
+
+    for h in horizons:
+        cost = [(1.0 if s == "buy" else -1.0) * (fm - mid[min(tt + h, 499)]) for tt, s, fm in zip(t, side, fill_mid)]
+        cost = np.array(cost)
+        for label, mask in (("all", np.ones(len(cost), bool)), ("buy", side == "buy"), ("sell", side == "sell")):
+            row = table[(table["horizon"] == h) & (table["side"] == label)].iloc[0]
+            assert row["fills"] == mask.sum()
+            assert row["mean"] == pytest.approx(cost[mask].mean())
+            assert row["std"] == pytest.approx(cost[mask].std(), rel=1e-6)
+
+
+def test_backtest_summary_carries_markout_curve():
+    mid = pd.Series(100 + np.cumsum(np.random.default_rng(1).normal(0.0, 0.01, size=400)))
+    fit = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    res = run_backtest(mid, fit, StrategyConfig(horizon_steps=400), BacktestConfig(markout_horizons=(1, 5, 30)))
+    assert [k for k in res.summary if k.startswith("markout_")] == ["markout_1", "markout_5", "markout_30"]
+    five = res.markouts[(res.markouts["horizon"] == 5) & (res.markouts["side"] == "all")].iloc[0]
+    assert five["total"] == pytest.approx(res.summary["adverse_selection_cost"])
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.montecarlo import run_monte_carlo
+
+
+def test_single_path_reproduces_backtest():
+    mid = pd.Series(100 + np.cumsum(np.random.default_rng(2).normal(0.0, 0.01, size=400)))
+    fit = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    strat = StrategyConfig(horizon_steps=400, max_inventory=4)
+    single = run_backtest(mid, fit, strat, BacktestConfig(seed=5))
+    mc = run_monte_carlo(fit, strat, BacktestConfig(seed=5), n_paths=1, mid=mid)
+
+    row = mc.paths.iloc[0]
+    assert row["final_pnl"] == single.summary["final_pnl"]
+    assert row["num_fills"] == single.summary["num_fills"]
+    assert row["adverse_selection_cost"] == pytest.approx(single.summary["adverse_selection_cost"])
+    assert row["inventory_pnl"] == pytest.approx(single.summary["inventory_pnl"])
+
+
+def test_synthetic_paths_produce_percentile_bands():
+    fit = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    mc = run_monte_carlo(fit, StrategyConfig(horizon_steps=100), BacktestConfig(seed=1), n_paths=200, steps=100)
+    assert len(mc.bands) == 100
+    assert len(mc.paths) == 200
+    assert (mc.bands["mtm_pnl_p5"] <= mc.bands["mtm_pnl_p95"]).all()
+    assert mc.summary["paths"] == 200
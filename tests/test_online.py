@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit, fit_exponential_mle
+from market_making_engine.online import OnlineIntensityEstimator
+
+
+def test_online_refit_matches_batch_fit_without_decay():
+    rng = np.random.default_rng(4)
+    deltas = np.linspace(0.01, 0.5, 30)
+    est = OnlineIntensityEstimator(deltas, half_life=1e12)
+    counts = np.zeros_like(deltas)
+    for _ in range(20):
+        batch = rng.poisson(1.2 * np.exp(-8.0 * deltas) * 10.0)
+        counts += batch
+        est.advance(10.0)
+        est.update(batch, np.full_like(deltas, 10.0))
+        est.refit()
+
+    batch_fit = fit_exponential_mle(pd.DataFrame({"delta": deltas, "count": counts, "exposure": 200.0}), method="newton")
+    assert est.fit.k == pytest.approx(batch_fit.k, rel=1e-6)
+    assert est.fit.A == pytest.approx(batch_fit.A, rel=1e-6)
+
+
+def test_backtest_refits_online():
+    mid = pd.Series(100 + np.cumsum(np.random.default_rng(0).normal(0.0, 0.002, size=600)))
+    fit = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    est = OnlineIntensityEstimator(np.linspace(0.0, 0.5, 40), prior=fit, prior_exposure=50.0)
+    result = run_backtest(mid, fit, StrategyConfig(horizon_steps=600), BacktestConfig(refit_every=100), online=est)
+    assert result.summary["online_refits"] == 6
+    assert result.summary["online_k"] > 0
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, PortfolioConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.portfolio import run_portfolio_backtest
+
+FIT = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+
+
+def _mids(symbols=4, n=400):
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({f"S{i}": 50.0 * (i + 1) + np.cumsum(rng.normal(0.0, 0.01, n)) for i in range(symbols)})
+
+
+def test_portfolio_matches_single_symbol_runs_for_any_worker_count():
+    mids = _mids()
+    strat = StrategyConfig(horizon_steps=400)
+    cfg = BacktestConfig(seed=3, engine="vectorized")
+    one = run_portfolio_backtest(mids, FIT, strat, cfg, PortfolioConfig(workers=1))
+    two = run_portfolio_backtest(mids, FIT, strat, cfg, PortfolioConfig(workers=2))
+    pd.testing.assert_frame_equal(one.timeseries, two.timeseries)
+    pd.testing.assert_frame_equal(one.symbols, two.symbols)
+    assert two.summary["workers"] == 2
+
+    single = run_backtest(mids["S2"], FIT, strat, BacktestConfig(seed=5, engine="vectorized"))
+    assert one.symbols.loc[2, "final_pnl"] == single.summary["final_pnl"]
+    np.testing.assert_array_equal(one.inventory["S2"], single.timeseries["inventory"])
+    assert one.summary["final_pnl"] == pytest.approx(one.symbols["final_pnl"].sum())
+
+
+def test_gross_notional_limit_caps_inventory():
+    mids = _mids()
+    result = run_portfolio_backtest(mids, FIT, StrategyConfig(horizon_steps=400), BacktestConfig(), PortfolioConfig(max_gross_notional=1000.0, workers=1))
+    assert result.timeseries["gross_notional"].max() <= 1000.0
+    assert result.symbols["max_inventory"].tolist() == [int(250.0 // mids[s].max()) for s in mids]
+
+
+def test_per_symbol_fits_must_cover_all_symbols():
+    with pytest.raises(ValueError, match="S3"):
+        run_portfolio_backtest(_mids(), {"S0": FIT, "S1": FIT, "S2": FIT}, StrategyConfig(), BacktestConfig())
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.streaming import CHECKPOINT, run_streaming_backtest
+
+FIT = IntensityFit(model="exponential", A=2.0, k=1.5, log_likelihood=0.0, aic=0.0, bic=0.0)
+STRAT = StrategyConfig(gamma=0.05, sigma=0.1, horizon_steps=2500, max_inventory=3, order_size=0.5)
+CFG = BacktestConfig(seed=7, markout_horizons=(1, 5, 50))
+
+
+def _mid(n=3001):
+    return 100 + np.cumsum(np.random.default_rng(5).normal(0.0, 0.05, size=n))
+
+
+def _in_memory(mid, outdir):
+    result = run_backtest(pd.Series(mid), FIT, STRAT, CFG)
+    outdir.mkdir()
+    result.timeseries.to_csv(outdir / "backtest_timeseries.csv", index=False)
+    result.fill_log.to_csv(outdir / "fills.csv")
+    result.markouts.to_csv(outdir / "markouts.csv", index=False)
+    return result
+
+
+def _assert_same(stream, result, outdir, ref):
+    for name in ("backtest_timeseries.csv", "fills.csv", "markouts.csv"):
+        assert (outdir / name).read_bytes() == (ref / name).read_bytes(), name
+    skip = {"fill_log_peak_bytes", "steps", "resumed_from_step"}
+    # totals are summed chunk by chunk when streaming, pairwise in memory
+    totals = {"inventory_mean", "inventory_std", "realized_spread_capture", "inventory_pnl", "adverse_selection_cost"}
+    assert {k: v for k, v in stream.summary.items() if k not in skip | totals} == {
+        k: v for k, v in result.summary.items() if k not in skip | totals
+    }
+    for k in totals:
+        assert stream.summary[k] == pytest.approx(result.summary[k], rel=1e-12, abs=1e-12), k
+
+
+def test_streaming_matches_in_memory_run(tmp_path):
+    mid = _mid()
+    result = _in_memory(mid, tmp_path / "ref")
+    assert result.summary["num_fills"] > 100
+    for chunk in (1, 7, 500, 10_000):
+        out = tmp_path / f"chunk{chunk}"
+        stream = run_streaming_backtest(mid, FIT, STRAT, CFG, out, chunk_size=chunk)
+        _assert_same(stream, result, out, tmp_path / "ref")
+
+    path = tmp_path / "mid.csv"
+    pd.DataFrame({"mid": mid}).to_csv(path, index=False)
+    result = _in_memory(pd.read_csv(path)["mid"].to_numpy(), tmp_path / "ref_csv")
+    stream = run_streaming_backtest(path, FIT, STRAT, CFG, tmp_path / "csv", chunk_size=333)
+    _assert_same(stream, result, tmp_path / "csv", tmp_path / "ref_csv")
+
+
+def test_streaming_resumes_from_checkpoint(tmp_path):
+    mid = _mid()
+    result = _in_memory(mid, tmp_path / "ref")
+    out = tmp_path / "out"
+
+    def crashing(chunk, stop):
+        for lo in range(0, len(mid), chunk):
+            if lo >= stop:
+                raise RuntimeError("feed lost")
+            yield mid[lo : lo + chunk]
+
+    with pytest.raises(RuntimeError):
+        run_streaming_backtest(crashing(200, 2100), FIT, STRAT, CFG, out, checkpoint_every=3)
+    assert (out / CHECKPOINT).exists()
+    stream = run_streaming_backtest(mid, FIT, STRAT, CFG, out, chunk_size=450, resume=True)
+    assert stream.summary["resumed_from_step"] == 1800
+    assert not (out / CHECKPOINT).exists()
+    _assert_same(stream, result, out, tmp_path / "ref")
+
+    with pytest.raises(RuntimeError):
+        run_streaming_backtest(crashing(200, 600), FIT, STRAT, CFG, out, checkpoint_every=1)
+    with pytest.raises(ValueError, match="different"):
+        run_streaming_backtest(mid, FIT, STRAT, BacktestConfig(seed=8, markout_horizons=(1, 5, 50)), out, resume=True)
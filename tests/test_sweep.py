@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.sweep import expand_grid, run_sweep
+
+
+def test_sweep_pool_matches_single_runs():
+    mid = pd.Series(100 + np.cumsum(np.random.default_rng(0).normal(0.0, 0.01, size=300)))
+    fit = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+    configs = expand_grid({"gamma": [0.05, 0.2], "max_inventory": [2, 5]})
+    table = run_sweep(mid, fit, configs, strat=StrategyConfig(horizon_steps=300), workers=2)
+
+    assert len(table) == 4
+    assert "wall_time_s" in table.columns
+    expected = run_backtest(mid, fit, StrategyConfig(gamma=0.2, max_inventory=5, horizon_steps=300), BacktestConfig())
+    row = table[(table["gamma"] == 0.2) & (table["max_inventory"] == 5)].iloc[0]
+    assert row["final_pnl"] == expected.summary["final_pnl"]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.backtest import run_backtest
+from market_making_engine.config import BacktestConfig, StrategyConfig
+from market_making_engine.intensity import IntensityFit
+from market_making_engine.live import run_replay
+from market_making_engine.volatility import (
+    EWMAVolatility,
+    RangeVolatility,
+    RollingVolatility,
+    ewma_alpha,
+    ewma_volatility,
+    parse_estimator,
+    range_volatility,
+    rolling_volatility,
+)
+
+FIT = IntensityFit(model="exponential", A=1.2, k=8.0, log_likelihood=0.0, aic=0.0, bic=0.0)
+
+
+def _mid(n=2000, seed=5):
+    rng = np.random.default_rng(seed)
+    vol = np.where(np.arange(n) < n // 2, 0.01, 0.05)  # regime change halfway
+    return 100.0 + np.cumsum(rng.normal(0.0, 1.0, n) * vol)
+
+
+def test_incremental_estimators_match_bulk():
+    m = _mid()
+    for est, bulk in (
+        (RollingVolatility(50, dt=0.5, initial=0.02), rolling_volatility(m, 50, dt=0.5, initial=0.02)),
+        (EWMAVolatility(30.0, initial=0.02), ewma_volatility(m, 30.0, initial=0.02)),
+    ):
+        np.testing.assert_allclose([est.update(x) for x in m], bulk, rtol=1e-9)
+    for half_life in (0.2, 3.0, 1e5):
+        ref = pd.Series(np.square(np.diff(m))).ewm(alpha=ewma_alpha(half_life), adjust=False).mean()
+        np.testing.assert_allclose(ewma_volatility(m, half_life)[1:], np.sqrt(ref), rtol=1e-12)
+    late = rolling_volatility(m, 200)
+    assert late[400] == pytest.approx(0.01, rel=0.25) and late[-1] == pytest.approx(0.05, rel=0.25)
+
+
+def test_range_estimator_from_ohlc_bars():
+    rng = np.random.default_rng(1)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, 500)))
+    bars = pd.DataFrame({"open": np.r_[close[0], close[:-1]], "close": close})
+    bars["high"] = bars[["open", "close"]].max(axis=1) * 1.0005
+    bars["low"] = bars[["open", "close"]].min(axis=1) * 0.9995
+    for method in ("parkinson", "garman_klass"):
+        est = RangeVolatility(20, method=method)
+        inc = [est.update_bar(*row) for row in bars[["open", "high", "low", "close"]].itertuples(index=False)]
+        np.testing.assert_allclose(inc, range_volatility(bars, 20, method), rtol=1e-9)
+    with pytest.raises(ValueError):
+        parse_estimator("yang_zhang:20")
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_backtest_accepts_sigma_series_and_estimators(engine):
+    mid = pd.Series(_mid(600))
+    strat = StrategyConfig(horizon_steps=600)
+    cfg = BacktestConfig(seed=9, engine=engine)
+    base = run_backtest(mid, FIT, strat, cfg)
+    flat = run_backtest(mid, FIT, strat, cfg, sigma=np.full(600, strat.sigma))
+    pd.testing.assert_frame_equal(base.timeseries, flat.timeseries)
+
+    sig = rolling_volatility(mid.to_numpy(), 50, initial=strat.sigma)
+    series = run_backtest(mid, FIT, strat, cfg, sigma=sig)
+    loop = run_backtest(mid, FIT, strat, BacktestConfig(seed=9), sigma=sig)
+    pd.testing.assert_frame_equal(series.timeseries, loop.timeseries)
+    np.testing.assert_array_equal(series.timeseries["sigma"], sig)
+
+    est = run_backtest(mid, FIT, strat, cfg, sigma=RollingVolatility(50, initial=strat.sigma))
+    np.testing.assert_allclose(est.timeseries["sigma"], sig, rtol=1e-9)
+    with pytest.raises(ValueError):
+        run_backtest(mid, FIT, strat, cfg, sigma=sig[:-1])
+
+
+def test_replay_updates_sigma_per_quote():
+    df = pd.DataFrame({"ts": np.arange(300.0), "mid": _mid(300)})
+    vol = EWMAVolatility(20.0, initial=0.02)
+    stats = run_replay(df, FIT, StrategyConfig(horizon_steps=300), vol=vol)
+    assert stats.processed == 300
+    assert vol.value == pytest.approx(ewma_volatility(df["mid"].to_numpy(), 20.0)[-1])
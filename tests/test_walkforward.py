@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_making_engine.cache import DataCache
+from market_making_engine.config import BacktestConfig, CalibrationConfig, StrategyConfig, WalkForwardConfig
+from market_making_engine.walkforward import run_walk_forward, walk_forward_folds
+
+
+def _events(n: int = 6000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    ts = np.cumsum(rng.exponential(0.5, size=n))
+    kind = np.where(rng.uniform(size=n) < 0.6, "quote", "trade")
+    mid = 100 + np.cumsum(rng.normal(0.0, 0.01, size=n))
+    return pd.DataFrame(
+        {
+            "ts": ts,
+            "kind": kind,
+            "bid": np.where(kind == "quote", mid - 0.01, np.nan),
+            "ask": np.where(kind == "quote", mid + 0.01, np.nan),
+            "price": np.where(kind == "trade", mid + rng.normal(0.0, 0.05, size=n), np.nan),
+        }
+    )
+
+
+def test_folds_roll_back_to_back_test_windows():
+    folds = walk_forward_folds(0.0, 100.0, WalkForwardConfig(train_window=40.0, test_window=20.0))
+    assert folds == [(0.0, 40.0, 40.0, 60.0), (20.0, 60.0, 60.0, 80.0), (40.0, 80.0, 80.0, 100.0)]
+
+
+def test_parallel_folds_match_serial_and_reruns_hit_fit_cache(tmp_path):
+    events = _events()
+    strat = StrategyConfig(horizon_steps=200, max_inventory=5)
+    cal = CalibrationConfig(method="newton")
+    wf = WalkForwardConfig(train_window=600.0, test_window=300.0, delta_max=0.15, bins=15)
+    cache = DataCache(tmp_path)
+
+    serial = run_walk_forward(events, strat, BacktestConfig(), cal, wf, workers=1, cache=cache)
+    assert serial.summary["folds"] >= 5
+    assert cache.misses == serial.summary["folds"] and cache.hits == 0
+    assert not serial.folds["fit_cached"].any()
+    assert serial.timeseries["ts"].is_monotonic_increasing
+    last = serial.timeseries.groupby("fold")["stitched_pnl"].last()
+    assert last.iloc[-1] == pytest.approx(serial.summary["total_pnl"])
+
+    rerun = run_walk_forward(events, strat, BacktestConfig(), cal, wf, workers=2, cache=cache)
+    assert rerun.folds["fit_cached"].all()
+    assert cache.hits == serial.summary["folds"]
+    cols = ["fold", "A", "k", "final_pnl", "num_fills"]
+    pd.testing.assert_frame_equal(serial.folds[cols], rerun.folds[cols])
+    pd.testing.assert_frame_equal(serial.timeseries, rerun.timeseries)